@@ -45,15 +45,15 @@ echo -e "${YELLOW}🔨 Passo 3/9: Building imagens Docker...${NC}"
 echo ""
 
 echo -e "${BLUE}  → Database...${NC}"
-cd services/database && docker build -t ecatalog/database:latest . && cd ../..
+cd services/database && docker build --build-context shared=../shared -t ecatalog/database:latest . && cd ../..
 echo -e "${GREEN}  ✓ Database image built${NC}"
 
 echo -e "${BLUE}  → Catalog...${NC}"
-cd services/catalog && docker build -t ecatalog/catalog:latest . && cd ../..
+cd services/catalog && docker build --build-context shared=../shared -t ecatalog/catalog:latest . && cd ../..
 echo -e "${GREEN}  ✓ Catalog image built${NC}"
 
 echo -e "${BLUE}  → Authentication...${NC}"
-cd services/authentication && docker build -t ecatalog/authentication:latest . && cd ../..
+cd services/authentication && docker build --build-context shared=../shared -t ecatalog/authentication:latest . && cd ../..
 echo -e "${GREEN}  ✓ Authentication image built${NC}"
 
 echo -e "${BLUE}  → Frontend...${NC}"
@@ -62,7 +62,7 @@ echo -e "${GREEN}  ✓ Frontend image built${NC}"
 echo ""
 
 echo -e "${BLUE}  → Metrics Exporter...${NC}"
-cd services/metrics-exporter && docker build -t ecatalog/metrics-exporter:latest . && cd ../..
+cd services/metrics-exporter && docker build --build-context shared=../shared -t ecatalog/metrics-exporter:latest . && cd ../..
 echo -e "${GREEN}  ✓ Metrics Exporter image built${NC}"
 
 
@@ -13,8 +13,23 @@ class Settings(BaseSettings):
         "http://catalog:8000"
     )
     
-    # HTTP Timeout
-    HTTP_TIMEOUT: float = 30.0
+    # Deadline por chamada ao Catalog (tentativas incluídas)
+    HTTP_TIMEOUT: float = 10.0
+    
+    # Resiliência das chamadas ao Catalog (ecatalog_shared.resilience)
+    UPSTREAM_RETRIES: int = 2
+    UPSTREAM_BACKOFF_BASE: float = 0.1
+    UPSTREAM_BACKOFF_MAX: float = 1.0
+    # Segundo pedido para GETs mais lentos do que o p95 recente do endpoint
+    UPSTREAM_HEDGE_ENABLED: bool = False
+    UPSTREAM_HEDGE_MIN_DELAY: float = 0.05
+    # Falhas seguidas que abrem o circuito e segundos até novo teste
+    CIRCUIT_FAILURE_THRESHOLD: int = 5
+    CIRCUIT_RESET_TIMEOUT: float = 10.0
+    
+    # Compressão das respostas (GZip acima de GZIP_MINIMUM_SIZE bytes)
+    GZIP_MINIMUM_SIZE: int = 1024
+    GZIP_COMPRESS_LEVEL: int = 5
     
     # JWT Configuration
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
@@ -33,6 +48,17 @@ class Settings(BaseSettings):
     # Allowed email domains for authentication (minimum role: viewer/client)
     ALLOWED_DOMAINS: list = ["alunos.uminho.pt", "ltplabs.com"]
     
+    # Clientes criados automaticamente no primeiro login (domínio permitido)
+    AUTO_CLIENTE_CRIADO_POR: str = "isilva"
+    AUTO_CLIENTE_VALIDADE_DIAS: int = 30
+    
+    # Cache da resolução de identidade (segundos; 0 desativa). O Catalog
+    # invalida as entradas após escritas em admin/cliente; alterações feitas
+    # diretamente na Database só são vistas ao fim do TTL
+    IDENTITY_CACHE_TTL: float = 60.0
+    IDENTITY_NEGATIVE_CACHE_TTL: float = 30.0
+    IDENTITY_CACHE_MAX_ENTRIES: int = 10000
+    
     class Config:
         env_file = ".env"
 
@@ -10,11 +10,12 @@ Responsabilidades:
 
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import RedirectResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, RedirectResponse
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime, timedelta
 import jwt
 import hashlib
@@ -24,17 +25,25 @@ import json
 import secrets
 
 from app.core.config import settings
-from app.services.catalog_client import CatalogClient
-
-
-catalog_client = CatalogClient()
+from ecatalog_shared.telemetry import TelemetryMiddleware, metrics_response
+from app.services.catalog_client import CatalogServiceError, catalog_client
+from app.services.identity import identity_resolver
+from app.services.revocations import revocation_list
 
 app = FastAPI(
     title="E-Catalog Authentication API",
     description="Serviço de autenticação via Microsoft OAuth",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse
+)
+
+# Compressão (dentro da telemetria, para esta medir bytes enviados)
+app.add_middleware(
+    GZipMiddleware,
+    minimum_size=settings.GZIP_MINIMUM_SIZE,
+    compresslevel=settings.GZIP_COMPRESS_LEVEL
 )
 
 # CORS
@@ -46,6 +55,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Latência por rota, pedidos em curso e tamanho das respostas (/metrics)
+app.add_middleware(TelemetryMiddleware)
+
 # Configurações
 SECRET_KEY = settings.SECRET_KEY
 ALGORITHM = settings.ALGORITHM
@@ -66,18 +78,28 @@ MICROSOFT_SCOPES = ["openid", "profile", "email", "User.Read"]
 class TokenValidationRequest(BaseModel):
     token: str
 
+
+class LogoutRequest(BaseModel):
+    token: Optional[str] = None
+
+
+class IdentityInvalidateRequest(BaseModel):
+    # None = todas as identidades em cache
+    emails: Optional[List[str]] = None
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
-    """Criar JWT token"""
+    """Criar JWT token (jti único, para poder ser revogado)"""
     to_encode = data.copy()
+    now = datetime.utcnow()
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = now + expires_delta
     else:
-        expire = datetime.utcnow() + timedelta(minutes=15)
-    to_encode.update({"exp": expire})
+        expire = now + timedelta(minutes=15)
+    to_encode.update({"exp": expire, "iat": now, "jti": secrets.token_hex(16)})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
@@ -85,14 +107,32 @@ def verify_token(token: str):
     """Verificar e decodificar token"""
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token expirado")
-    except jwt.JWTError:
+    except jwt.InvalidTokenError:
         raise HTTPException(status_code=401, detail="Token inválido")
+    if revocation_list.is_revoked(payload.get("jti", "")):
+        raise HTTPException(status_code=401, detail="Token revogado")
+    return payload
+
+
+def bearer_token(authorization: Optional[str]) -> Optional[str]:
+    """Extrair token de um header 'Authorization: Bearer <token>'"""
+    if authorization and authorization.lower().startswith("bearer "):
+        return authorization[7:].strip() or None
+    return None
 
 
-async def authenticate_user(email: str):
+def fallback_identity(email_lower: str, erro: Exception):
+    """Catalog indisponível: domínios permitidos entram como viewer (sem ID)"""
+    print(f"Erro ao resolver identidade: {erro}")
+    domain = email_lower.split("@")[-1] if "@" in email_lower else ""
+    if domain in settings.ALLOWED_DOMAINS:
+        return True, "viewer", None
+    return False, None, None
+
+
+async def authenticate_user(email: str, name: Optional[str] = None):
     """
     Autenticar utilizador com hierarquia:
     1. Admin (tabela admin) → role: admin
@@ -100,67 +140,34 @@ async def authenticate_user(email: str):
     3. Domínio permitido (@alunos.uminho.pt, @ltplabs.com) → role: viewer (auto-criado)
     4. Caso contrário → negado
     
+    Resolvido num único pedido (identity_resolver, com cache).
     
-    Retorna: (autenticado: bool, role: Optional[str])
+    Retorna: (autenticado: bool, role: Optional[str], user_id: Optional[str])
     """
     if not email:
-        return False, None
+        return False, None, None
     
     email_lower = email.lower()
     
-    # 1. Verificar se é admin
-    try:
-        admin = await catalog_client.get_admin_by_email(email_lower)
-        if admin:
-            print(f"Email {email_lower} autenticado como ADMIN")
-            return True, "admin"
-    except Exception as e:
-        print(f"Erro ao verificar admin: {e}")
-    
-    # 2. Verificar se é cliente
     try:
-        cliente = await catalog_client.get_cliente_by_email(email_lower)
-        if cliente:
-            return True, "viewer"
+        identity = await identity_resolver.resolve(email_lower, name)
+    except CatalogServiceError as e:
+        if e.status_code < 500:
+            # Pedido recusado (ex: AUTO_CLIENTE_CRIADO_POR inexistente): erro
+            # de configuração e não indisponibilidade, sem fallback
+            print(f"Erro ao resolver identidade ({e.status_code}): {e.detail}")
+            return False, None, None
+        return fallback_identity(email_lower, e)
     except Exception as e:
-        print(f"Erro ao verificar cliente: {e}")
-    
-    # 3. Verificar se é domínio permitido
-    domain = email_lower.split("@")[-1] if "@" in email_lower else ""
-    if domain in settings.ALLOWED_DOMAINS:
-        return True, "viewer"  # Será auto-criado como cliente
+        return fallback_identity(email_lower, e)
     
-    print(f"Email {email_lower} não autorizado")
-    return False, None
-
-
-async def create_cliente_if_not_exists(email: str, name: str) -> None:
-    """
-    Criar cliente automaticamente se não existir
-    Usado para utilizadores de domínios permitidos
+    if not identity.get("role"):
+        print(f"Email {email_lower} não autorizado")
+        return False, None, None
     
-    """
-    try:
-        # Verificar se já existe
-        existing = await catalog_client.get_cliente_by_email(email.lower())
-        if existing:
-            return
-    except Exception:
-        # Cliente não existe, vamos criar
-        pass
-    
-    try:
-        # Criar novo cliente
-        cliente_data = {
-            "nome": name,
-            "email": email.lower(),
-            "data_expiracao": (datetime.now() + timedelta(days=30)).isoformat(),
-            "criado_por": "isilva"
-        }
-        
-        await catalog_client.create_cliente(cliente_data)
-    except Exception as e:
-        print(f"Erro ao criar cliente {email}: {e}")
+    if identity["role"] == "admin":
+        print(f"Email {email_lower} autenticado como ADMIN")
+    return True, identity["role"], identity.get("id")
 
 
 # ============================================================================
@@ -176,6 +183,36 @@ async def health():
         "version": "1.0.0"
     }
 
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Métricas de performance em formato Prometheus"""
+    return metrics_response()
+
+@app.get("/internal/stats")
+async def internal_stats():
+    """Estatísticas internas (cache de identidades, tokens revogados, catalog)"""
+    return {
+        "identity_cache": identity_resolver.stats(),
+        "catalog_resilience": catalog_client.policy.stats(),
+        "revocations": {
+            "epoch": revocation_list.epoch,
+            "version": revocation_list.version
+        }
+    }
+
+@app.post("/internal/identity/invalidate")
+async def invalidate_identities(request: IdentityInvalidateRequest):
+    """
+    Esquecer identidades em cache (chamado pelo Catalog após escritas em
+    admin/cliente), para o próximo login ler o role atual
+    """
+    if request.emails is None:
+        identity_resolver.clear()
+    else:
+        for email in request.emails:
+            identity_resolver.invalidate(email)
+    return {"invalidated": "all" if request.emails is None else len(request.emails)}
+
 @app.get("/")
 async def root():
     """Root endpoint"""
@@ -200,6 +237,48 @@ async def validate_token(request: TokenValidationRequest):
         "role": payload.get("role")
     }
 
+
+@app.post("/api/auth/logout")
+async def logout(
+    request: Optional[LogoutRequest] = None,
+    authorization: Optional[str] = Header(None)
+):
+    """
+    Terminar sessão: revoga o token (body ou header Authorization) até ao exp
+    Sem token válido não há nada a revogar
+    """
+    token = (request.token if request else None) or bearer_token(authorization)
+    if not token:
+        return {"message": "Sessão terminada", "revoked": False}
+    
+    try:
+        payload = verify_token(token)
+    except HTTPException:
+        return {"message": "Sessão terminada", "revoked": False}
+    
+    if not payload.get("jti"):
+        return {"message": "Sessão terminada", "revoked": False}
+    
+    version = revocation_list.revoke(payload["jti"], payload["exp"])
+    return {
+        "message": "Sessão terminada",
+        "revoked": True,
+        "jti": payload["jti"],
+        "exp": payload["exp"],
+        "version": version
+    }
+
+
+@app.get("/api/auth/revocations")
+async def get_revocations(since: int = 0, epoch: Optional[str] = None):
+    """
+    Tokens revogados ainda não expirados (polling incremental do Catalog)
+    Com um epoch diferente do atual (serviço reiniciado) devolve a lista completa
+    """
+    if epoch != revocation_list.epoch:
+        since = 0
+    return revocation_list.since(since)
+
 # ============================================================================
 # MICROSOFT OAUTH ENDPOINTS
 # ============================================================================
@@ -268,33 +347,14 @@ async def microsoft_callback(code: str, state: Optional[str] = None):
             user_name = user_info.get("displayName", user_email)
             
             
-            # Autenticar utilizador (verifica admin -> cliente -> domínio permitido)
-            authenticated, user_role = await authenticate_user(user_email)
+            # Autenticar utilizador (admin -> cliente -> domínio permitido, cria cliente se necessário)
+            authenticated, user_role, user_db_id = await authenticate_user(user_email, user_name)
             
             if not authenticated:
                 frontend_url = settings.FRONTEND_URL
                 error_url = f"{frontend_url}/login?error=unauthorized_domain"
                 return RedirectResponse(url=error_url)
             
-            
-            # Buscar ID do utilizador na base de dados via catalog_client
-            user_db_id = None
-            if user_role == "admin":
-                try:
-                    admin = await catalog_client.get_admin_by_email(user_email)
-                    user_db_id = admin.get("id")
-                except Exception as e:
-                    print(f"Erro ao buscar ID do admin: {e}")
-            
-            elif user_role == "viewer":
-                # Se é viewer, criar cliente se não existir
-                await create_cliente_if_not_exists(user_email, user_name)
-                try:
-                    cliente = await catalog_client.get_cliente_by_email(user_email)
-                    user_db_id = cliente.get("id")
-                except Exception as e:
-                    print(f"Erro ao buscar ID do cliente: {e}")
-            
             # Criar JWT token interno com formato CORRETO
             access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
             access_token = create_access_token(
@@ -1,6 +1,18 @@
 import httpx
+import time
 from typing import List, Dict, Any, Optional
 from app.core.config import settings
+from ecatalog_shared.resilience import UpstreamPolicy
+from ecatalog_shared.telemetry import observe_upstream
+
+
+class CatalogServiceError(Exception):
+    """Resposta de erro do Catalog (status e detail do upstream)"""
+    
+    def __init__(self, status_code: int, detail: Any):
+        self.status_code = status_code
+        self.detail = detail
+        super().__init__(f"Erro na comunicação com Catalog Service: {detail}")
 
 
 class CatalogClient:
@@ -19,17 +31,41 @@ class CatalogClient:
     def __init__(self):
         self.base_url = settings.CATALOG_URL
         self.timeout = settings.HTTP_TIMEOUT
+        self.policy = UpstreamPolicy(
+            "catalog",
+            retries=settings.UPSTREAM_RETRIES,
+            backoff_base=settings.UPSTREAM_BACKOFF_BASE,
+            backoff_max=settings.UPSTREAM_BACKOFF_MAX,
+            hedge_enabled=settings.UPSTREAM_HEDGE_ENABLED,
+            hedge_min_delay=settings.UPSTREAM_HEDGE_MIN_DELAY,
+            failure_threshold=settings.CIRCUIT_FAILURE_THRESHOLD,
+            reset_timeout=settings.CIRCUIT_RESET_TIMEOUT
+        )
     
     
     async def _request(self, method: str, endpoint: str, **kwargs) -> Any:
         """
         Fazer request HTTP ao Catalog Service
+        
+        Deadline de HTTP_TIMEOUT para o conjunto das tentativas; GETs são
+        repetidos com jitter e o circuit breaker falha de imediato enquanto o
+        Catalog estiver em baixo (ver ecatalog_shared.resilience)
         """
         url = f"{self.base_url}{endpoint}"
         
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.request(method, url, **kwargs)
+            async with httpx.AsyncClient() as client:
+                async def attempt(restante: float) -> httpx.Response:
+                    inicio = time.perf_counter()
+                    status = None
+                    try:
+                        response = await client.request(method, url, timeout=restante, **kwargs)
+                        status = response.status_code
+                        return response
+                    finally:
+                        observe_upstream("catalog", method, endpoint, status, time.perf_counter() - inicio)
+                
+                response = await self.policy.execute(method, endpoint, attempt, self.timeout)
                 response.raise_for_status()
                 
                 if response.status_code == 204:
@@ -41,7 +77,7 @@ class CatalogClient:
                 error_detail = e.response.json().get("detail", str(e))
             except Exception:
                 error_detail = str(e)
-            raise Exception(f"Erro na comunicação com Catalog Service: {error_detail}")
+            raise CatalogServiceError(e.response.status_code, error_detail)
         except Exception as e:
             raise Exception(f"Erro ao comunicar com Catalog Service: {str(e)}")
 
@@ -106,6 +142,14 @@ class CatalogClient:
         """PUT /api/clientes/{id}"""
         return await self._request("PUT", f"/api/clientes/{cliente_id}", json=data)
     
+    # ========================================================================
+    # IDENTIDADE
+    # ========================================================================
+    
+    async def resolve_identity(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """POST /api/db/identity/resolve - role e ID num só pedido (cria cliente se permitido)"""
+        return await self._request("POST", "/api/db/identity/resolve", json=data)
+    
     
     # ========================================================================
     # PEDIDOS
@@ -0,0 +1,127 @@
+"""
+Identity Resolver
+Role e ID do utilizador no login, com cache positivo e negativo
+
+Um único pedido ao Catalog (POST /api/db/identity/resolve) resolve admin →
+cliente → domínio permitido e cria o cliente se for caso disso. O resultado
+fica em memória durante IDENTITY_CACHE_TTL segundos (autorizados) ou
+IDENTITY_NEGATIVE_CACHE_TTL (não autorizados), e logins simultâneos do mesmo
+email partilham o mesmo pedido; num pico de logins cada utilizador custa no
+máximo um round trip.
+
+O Catalog pede a invalidação (POST /internal/identity/invalidate) depois de
+criar, alterar ou apagar admins/clientes; mudanças feitas por outra via só
+são vistas quando a entrada expira.
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from app.core.config import settings
+from app.services.catalog_client import catalog_client
+
+
+class IdentityResolver:
+    """Resolução de identidade com cache TTL (LRU) e pedidos partilhados"""
+
+    def __init__(self):
+        self.max_entries = settings.IDENTITY_CACHE_MAX_ENTRIES
+        # email → (expira_em, identidade)
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        # Incrementada a cada invalidação: leituras iniciadas antes não entram no cache
+        self._generation = 0
+
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.shared = 0
+
+    def _get(self, email: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(email)
+        if entry is None:
+            return None
+        expires_at, identity = entry
+        if expires_at < time.monotonic():
+            del self._entries[email]
+            return None
+        self._entries.move_to_end(email)
+        return identity
+
+    def _set(self, email: str, identity: Dict[str, Any]) -> None:
+        ttl = settings.IDENTITY_CACHE_TTL if identity.get("role") else settings.IDENTITY_NEGATIVE_CACHE_TTL
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+        self._entries[email] = (time.monotonic() + ttl, identity)
+        self._entries.move_to_end(email)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, email: str) -> None:
+        """Esquecer a identidade de um email (ex: após mudança de role)"""
+        self._generation += 1
+        self._entries.pop(email.lower(), None)
+
+    def clear(self) -> None:
+        """Esquecer todas as identidades (ex: email alterado ou admin apagado)"""
+        self._generation += 1
+        self._entries.clear()
+
+    async def resolve(self, email: str, nome: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Identidade de um email: {"email", "role", "id", "criado"}
+        role None = não autorizado. Erros do Catalog não ficam em cache.
+        """
+        email = email.lower()
+        identity = self._get(email)
+        if identity is not None:
+            if identity.get("role"):
+                self.hits += 1
+            else:
+                self.negative_hits += 1
+            return identity
+
+        task = self._inflight.get(email)
+        if task is not None:
+            self.shared += 1
+            return await asyncio.shield(task)
+
+        self.misses += 1
+        task = asyncio.ensure_future(self._load(email, nome))
+        self._inflight[email] = task
+        return await asyncio.shield(task)
+
+    async def _load(self, email: str, nome: Optional[str]) -> Dict[str, Any]:
+        generation = self._generation
+        try:
+            identity = await catalog_client.resolve_identity({
+                "email": email,
+                "nome": nome,
+                "dominios_permitidos": list(settings.ALLOWED_DOMAINS),
+                "criado_por": settings.AUTO_CLIENTE_CRIADO_POR,
+                "validade_dias": settings.AUTO_CLIENTE_VALIDADE_DIAS
+            })
+            if generation == self._generation:
+                self._set(email, identity)
+            return identity
+        finally:
+            self._inflight.pop(email, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Contadores do cache para monitorização"""
+        lookups = self.hits + self.negative_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": settings.IDENTITY_CACHE_TTL,
+            "negative_ttl_seconds": settings.IDENTITY_NEGATIVE_CACHE_TTL,
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "shared_requests": self.shared,
+            "hit_ratio": round((self.hits + self.negative_hits) / lookups, 4) if lookups else 0
+        }
+
+
+# Singleton instance
+identity_resolver = IdentityResolver()
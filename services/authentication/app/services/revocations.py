@@ -0,0 +1,55 @@
+"""
+Revocation List
+Tokens revogados (logout) antes do seu exp
+
+Cada token tem um jti. Ao revogar, o jti fica na lista até ao exp do token
+(depois disso o token já é rejeitado pela assinatura/exp e a entrada é
+descartada). Os outros serviços (Catalog) verificam os tokens localmente e
+sincronizam a lista por polling incremental: pedem só as revogações com
+sequência superior à última que viram. O epoch muda a cada arranque do
+serviço, o que indica aos clientes que devem pedir a lista completa.
+"""
+import secrets
+import time
+from typing import Any, Dict, List, Tuple
+
+
+class RevocationList:
+    """Lista em memória de jti revogados, com número de sequência"""
+
+    def __init__(self):
+        self.epoch = secrets.token_hex(8)
+        self.version = 0
+        # jti → (sequência, exp em epoch seconds)
+        self._entries: Dict[str, Tuple[int, int]] = {}
+
+    def _prune(self) -> None:
+        agora = time.time()
+        expirados = [jti for jti, (_, exp) in self._entries.items() if exp <= agora]
+        for jti in expirados:
+            del self._entries[jti]
+
+    def revoke(self, jti: str, exp: int) -> int:
+        """Revogar jti até exp; devolve a versão atual da lista"""
+        self._prune()
+        if jti not in self._entries:
+            self.version += 1
+            self._entries[jti] = (self.version, int(exp))
+        return self.version
+
+    def is_revoked(self, jti: str) -> bool:
+        return jti in self._entries
+
+    def since(self, version: int) -> Dict[str, Any]:
+        """Revogações com sequência > version (ainda não expiradas)"""
+        self._prune()
+        revoked: List[Dict[str, Any]] = [
+            {"jti": jti, "exp": exp}
+            for jti, (seq, exp) in self._entries.items()
+            if seq > version
+        ]
+        return {"epoch": self.epoch, "version": self.version, "revoked": revoked}
+
+
+# Singleton instance
+revocation_list = RevocationList()
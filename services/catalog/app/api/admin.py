@@ -2,8 +2,9 @@
 Admin API Endpoints (Públicos)
 Endpoints para gestão de administradores
 """
-from fastapi import APIRouter, HTTPException, status
-from typing import List
+from fastapi import APIRouter, HTTPException, status, Query
+from typing import List, Optional
+from app.models.page import Page
 from app.models.admin import AdminCreate, AdminUpdate, AdminResponse
 from app.services.admin_service import admin_service
 
@@ -29,6 +30,29 @@ async def get_all_admins():
         )
 
 
+@router.get("/page", response_model=Page[AdminResponse])
+async def get_admins_page(
+    cursor: Optional[str] = None,
+    limit: int = Query(default=50, ge=1, le=1000)
+):
+    """
+    Listar administradores paginados (ordenados por nome)
+    Usar next_cursor da resposta para obter a página seguinte
+    """
+    try:
+        return await admin_service.get_admins_page(cursor=cursor, limit=limit)
+    except Exception as e:
+        if "cursor inválido" in str(e).lower():
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cursor inválido"
+            )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao obter administradores: {str(e)}"
+        )
+
+
 @router.get("/{admin_id}", response_model=AdminResponse)
 async def get_admin(admin_id: str):
     """
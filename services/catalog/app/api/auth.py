@@ -1,11 +1,16 @@
 """
 Auth API Endpoints (Proxy)
 Proxy para Authentication Service
+
+A validação de tokens é feita localmente (token_verifier), sem pedido ao
+Authentication Service.
 """
-from fastapi import APIRouter, HTTPException, status
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException, status
 from pydantic import BaseModel, EmailStr
 import httpx
 from app.core.config import settings
+from app.services.token_verifier import token_verifier
 
 
 router = APIRouter()
@@ -68,45 +73,50 @@ async def login(credentials: LoginRequest):
 @router.post("/validate")
 async def validate_token(validation: TokenValidation):
     """
-    Proxy para validação de token no Authentication Service
+    Validar token JWT localmente (assinatura, exp e lista de revogados)
     """
-    try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.post(
-                f"{settings.AUTHENTICATION_URL}/api/auth/validate",
-                json=validation.model_dump()
-            )
-            
-            if response.status_code == 200:
-                return response.json()
-            else:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Token inválido"
-                )
-    except httpx.RequestError as e:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail=f"Erro ao comunicar com Authentication Service: {str(e)}"
-        )
+    payload = token_verifier.verify(validation.token)
+    return {
+        "valid": True,
+        "user_id": payload.get("user_id"),
+        "email": payload.get("sub"),
+        "role": payload.get("role")
+    }
 
 
 @router.post("/logout")
-async def logout():
+async def logout(authorization: Optional[str] = Header(None)):
     """
     Proxy para logout no Authentication Service
+    O token revogado é aplicado de imediato neste catalog (sem esperar pelo polling)
     """
+    headers = {"Authorization": authorization} if authorization else {}
     try:
         async with httpx.AsyncClient(timeout=10.0) as client:
             response = await client.post(
-                f"{settings.AUTHENTICATION_URL}/api/auth/logout"
+                f"{settings.AUTHENTICATION_URL}/api/auth/logout",
+                headers=headers
             )
-            return response.json()
     except httpx.RequestError as e:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail=f"Erro ao comunicar com Authentication Service: {str(e)}"
         )
+    
+    try:
+        data = response.json()
+    except ValueError:
+        data = None
+    if response.status_code != 200 or not isinstance(data, dict):
+        detail = data.get("detail", "Erro no logout") if isinstance(data, dict) else "Erro no logout"
+        raise HTTPException(
+            status_code=response.status_code if response.is_error else status.HTTP_502_BAD_GATEWAY,
+            detail=detail
+        )
+    
+    if data.get("revoked"):
+        token_verifier.revoke(data["jti"], data["exp"])
+    return data
 
 
 @router.get("/status")
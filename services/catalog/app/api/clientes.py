@@ -2,8 +2,9 @@
 Cliente API Endpoints (Públicos)
 Endpoints para gestão de clientes
 """
-from fastapi import APIRouter, HTTPException, status
-from typing import List
+from fastapi import APIRouter, HTTPException, status, Query
+from typing import List, Optional
+from app.models.page import Page
 from app.models.cliente import ClienteCreate, ClienteUpdate, ClienteResponse
 from app.services.cliente_service import cliente_service
 
@@ -29,6 +30,29 @@ async def get_all_clientes():
         )
 
 
+@router.get("/page", response_model=Page[ClienteResponse])
+async def get_clientes_page(
+    cursor: Optional[str] = None,
+    limit: int = Query(default=50, ge=1, le=1000)
+):
+    """
+    Listar clientes paginados (ordenados por nome)
+    Usar next_cursor da resposta para obter a página seguinte
+    """
+    try:
+        return await cliente_service.get_clientes_page(cursor=cursor, limit=limit)
+    except Exception as e:
+        if "cursor inválido" in str(e).lower():
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cursor inválido"
+            )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao obter clientes: {str(e)}"
+        )
+
+
 @router.get("/active", response_model=List[ClienteResponse])
 async def get_active_clientes():
     """
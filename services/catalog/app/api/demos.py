@@ -2,13 +2,16 @@
 Demo API Endpoints (Públicos)
 Endpoints para gestão de demos do catálogo
 """
-from fastapi import APIRouter, HTTPException, status
-from typing import List
-from app.models.demo import DemoCreate, DemoUpdate, DemoResponse
+from fastapi import APIRouter, HTTPException, Response, status, Query
+from typing import List, Optional
+from app.models.page import Page
+from app.models.demo import DemoCreate, DemoUpdate, DemoResponse, DemoSearchResponse
 from app.services.demo_service import demo_service
 from pydantic import BaseModel
 from app.models.log import LogCreate
 from app.services.log_service import log_service
+from app.models.session import SessionStart
+from app.services.session_service import session_service
 
 
 router = APIRouter()
@@ -16,6 +19,7 @@ router = APIRouter()
 class OpenDemoRequest(BaseModel):
     """Request para abrir demo"""
     cliente_id: str
+    session_id: Optional[str] = None  # Reenviar o mesmo id não cria nova sessão
 
 # ============================================================================
 # ENDPOINTS PÚBLICOS
@@ -35,6 +39,29 @@ async def get_all_demos():
         )
 
 
+@router.get("/page", response_model=Page[DemoResponse])
+async def get_demos_page(
+    cursor: Optional[str] = None,
+    limit: int = Query(default=50, ge=1, le=1000)
+):
+    """
+    Listar demos paginadas (ordenadas por nome)
+    Usar next_cursor da resposta para obter a página seguinte
+    """
+    try:
+        return await demo_service.get_demos_page(cursor=cursor, limit=limit)
+    except Exception as e:
+        if "cursor inválido" in str(e).lower():
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cursor inválido"
+            )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao obter demos: {str(e)}"
+        )
+
+
 @router.get("/active", response_model=List[DemoResponse])
 async def get_active_demos():
     """
@@ -77,6 +104,68 @@ async def get_demos_by_horizontal(horizontal: str):
         )
 
 
+@router.get("/search", response_model=DemoSearchResponse)
+async def search_demos(
+    q: str = Query(..., min_length=1, max_length=200),
+    estado: Optional[str] = None,
+    vertical: Optional[str] = None,
+    horizontal: Optional[str] = None,
+    limit: int = Query(default=20, ge=1, le=100)
+):
+    """
+    Pesquisar demos por texto (nome, descrição, keywords, vertical, horizontal)
+    
+    Cada palavra corresponde por prefixo ("inv stock"); resultados por
+    relevância, com contagens por vertical/horizontal/estado em facets
+    """
+    try:
+        return await demo_service.search_demos(
+            q, estado=estado, vertical=vertical, horizontal=horizontal, limit=limit
+        )
+    except Exception as e:
+        if "pesquisa inválida" in str(e).lower():
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Pesquisa inválida: sem termos"
+            )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao pesquisar demos: {str(e)}"
+        )
+
+
+@router.get("/fotos/{photo_hash}")
+async def get_demo_photo(photo_hash: str):
+    """
+    Foto do comercial (endereçada pelo sha256 do conteúdo)
+    
+    comercial_foto_url das demos aponta para aqui; o conteúdo de um hash
+    nunca muda, pelo que browsers e proxies podem guardá-la indefinidamente
+    """
+    try:
+        content, content_type = await demo_service.get_demo_photo(photo_hash)
+    except Exception as e:
+        if "não encontrada" in str(e).lower():
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Foto não encontrada"
+            )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao obter foto: {str(e)}"
+        )
+    return Response(
+        content=content,
+        media_type=content_type,
+        headers={
+            "Cache-Control": "public, max-age=31536000, immutable",
+            # Nunca interpretar como outro tipo (ex: HTML) além do declarado
+            "X-Content-Type-Options": "nosniff",
+            "ETag": f'"{photo_hash}"'
+        }
+    )
+
+
 @router.get("/{demo_id}", response_model=DemoResponse)
 async def get_demo(demo_id: str):
     """
@@ -102,6 +191,9 @@ async def open_demo(demo_id: str, request: OpenDemoRequest):
     Registar que um cliente abriu uma demo
     
     Cria log do tipo 'demo_aberta' com cliente_id e demo_id
+    (escrito em batch pelo log ingestor) e inicia a sessão de utilização
+    em background; o cliente deve enviar heartbeats e terminar a sessão em
+    /api/sessions
     """
     try:
         # Verificar se demo existe
@@ -120,11 +212,19 @@ async def open_demo(demo_id: str, request: OpenDemoRequest):
             mensagem=f"Cliente abriu demo: {demo.nome}"
         )
         
-        created_log = await log_service.create_log(log)
+        log_id = await log_service.enqueue_log(log)
+        
+        # Iniciar sessão (métricas de tempo), sem esperar pela escrita
+        session_id = session_service.start_session_nowait(SessionStart(
+            cliente_id=request.cliente_id,
+            demo_id=demo_id,
+            session_id=request.session_id
+        ))
         
         return {
             "message": "Demo aberta registada com sucesso",
-            "log_id": created_log.id,
+            "log_id": log_id,
+            "session_id": session_id,
             "demo": {
                 "id": demo.id,
                 "nome": demo.nome,
@@ -3,7 +3,10 @@ Log API Endpoints (Públicos)
 Endpoints para gestão de logs de atividade
 """
 from fastapi import APIRouter, HTTPException, status, Query
-from typing import List, Dict, Any
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from typing import List, Dict, Any, Optional, Literal
+from app.models.page import Page
 from app.models.log import LogCreate, LogResponse
 from app.services.log_service import log_service
 
@@ -29,6 +32,61 @@ async def get_all_logs(limit: int = Query(default=100, ge=1, le=1000)):
         )
 
 
+@router.get("/page", response_model=Page[LogResponse])
+async def get_logs_page(
+    cursor: Optional[str] = None,
+    limit: int = Query(default=50, ge=1, le=1000)
+):
+    """
+    Listar logs paginados (mais recentes primeiro)
+    Usar next_cursor da resposta para obter a página seguinte
+    """
+    try:
+        return await log_service.get_logs_page(cursor=cursor, limit=limit)
+    except Exception as e:
+        if "cursor inválido" in str(e).lower():
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cursor inválido"
+            )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao obter logs: {str(e)}"
+        )
+
+
+@router.get("/export")
+async def export_logs(
+    formato: Literal["ndjson", "csv"] = "ndjson",
+    desde: Optional[str] = None,
+    ate: Optional[str] = None,
+    tipo: Optional[str] = None
+):
+    """
+    Exportar todos os logs em streaming (NDJSON ou CSV)
+    Os chunks da Database são reencaminhados sem serem acumulados em memória;
+    a compressão para o cliente fica no GZipMiddleware (Accept-Encoding do cliente)
+    """
+    try:
+        upstream = await log_service.export_logs(formato, desde, ate, tipo)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao exportar logs: {str(e)}"
+        )
+    
+    headers = {
+        name: upstream.headers[name]
+        for name in ("content-type", "content-disposition")
+        if name in upstream.headers
+    }
+    return StreamingResponse(
+        upstream.aiter_bytes(),
+        headers=headers,
+        background=BackgroundTask(upstream.aclose)
+    )
+
+
 @router.get("/by-cliente/{cliente_id}", response_model=List[LogResponse])
 async def get_logs_by_cliente(
     cliente_id: str,
@@ -89,3 +147,63 @@ async def get_log_stats():
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Erro ao obter estatísticas: {str(e)}"
         )
+
+
+# ============================================================================
+# AGREGAÇÕES (usadas pelo Metrics Exporter)
+# ============================================================================
+
+@router.get("/aggregates/overview", response_model=Dict[str, Any])
+async def get_logs_overview_aggregate():
+    """
+    Totais de logs por janela temporal (24h/7d/30d)
+    """
+    try:
+        return await log_service.get_logs_overview_aggregate()
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao obter agregados de logs: {str(e)}"
+        )
+
+
+@router.get("/aggregates/top-clients", response_model=List[Dict[str, Any]])
+async def get_top_clients_aggregate(limit: int = Query(default=10, ge=1, le=1000)):
+    """
+    Clientes com mais eventos registados
+    """
+    try:
+        return await log_service.get_top_clients_aggregate(limit=limit)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao obter top clientes: {str(e)}"
+        )
+
+
+@router.get("/aggregates/top-demos", response_model=List[Dict[str, Any]])
+async def get_top_demos_aggregate(limit: int = Query(default=10, ge=1, le=1000)):
+    """
+    Demos mais abertas
+    """
+    try:
+        return await log_service.get_top_demos_aggregate(limit=limit)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao obter top demos: {str(e)}"
+        )
+
+
+@router.get("/aggregates/demos-per-client", response_model=List[Dict[str, Any]])
+async def get_demos_per_client_aggregate():
+    """
+    Aberturas de demos por cliente
+    """
+    try:
+        return await log_service.get_demos_per_client_aggregate()
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao obter demos por cliente: {str(e)}"
+        )
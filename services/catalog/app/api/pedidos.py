@@ -1,5 +1,6 @@
-from fastapi import APIRouter, HTTPException, status
-from typing import List
+from fastapi import APIRouter, HTTPException, status, Query
+from typing import List, Optional
+from app.models.page import Page
 from app.models.pedido import (
     PedidoCreate, 
     PedidoResponse,
@@ -31,6 +32,29 @@ async def get_all_pedidos():
         )
 
 
+@router.get("/page", response_model=Page[PedidoResponseCliente])
+async def get_pedidos_page(
+    cursor: Optional[str] = None,
+    limit: int = Query(default=50, ge=1, le=1000)
+):
+    """
+    Listar pedidos paginados (mais recentes primeiro)
+    Usar next_cursor da resposta para obter a página seguinte
+    """
+    try:
+        return await pedido_service.get_pedidos_page(cursor=cursor, limit=limit)
+    except Exception as e:
+        if "cursor inválido" in str(e).lower():
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cursor inválido"
+            )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao obter pedidos: {str(e)}"
+        )
+
+
 @router.get("/pending", response_model=List[PedidoResponseCliente])
 async def get_pending_pedidos():
     """
@@ -0,0 +1,94 @@
+"""
+Session API Endpoints (Públicos)
+Início, heartbeat e fim de sessões de utilização de demos
+"""
+from fastapi import APIRouter, HTTPException, status
+from typing import Optional
+from app.models.session import SessionStart, SessionEnd, SessionResponse
+from app.services.session_service import session_service
+
+
+router = APIRouter()
+
+
+# ============================================================================
+# ENDPOINTS PÚBLICOS
+# ============================================================================
+
+@router.post("/start", response_model=SessionResponse, status_code=status.HTTP_201_CREATED)
+async def start_session(session: SessionStart):
+    """
+    Iniciar sessão de utilização de uma demo
+    
+    Repetir o pedido com o mesmo session_id devolve a sessão existente
+    """
+    try:
+        return await session_service.start_session(session)
+    except Exception as e:
+        if "não existe" in str(e).lower():
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cliente ou demo não existe"
+            )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao iniciar sessão: {str(e)}"
+        )
+
+
+@router.get("/{session_id}", response_model=SessionResponse)
+async def get_session(session_id: str):
+    """
+    Obter sessão por session_id
+    """
+    try:
+        return await session_service.get_session(session_id)
+    except Exception as e:
+        if "não encontrada" in str(e).lower():
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Sessão {session_id} não encontrada"
+            )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao obter sessão: {str(e)}"
+        )
+
+
+@router.post("/{session_id}/heartbeat", status_code=status.HTTP_202_ACCEPTED)
+async def heartbeat_session(session_id: str):
+    """
+    Sinalizar que a sessão continua ativa
+    
+    Os heartbeats são agrupados e escritos em batch; sessões sem heartbeat
+    durante SESSION_TIMEOUT segundos são fechadas no último heartbeat
+    """
+    try:
+        await session_service.heartbeat(session_id)
+        return {"session_id": session_id, "status": "aceite"}
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao registar heartbeat: {str(e)}"
+        )
+
+
+@router.post("/{session_id}/end", response_model=SessionResponse)
+async def end_session(session_id: str, session: Optional[SessionEnd] = None):
+    """
+    Terminar sessão e calcular duração
+    
+    Idempotente: terminar de novo devolve a sessão com a duração original
+    """
+    try:
+        return await session_service.end_session(session_id, session)
+    except Exception as e:
+        if "não encontrada" in str(e).lower():
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Sessão {session_id} não encontrada"
+            )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao terminar sessão: {str(e)}"
+        )
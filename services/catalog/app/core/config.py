@@ -1,12 +1,83 @@
 from pydantic_settings import BaseSettings
+from typing import Dict, Literal
 
 class Settings(BaseSettings):
     SERVICE_NAME: str = "catalog"
     DATABASE_URL: str = "http://database:8001"
     AUTHENTICATION_URL: str = "http://authentication:8080"
-    HTTP_TIMEOUT: float = 30.0
+    
+    # Verificação local de JWT (mesma chave/algoritmo do Authentication Service)
+    SECRET_KEY: str = "your-secret-key-change-in-production"
+    ALGORITHM: str = "HS256"
+    # Tokens já verificados em memória (LRU; cada entrada vale até ao exp)
+    AUTH_TOKEN_CACHE_MAX_ENTRIES: int = 4096
+    # Intervalo de polling da lista de tokens revogados (0 desativa)
+    AUTH_REVOCATION_POLL_INTERVAL: float = 5.0
+    
+    # Deadline por chamada à Database (tentativas incluídas); exceções em
+    # HTTP_ENDPOINT_TIMEOUTS
+    HTTP_TIMEOUT: float = 10.0
+    # Timeouts por endpoint (prefixo do path → segundos), ex: {"/db/query": 60}
+    HTTP_ENDPOINT_TIMEOUTS: Dict[str, float] = {"/db/query": 60.0, "/db/queries": 60.0}
+    
+    # Pool HTTP partilhado para o Database Service
+    HTTP_CONNECT_TIMEOUT: float = 5.0
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP2_ENABLED: bool = True
+    # GETs idênticos concorrentes partilham um único pedido à Database
+    SINGLE_FLIGHT_ENABLED: bool = True
+    
+    # Compressão das respostas (GZip acima de GZIP_MINIMUM_SIZE bytes)
+    GZIP_MINIMUM_SIZE: int = 1024
+    GZIP_COMPRESS_LEVEL: int = 5
+    
+    # Resiliência das chamadas à Database (ecatalog_shared.resilience)
+    UPSTREAM_RETRIES: int = 2
+    UPSTREAM_BACKOFF_BASE: float = 0.1
+    UPSTREAM_BACKOFF_MAX: float = 1.0
+    # Segundo pedido para GETs mais lentos do que o p95 recente do endpoint
+    UPSTREAM_HEDGE_ENABLED: bool = False
+    UPSTREAM_HEDGE_MIN_DELAY: float = 0.05
+    # Falhas seguidas que abrem o circuito e segundos até novo teste
+    CIRCUIT_FAILURE_THRESHOLD: int = 5
+    CIRCUIT_RESET_TIMEOUT: float = 10.0
+    
+    # Cache de leituras de demos (TTL em segundos; 0 desativa)
+    DEMO_CACHE_TTL: float = 60.0
+    DEMO_CACHE_MAX_ENTRIES: int = 256
+    
+    # Segundos durante os quais as versões das tabelas (/db/versions/) são
+    # reutilizadas; escritas feitas pelo catalog invalidam-nas de imediato
+    TABLE_VERSIONS_TTL: float = 2.0
+    
+    # Cache-Control por prefixo de rota (respostas com ETag; "no-cache" obriga
+    # a revalidar, o que com If-None-Match custa um 304 sem body)
+    HTTP_CACHE_CONTROL: Dict[str, str] = {
+        "/api/demos": "public, no-cache",
+        "/api/clientes": "private, no-cache",
+        "/api/pedidos": "private, no-cache",
+        "/api/admin": "private, no-cache",
+    }
+    
+    # Ingestão de logs em batch (write-behind)
+    LOG_INGEST_ENABLED: bool = True
+    LOG_BATCH_SIZE: int = 100
+    LOG_FLUSH_INTERVAL: float = 1.0
+    LOG_QUEUE_MAXSIZE: int = 10000
+    # Fila cheia: 'block' espera por espaço, 'drop' descarta o log
+    LOG_QUEUE_OVERFLOW: Literal["block", "drop"] = "block"
+    # Lote que falha (timeout, 5xx, circuito aberto) é reenviado com backoff
+    LOG_FLUSH_RETRIES: int = 3
+    LOG_FLUSH_RETRY_BACKOFF: float = 0.5
+    
+    # Sessões de demos: heartbeats agrupados e expiração de sessões sem sinal
+    SESSION_HEARTBEAT_FLUSH_INTERVAL: float = 10.0
+    SESSION_TIMEOUT: int = 300
+    SESSION_EXPIRE_INTERVAL: float = 60.0
     
     class Config:
         env_file = ".env"
 
-settings = Settings()
\ No newline at end of file
+settings = Settings()
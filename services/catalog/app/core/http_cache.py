@@ -0,0 +1,133 @@
+"""
+HTTP Cache
+ETags fortes e GETs condicionais para os endpoints de leitura
+
+- Cada tabela tem um contador de versão na Database, incrementado por
+  triggers (GET /db/versions/, em cache curto no DatabaseClient)
+- O ETag de uma resposta deriva do path + query e das versões das tabelas
+  de que a rota depende; muda sempre que alguma delas é escrita e é igual
+  em todas as réplicas do catalog
+- Pedidos com If-None-Match igual ao ETag atual recebem 304 sem executar a
+  rota (sem ler as tabelas nem serializar o body)
+- Cache-Control configurável por prefixo de rota (HTTP_CACHE_CONTROL)
+"""
+import hashlib
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
+from app.services.database_client import db_client
+
+
+# ============================================================================
+# ETAGS
+# ============================================================================
+
+# Rota do catalog → tabelas de que o body depende (sem tabelas = sem ETag:
+# a rota define os próprios headers de cache, ex: fotos imutáveis, ou o body
+# depende da hora e não só das tabelas, ex: clientes ativos/expirados filtram
+# por datetime('now') e mudam quando um cliente expira, sem nenhuma escrita)
+ROUTE_TABLES: List[Tuple[str, Tuple[str, ...]]] = [
+    ("/api/demos/fotos", ()),
+    ("/api/clientes/active", ()),
+    ("/api/clientes/expired", ()),
+    ("/api/admin", ("admin",)),
+    ("/api/clientes", ("cliente",)),
+    ("/api/demos", ("demo",)),
+    ("/api/pedidos", ("pedido", "cliente")),
+]
+
+
+def _match(path: str) -> Optional[Tuple[str, Tuple[str, ...]]]:
+    for prefix, tables in ROUTE_TABLES:
+        if path == prefix or path.startswith(prefix + "/"):
+            return prefix, tables
+    return None
+
+
+def make_etag(key: str, tables: Iterable[str], versions: Dict[str, int]) -> str:
+    """ETag forte para a representação `key` dadas as versões das tabelas"""
+    token = ";".join(f"{t}={versions.get(t, 0)}" for t in sorted(tables))
+    digest = hashlib.sha1(f"{key}|{token}".encode()).hexdigest()[:20]
+    return f'"{digest}"'
+
+
+class HttpCacheStats:
+    """Contadores do middleware (para /internal/stats)"""
+
+    def __init__(self):
+        self.with_etag = 0
+        self.not_modified = 0
+        self.version_errors = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "with_etag": self.with_etag,
+            "not_modified": self.not_modified,
+            "version_errors": self.version_errors,
+            "table_versions": db_client.cached_table_versions()
+        }
+
+
+# Singleton instance
+http_cache_stats = HttpCacheStats()
+
+
+# ============================================================================
+# MIDDLEWARE
+# ============================================================================
+
+def _if_none_match(value: str) -> List[str]:
+    return [tag.strip() for tag in value.split(",") if tag.strip()]
+
+
+class ConditionalGetMiddleware:
+    """
+    Middleware ASGI: ETag + Cache-Control nas rotas de ROUTE_TABLES e
+    304 Not Modified quando o If-None-Match coincide
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+
+        match = _match(scope["path"])
+        if match is None or not match[1]:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            versions = await db_client.get_table_versions()
+        except Exception:
+            # Sem versões não há ETag seguro: servir a resposta normal
+            http_cache_stats.version_errors += 1
+            await self.app(scope, receive, send)
+            return
+
+        prefix, tables = match
+        query = scope.get("query_string", b"").decode("latin-1")
+        etag = make_etag(f"{scope['path']}?{query}", tables, versions)
+        cache_control = settings.HTTP_CACHE_CONTROL.get(prefix, "no-cache")
+        headers = [
+            (b"etag", etag.encode("latin-1")),
+            (b"cache-control", cache_control.encode("latin-1")),
+        ]
+
+        request_headers = dict(scope["headers"])
+        if_none_match = request_headers.get(b"if-none-match", b"").decode("latin-1")
+        if etag in _if_none_match(if_none_match):
+            http_cache_stats.not_modified += 1
+            await send({"type": "http.response.start", "status": 304, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                http_cache_stats.with_etag += 1
+                message = {**message, "headers": list(message.get("headers", [])) + headers}
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
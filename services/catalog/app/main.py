@@ -2,13 +2,24 @@
 Main Application - Catalog Service
 FastAPI application com todos os endpoints
 """
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 import httpx
+from app.models.identity import IdentityResolveRequest, IdentityResponse
 
 # Import routers
-from app.api import admin, clientes, demos, pedidos, logs, auth
+from app.api import admin, clientes, demos, pedidos, logs, sessions, auth
 from app.core.config import settings
+from app.core.http_cache import ConditionalGetMiddleware, http_cache_stats
+from ecatalog_shared.telemetry import TelemetryMiddleware, metrics_response
+from app.services.database_client import DatabaseServiceError, db_client
+from app.services.demo_service import demo_cache
+from app.services.identity_invalidator import identity_invalidator
+from app.services.log_ingestor import log_ingestor
+from app.services.session_service import session_service
+from app.services.token_verifier import token_verifier
 
 
 # ==========================================================================
@@ -42,6 +53,10 @@ app = FastAPI(
     - Aprovação/rejeição com transactions
     - Histórico
     
+    ### ⏱️ Sessions
+    - Início, heartbeat e fim de sessões de demos
+    - Base das métricas de tempo de utilização
+    
     ### 📊 Logs
     - Logs de atividade
     - Analytics e estatísticas
@@ -58,7 +73,8 @@ app = FastAPI(
     """,
     version="2.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse
 )
 
 
@@ -66,6 +82,17 @@ app = FastAPI(
 # MIDDLEWARE
 # ============================================================================
 
+# ETag + Cache-Control nas leituras; If-None-Match → 304 sem chamar a Database
+# (registado primeiro para ficar dentro do CORS e da telemetria)
+app.add_middleware(ConditionalGetMiddleware)
+
+# Compressão (dentro da telemetria, para esta medir bytes enviados)
+app.add_middleware(
+    GZipMiddleware,
+    minimum_size=settings.GZIP_MINIMUM_SIZE,
+    compresslevel=settings.GZIP_COMPRESS_LEVEL
+)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # Em produção: especificar domínios
@@ -74,6 +101,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Latência por rota, pedidos em curso e tamanho das respostas (/metrics)
+app.add_middleware(TelemetryMiddleware)
+
 
 # ============================================================================
 # ROOT & HEALTH
@@ -93,6 +123,7 @@ async def root():
             "demos": "/api/demos",
             "pedidos": "/api/pedidos",
             "logs": "/api/logs",
+            "sessions": "/api/sessions",
             "auth": "/api/auth",
             "metrics": "/api/metrics"
         }
@@ -110,12 +141,34 @@ async def health():
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Métricas de performance em formato Prometheus"""
+    return metrics_response()
+
+
+@app.get("/internal/stats")
+async def internal_stats():
+    """Estatísticas internas (pool HTTP, caches, ingestão de logs, auth)"""
+    return {
+        "http_pool": db_client.pool_stats(),
+        "single_flight": db_client.coalescing_stats(),
+        "resilience": db_client.policy.stats(),
+        "demo_cache": demo_cache.stats(),
+        "http_cache": http_cache_stats.stats(),
+        "log_ingestor": log_ingestor.stats(),
+        "sessions": session_service.stats(),
+        "auth": token_verifier.stats(),
+        "identity_invalidation": identity_invalidator.stats()
+    }
+
+
 # ============================================================================
 # METRICS PROXY
 # ============================================================================
 
 @app.get("/api/metrics/{path:path}")
-async def metrics_proxy(path: str):
+async def metrics_proxy(path: str, request: Request):
     """
     Proxy para Metrics Exporter Service
     
@@ -129,14 +182,20 @@ async def metrics_proxy(path: str):
         - /api/metrics/demos/overview
         - /api/metrics/logs/top-clients?limit=10
         - /api/metrics/demos/top-used?limit=10
+    
+    O body JSON é reenviado tal como vem (sem ser descodificado e
+    serializado de novo); a compressão para o cliente fica no GZipMiddleware.
     """
     metrics_exporter_url = "http://metrics-exporter:9090"
     
     try:
         async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(f"{metrics_exporter_url}/metrics/{path}")
+            response = await client.get(
+                f"{metrics_exporter_url}/metrics/{path}",
+                params=dict(request.query_params)
+            )
             response.raise_for_status()
-            return response.json()
+            return Response(content=response.content, media_type="application/json")
     except httpx.HTTPStatusError as e:
         raise HTTPException(
             status_code=e.response.status_code,
@@ -169,27 +228,67 @@ async def database_query_proxy(sql: str):
     IMPORTANTE: Em produção, adicionar validação/whitelist de queries
     """
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(
-                f"{settings.DATABASE_URL}/db/query",
-                params={"sql": sql}
-            )
-            response.raise_for_status()
-            return response.json()
-    except httpx.HTTPStatusError as e:
+        return await db_client.run_sql(sql)
+    except DatabaseServiceError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    except Exception as e:
         raise HTTPException(
-            status_code=e.response.status_code,
-            detail=f"Database error: {e.response.text}"
+            status_code=503,
+            detail=f"Database unavailable: {str(e)}"
         )
-    except httpx.RequestError as e:
+
+@app.get("/api/db/queries/{name}")
+async def database_named_query_proxy(name: str, request: Request):
+    """
+    Proxy para queries registadas na Database (por nome, parametrizadas)
+    
+    Usado pelo Metrics Exporter em vez de enviar SQL; os parâmetros vão
+    na query string, ex: /api/db/queries/tempo_cliente_demo?cliente_id=...
+    """
+    try:
+        return await db_client.run_named_query(name, dict(request.query_params))
+    except DatabaseServiceError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    except Exception as e:
         raise HTTPException(
             status_code=503,
             detail=f"Database unavailable: {str(e)}"
         )
+
+@app.get("/api/db/versions")
+async def database_versions_proxy():
+    """
+    Versões das tabelas na Database (contadores mantidos por triggers)
+    
+    Permite a outros serviços (ex: Metrics Exporter) detetar alterações com
+    um pedido mínimo, sem voltar a ler as tabelas.
+    """
+    try:
+        return await db_client.get_table_versions()
     except Exception as e:
         raise HTTPException(
-            status_code=500,
-            detail=f"Unexpected error: {str(e)}"
+            status_code=503,
+            detail=f"Database unavailable: {str(e)}"
+        )
+
+@app.post("/api/db/identity/resolve", response_model=IdentityResponse)
+async def database_identity_proxy(request: IdentityResolveRequest):
+    """
+    Resolver identidade no login (usado pelo Authentication Service)
+    
+    Admin → cliente → domínio permitido (cria cliente), numa só transação
+    na Database em vez de vários pedidos por login. Erros da Database (ex:
+    400 com criado_por inexistente) passam com o mesmo status; 503 só se a
+    Database não responder.
+    """
+    try:
+        return await db_client.resolve_identity(request.model_dump())
+    except DatabaseServiceError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    except Exception as e:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Database unavailable: {str(e)}"
         )
 
 # ============================================================================
@@ -231,6 +330,13 @@ app.include_router(
     tags=["📊 Logs"]
 )
 
+# Sessões de demos (métricas de tempo)
+app.include_router(
+    sessions.router,
+    prefix="/api/sessions",
+    tags=["⏱️ Sessions"]
+)
+
 # Authentication (Proxy)
 app.include_router(
     auth.router,
@@ -246,12 +352,19 @@ app.include_router(
 @app.on_event("startup")
 async def startup_event():
     """Executado no início"""
+    await db_client.start()
+    if settings.LOG_INGEST_ENABLED:
+        await log_ingestor.start()
+    await session_service.start()
+    await token_verifier.start()
     print("=" * 60)
     print("🚀 LTP Labs E-Catalog API - Starting...")
     print("=" * 60)
     print(f"📦 Service: {settings.SERVICE_NAME}")
     print(f"🔢 Version: 2.0.0")
     print(f"🔗 Database URL: {settings.DATABASE_URL}")
+    print(f"🔌 HTTP Pool: max={settings.HTTP_MAX_CONNECTIONS}, keep-alive={settings.HTTP_MAX_KEEPALIVE_CONNECTIONS}, http2={db_client.http2}")
+    print(f"📝 Log ingest: batch={settings.LOG_BATCH_SIZE}, interval={settings.LOG_FLUSH_INTERVAL}s, running={log_ingestor.running}")
     print(f"🔐 Auth URL: {settings.AUTHENTICATION_URL}")
     print(f"📈 Metrics Proxy: /api/metrics/*")
     print(f"📖 Docs: http://localhost:8000/docs")
@@ -264,6 +377,11 @@ async def startup_event():
 async def shutdown_event():
     """Executado ao parar"""
     print("🛑 Shutting down...")
+    await token_verifier.stop()
+    await identity_invalidator.stop()
+    await session_service.stop()
+    await log_ingestor.stop()
+    await db_client.close()
     print("👋 Goodbye!")
 
 
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, field_validator
-from typing import Optional, Literal
+from typing import Dict, List, Optional, Literal
 import re
 
 
@@ -14,7 +14,7 @@ class DemoBase(BaseModel):
     codigo_projeto: Optional[str] = None
     comercial_nome: Optional[str] = None
     comercial_contacto: Optional[str] = None  # Validação de email
-    comercial_foto_url: Optional[str] = None  # Pode ser Base64 ou URL
+    comercial_foto_url: Optional[str] = None  # Base64 (data URI) no envio; URL da foto nas respostas
 
 
 class DemoCreate(DemoBase):
@@ -76,3 +76,16 @@ class DemoResponse(DemoBase):
     
     class Config:
         from_attributes = True
+
+
+class DemoSearchResult(DemoResponse):
+    """Demo encontrada na pesquisa, com a relevância"""
+    score: float  # bm25 (menor = mais relevante)
+
+
+class DemoSearchResponse(BaseModel):
+    """Resultado da pesquisa full-text de demos"""
+    query: str
+    total: int
+    results: List[DemoSearchResult]
+    facets: Dict[str, Dict[str, int]]  # vertical/horizontal/estado → valor → contagem
@@ -0,0 +1,25 @@
+"""
+Identity Models
+Models Pydantic para resolução de identidade no login (Authentication)
+"""
+from pydantic import BaseModel, EmailStr, Field
+from typing import List, Optional
+
+
+class IdentityResolveRequest(BaseModel):
+    """Model para resolver (ou criar) a identidade de um email"""
+    email: EmailStr
+    nome: Optional[str] = None
+    dominios_permitidos: List[str] = Field(
+        default_factory=list, description="Domínios cujos utilizadores são criados como cliente"
+    )
+    criado_por: str  # admin_id dos clientes criados automaticamente
+    validade_dias: int = Field(default=30, ge=1)
+
+
+class IdentityResponse(BaseModel):
+    """Model para resposta de identidade"""
+    email: str
+    role: Optional[str] = Field(None, description="admin, viewer ou None (não autorizado)")
+    id: Optional[str] = None
+    criado: bool = False
@@ -0,0 +1,16 @@
+"""
+Page Model
+Resposta paginada por cursor (keyset) devolvida pelos endpoints /page
+"""
+from pydantic import BaseModel
+from typing import Generic, List, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    """Página de resultados; next_cursor é None na última página"""
+    items: List[T]
+    next_cursor: Optional[str] = None
+    limit: int
@@ -0,0 +1,31 @@
+"""
+Session Models
+Models Pydantic para sessões de utilização de demos (métricas de tempo)
+"""
+from pydantic import BaseModel, Field
+from typing import Optional
+
+
+class SessionStart(BaseModel):
+    """Model para iniciar sessão"""
+    cliente_id: str
+    demo_id: str
+    session_id: Optional[str] = Field(
+        None, description="Gerado pelo Catalog se omitido; repetir o mesmo id é idempotente"
+    )
+
+
+class SessionEnd(BaseModel):
+    """Model para terminar sessão"""
+    timestamp_fim: Optional[str] = Field(None, description="UTC; default: agora")
+
+
+class SessionResponse(BaseModel):
+    """Model para resposta de sessão"""
+    session_id: str
+    cliente_id: str
+    demo_id: str
+    timestamp_inicio: str
+    timestamp_fim: Optional[str] = None
+    duracao_segundos: Optional[int] = None
+    ultimo_heartbeat: Optional[str] = None
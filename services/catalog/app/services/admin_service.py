@@ -2,9 +2,11 @@
 Admin Service - Lógica de negócio para administradores
 Autenticação via Microsoft OAuth apenas
 """
-from typing import List
+from typing import List, Optional
 from app.services.database_client import db_client
+from app.services.identity_invalidator import identity_invalidator
 from app.models.admin import AdminCreate, AdminUpdate, AdminResponse
+from app.models.page import Page
 
 
 class AdminService:
@@ -15,6 +17,11 @@ class AdminService:
         admins = await db_client.get_all_admins()
         return [AdminResponse(**admin) for admin in admins]
     
+    async def get_admins_page(self, cursor: Optional[str] = None, limit: int = 50) -> Page[AdminResponse]:
+        """Obter página de administradores (cursor opaco)"""
+        page = await db_client.get_admins_page(cursor=cursor, limit=limit)
+        return Page[AdminResponse](**page)
+    
     async def get_admin(self, admin_id: str) -> AdminResponse:
         """Obter administrador por ID"""
         admin = await db_client.get_admin(admin_id)
@@ -34,6 +41,7 @@ class AdminService:
         }
         
         admin = await db_client.create_admin(db_data)
+        identity_invalidator.notify([admin_data.email])
         return AdminResponse(**admin)
     
     async def update_admin(self, admin_id: str, admin_data: AdminUpdate) -> AdminResponse:
@@ -50,11 +58,14 @@ class AdminService:
             db_data["contacto"] = admin_data.contacto
         
         admin = await db_client.update_admin(admin_id, db_data)
+        # O email anterior não é conhecido: invalidar todas as identidades
+        identity_invalidator.notify(None if "email" in db_data else [admin["email"]])
         return AdminResponse(**admin)
     
     async def delete_admin(self, admin_id: str) -> None:
         """Apagar administrador"""
         await db_client.delete_admin(admin_id)
+        identity_invalidator.notify()
 
 
 # Singleton instance
@@ -0,0 +1,100 @@
+"""
+Cache Service
+Cache em memória (read-through) com TTL, eviction LRU e limite de entradas
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """
+    Cache LRU com expiração por TTL
+    
+    - Cada entrada expira `ttl` segundos depois de ser guardada
+    - Quando o cache atinge `max_entries`, a entrada menos usada é removida
+    - Invalidação explícita via invalidate()/clear() (após escritas)
+    """
+    
+    def __init__(self, name: str, ttl: float, max_entries: int):
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+    
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Obter valor (None se não existir ou tiver expirado)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+        
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+    
+    def set(self, key: Hashable, value: Any) -> None:
+        """Guardar valor, removendo a entrada LRU se necessário"""
+        if not self.enabled:
+            return
+        
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Read-through: devolve do cache ou chama loader() e guarda o resultado"""
+        if not self.enabled:
+            return await loader()
+        
+        value = self.get(key)
+        if value is not None:
+            return value
+        
+        value = await loader()
+        self.set(key, value)
+        return value
+    
+    def invalidate(self, key: Hashable) -> None:
+        """Remover uma entrada"""
+        if self._entries.pop(key, None) is not None:
+            self.invalidations += 1
+    
+    def clear(self) -> None:
+        """Remover todas as entradas"""
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Contadores de hits/misses para monitorização"""
+        lookups = self.hits + self.misses
+        return {
+            "name": self.name,
+            "enabled": self.enabled,
+            "ttl_seconds": self.ttl,
+            "max_entries": self.max_entries,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations
+        }
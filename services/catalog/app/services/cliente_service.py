@@ -3,9 +3,11 @@ Cliente Service
 Lógica de negócio para Clientes
 Autenticação via Microsoft OAuth apenas
 """
-from typing import List
+from typing import List, Optional
 from app.models.cliente import ClienteCreate, ClienteUpdate, ClienteResponse
+from app.models.page import Page
 from app.services.database_client import db_client
+from app.services.identity_invalidator import identity_invalidator
 
 
 class ClienteService:
@@ -16,6 +18,11 @@ class ClienteService:
         clientes = await db_client.get_all_clientes()
         return [ClienteResponse(**c) for c in clientes]
     
+    async def get_clientes_page(self, cursor: Optional[str] = None, limit: int = 50) -> Page[ClienteResponse]:
+        """Obter página de clientes (cursor opaco)"""
+        page = await db_client.get_clientes_page(cursor=cursor, limit=limit)
+        return Page[ClienteResponse](**page)
+    
     async def get_active_clientes(self) -> List[ClienteResponse]:
         """Obter clientes ativos (não expirados)"""
         clientes = await db_client.get_active_clientes()
@@ -40,17 +47,21 @@ class ClienteService:
         """Criar novo cliente"""
         cliente_data = cliente.model_dump()
         created = await db_client.create_cliente(cliente_data)
+        identity_invalidator.notify([created["email"]])
         return ClienteResponse(**created)
     
     async def update_cliente(self, cliente_id: str, cliente: ClienteUpdate) -> ClienteResponse:
         """Atualizar cliente"""
         update_data = cliente.model_dump(exclude_none=True)
         updated = await db_client.update_cliente(cliente_id, update_data)
+        # O email anterior não é conhecido: invalidar todas as identidades
+        identity_invalidator.notify(None if "email" in update_data else [updated["email"]])
         return ClienteResponse(**updated)
     
     async def revoke_access(self, cliente_id: str) -> None:
         """Revogar acesso do cliente (expira imediatamente)"""
         await db_client.delete_cliente(cliente_id)
+        identity_invalidator.notify()
 
 
 # Singleton instance
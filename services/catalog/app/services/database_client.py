@@ -1,44 +1,334 @@
+import asyncio
 import httpx
-from typing import List, Dict, Any, Optional
+import time
+from typing import List, Dict, Any, Hashable, Optional, Tuple
 from app.core.config import settings
+from ecatalog_shared.resilience import (
+    IDEMPOTENCY_HEADER, IDEMPOTENT_METHODS, RETRY_STATUSES,
+    CircuitOpenError, UpstreamPolicy, new_idempotency_key
+)
+from ecatalog_shared.telemetry import observe_upstream
+
+
+def _http2_available() -> bool:
+    """HTTP/2 só é usado se o pacote h2 estiver instalado"""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class DatabaseServiceError(Exception):
+    """Resposta de erro da Database (status e detail do upstream)"""
+    
+    def __init__(self, status_code: int, detail: Any):
+        self.status_code = status_code
+        self.detail = detail
+        super().__init__(f"Erro na comunicação com Database Service: {detail}")
 
 
 class DatabaseClient:
     """
     Cliente HTTP para comunicar com o Pod Database (port 8001)
     Todos os métodos são async para melhor performance
+    
+    Usa um único httpx.AsyncClient (pool de conexões com keep-alive)
+    durante toda a vida da aplicação: aberto no startup e fechado no shutdown.
+    
+    GETs idênticos concorrentes (mesmo endpoint e params) partilham um único
+    pedido à Database (single-flight); cada caller recebe o seu próprio
+    objeto, descodificado do mesmo body.
     """
     
     def __init__(self):
         self.base_url = settings.DATABASE_URL
         self.timeout = settings.HTTP_TIMEOUT
+        self._client: Optional[httpx.AsyncClient] = None
+        self.http2 = False
+        
+        # Estatísticas de utilização do pool
+        self._in_flight = 0
+        self._max_in_flight = 0
+        self._total_requests = 0
+        self._total_errors = 0
+        self._total_time = 0.0
+        
+        # Versões das tabelas (cache curto, invalidado pelas escritas)
+        self._versions: Optional[Dict[str, int]] = None
+        self._versions_expires = 0.0
+        self._versions_lock = asyncio.Lock()
+        self._writes = 0
+        
+        # Deadlines, retries, hedging e circuit breaker
+        self.policy = UpstreamPolicy(
+            "database",
+            retries=settings.UPSTREAM_RETRIES,
+            backoff_base=settings.UPSTREAM_BACKOFF_BASE,
+            backoff_max=settings.UPSTREAM_BACKOFF_MAX,
+            retry_writes=True,  # a Database deduplica por Idempotency-Key
+            hedge_enabled=settings.UPSTREAM_HEDGE_ENABLED,
+            hedge_min_delay=settings.UPSTREAM_HEDGE_MIN_DELAY,
+            failure_threshold=settings.CIRCUIT_FAILURE_THRESHOLD,
+            reset_timeout=settings.CIRCUIT_RESET_TIMEOUT
+        )
+        
+        # Single-flight: GETs em curso por (endpoint, params)
+        self._inflight_gets: Dict[Hashable, asyncio.Task] = {}
+        self._coalesce_leaders = 0
+        self._coalesce_followers = 0
     
+    # ========================================================================
+    # LIFECYCLE
+    # ========================================================================
+    
+    def _build_client(self) -> httpx.AsyncClient:
+        """Criar o AsyncClient com limites de pool, keep-alive e HTTP/2"""
+        self.http2 = settings.HTTP2_ENABLED and _http2_available()
+        return httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=httpx.Timeout(self.timeout, connect=settings.HTTP_CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY
+            ),
+            http2=self.http2
+        )
+    
+    async def start(self) -> None:
+        """Abrir o pool de conexões (startup da aplicação)"""
+        if self._client is None:
+            self._client = self._build_client()
+    
+    async def close(self) -> None:
+        """Fechar o pool de conexões (shutdown da aplicação)"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """
+        httpx.AsyncClient partilhado
+        Criado on-demand se a aplicação ainda não passou pelo startup
+        """
+        if self._client is None:
+            self._client = self._build_client()
+        return self._client
+    
+    def deadline_for(self, endpoint: str) -> float:
+        """Deadline do endpoint em segundos (prefixo mais longo em HTTP_ENDPOINT_TIMEOUTS)"""
+        timeout = self.timeout
+        match = ""
+        for prefix, value in settings.HTTP_ENDPOINT_TIMEOUTS.items():
+            if endpoint.startswith(prefix) and len(prefix) > len(match):
+                match, timeout = prefix, value
+        return timeout
+    
+    def timeout_for(self, endpoint: str) -> httpx.Timeout:
+        """Timeout httpx do endpoint (ver deadline_for)"""
+        return httpx.Timeout(self.deadline_for(endpoint), connect=settings.HTTP_CONNECT_TIMEOUT)
+    
+    def pool_stats(self) -> Dict[str, Any]:
+        """Estatísticas de utilização do pool (para dimensionamento sob carga)"""
+        connections = []
+        if self._client is not None:
+            # httpcore expõe as conexões do pool via transport
+            pool = getattr(self._client._transport, "_pool", None)
+            connections = list(getattr(pool, "connections", []) or [])
+        
+        idle = sum(1 for c in connections if c.is_idle())
+        return {
+            "open": self._client is not None,
+            "http2": self.http2,
+            "max_connections": settings.HTTP_MAX_CONNECTIONS,
+            "max_keepalive_connections": settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            "connections": len(connections),
+            "connections_idle": idle,
+            "connections_active": len(connections) - idle,
+            "requests_in_flight": self._in_flight,
+            "max_requests_in_flight": self._max_in_flight,
+            "total_requests": self._total_requests,
+            "total_errors": self._total_errors,
+            "avg_latency_ms": round(self._total_time / self._total_requests * 1000, 2)
+                if self._total_requests else 0
+        }
+    
+    def coalescing_stats(self) -> Dict[str, Any]:
+        """Contadores do single-flight (pedidos GET poupados à Database)"""
+        total = self._coalesce_leaders + self._coalesce_followers
+        return {
+            "enabled": settings.SINGLE_FLIGHT_ENABLED,
+            "in_flight": len(self._inflight_gets),
+            "upstream_gets": self._coalesce_leaders,
+            "coalesced_gets": self._coalesce_followers,
+            "coalescing_ratio": round(self._coalesce_followers / total, 4) if total else 0
+        }
+    
+    @staticmethod
+    def _flight_key(endpoint: str, kwargs: Dict[str, Any]) -> Optional[Hashable]:
+        """Chave do GET (None = não partilhável, ex: headers próprios)"""
+        if set(kwargs) - {"params"}:
+            return None
+        params = kwargs.get("params") or {}
+        try:
+            key = (endpoint, tuple(sorted(params.items())))
+            hash(key)
+        except TypeError:
+            return None
+        return key
     
     async def _request(self, method: str, endpoint: str, **kwargs) -> Any:
         """
         Fazer request HTTP ao Database Service
+        GETs idênticos em curso são partilhados (ver _coalesced_get)
+        """
+        key = None
+        if method == "GET" and settings.SINGLE_FLIGHT_ENABLED:
+            key = self._flight_key(endpoint, kwargs)
+        
+        if key is None:
+            response = await self._send(method, endpoint, **kwargs)
+        else:
+            response = await self._coalesced_get(key, endpoint, **kwargs)
+        
+        if response.status_code == 204:
+            return None
+        return response.json()
+    
+    async def _coalesced_get(self, key: Hashable, endpoint: str, **kwargs) -> httpx.Response:
         """
-        url = f"{self.base_url}{endpoint}"
+        Juntar-se ao GET em curso com a mesma chave ou iniciar um novo
+        
+        Só partilha pedidos que ainda não terminaram: o resultado nunca é
+        mais antigo do que o de um pedido feito agora. shield() impede que um
+        cliente que desliga cancele o pedido dos restantes.
+        """
+        task = self._inflight_gets.get(key)
+        if task is not None:
+            self._coalesce_followers += 1
+            return await asyncio.shield(task)
+        
+        self._coalesce_leaders += 1
+        task = asyncio.ensure_future(self._send("GET", endpoint, **kwargs))
+        self._inflight_gets[key] = task
+        
+        def _done(t: asyncio.Task) -> None:
+            if self._inflight_gets.get(key) is t:
+                del self._inflight_gets[key]
+            # Evitar "exception was never retrieved" se todos desistiram
+            if not t.cancelled():
+                t.exception()
+        
+        task.add_done_callback(_done)
+        return await asyncio.shield(task)
+    
+    async def _send(self, method: str, endpoint: str, **kwargs) -> httpx.Response:
+        """
+        Enviar request ao Database Service (resposta com body já lido)
+        
+        Deadline do endpoint para o conjunto das tentativas, retries com
+        jitter e circuit breaker (ver ecatalog_shared.resilience). As escritas levam
+        Idempotency-Key, igual em todas as tentativas: a Database devolve a
+        resposta guardada em vez de repetir a escrita.
+        """
+        deadline = self.deadline_for(endpoint)
+        if method not in IDEMPOTENT_METHODS:
+            kwargs["headers"] = {**kwargs.get("headers", {}), IDEMPOTENCY_HEADER: new_idempotency_key()}
+        
+        async def attempt(restante: float) -> httpx.Response:
+            self._in_flight += 1
+            self._max_in_flight = max(self._max_in_flight, self._in_flight)
+            inicio = time.perf_counter()
+            status = None
+            try:
+                response = await self.client.request(
+                    method, endpoint,
+                    timeout=httpx.Timeout(restante, connect=min(restante, settings.HTTP_CONNECT_TIMEOUT)),
+                    **kwargs
+                )
+                status = response.status_code
+                return response
+            finally:
+                duracao = time.perf_counter() - inicio
+                self._in_flight -= 1
+                self._total_requests += 1
+                self._total_time += duracao
+                observe_upstream("database", method, endpoint, status, duracao)
         
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.request(method, url, **kwargs)
-                response.raise_for_status()
-                
-                if response.status_code == 204:
-                    return None
-                
-                return response.json()
+            response = await self.policy.execute(method, endpoint, attempt, deadline)
+            response.raise_for_status()
+            return response
         except httpx.HTTPStatusError as e:
+            self._total_errors += 1
             try:
                 error_detail = e.response.json().get("detail", str(e))
             except Exception:
                 error_detail = str(e)
-            raise Exception(f"Erro na comunicação com Database Service: {error_detail}")
+            raise DatabaseServiceError(e.response.status_code, error_detail)
         except Exception as e:
+            self._total_errors += 1
             raise Exception(f"Erro ao comunicar com Database Service: {str(e)}")
+        finally:
+            # Escritas (mesmo falhadas, podem ter sido aplicadas) invalidam
+            # as versões em cache; GETs iniciados antes da escrita deixam de
+            # ser partilhados com pedidos novos
+            if method != "GET":
+                self._writes += 1
+                self._versions_expires = 0.0
+                self._inflight_gets.clear()
 
     
+    async def _stream(self, method: str, endpoint: str, **kwargs) -> httpx.Response:
+        """
+        Abrir request em streaming ao Database Service
+        O body não é lido; o caller tem de fechar a resposta (response.aclose())
+        Sem retries (o body não é reproduzível), mas sujeito ao circuit breaker
+        """
+        breaker = self.policy.breaker
+        try:
+            breaker.before_call()
+        except CircuitOpenError as e:
+            raise Exception(f"Erro ao comunicar com Database Service: {str(e)}")
+        
+        request = self.client.build_request(
+            method, endpoint, timeout=self.timeout_for(endpoint), **kwargs
+        )
+        inicio = time.perf_counter()
+        try:
+            response = await self.client.send(request, stream=True)
+        except Exception as e:
+            breaker.record_failure()
+            observe_upstream("database", method, endpoint, None, time.perf_counter() - inicio)
+            raise Exception(f"Erro ao comunicar com Database Service: {str(e)}")
+        # Tempo até aos headers (o body é consumido pelo caller)
+        observe_upstream("database", method, endpoint, response.status_code,
+                         time.perf_counter() - inicio)
+        if response.status_code in RETRY_STATUSES:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        
+        if response.is_error:
+            await response.aread()
+            await response.aclose()
+            try:
+                error_detail = response.json().get("detail", response.text)
+            except Exception:
+                error_detail = response.text
+            raise DatabaseServiceError(response.status_code, error_detail)
+        
+        return response
+    
+    async def _get_page(self, endpoint: str, cursor: Optional[str], limit: int) -> Dict[str, Any]:
+        """GET paginado por cursor: {items, next_cursor, limit}"""
+        params: Dict[str, Any] = {"limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        return await self._request("GET", endpoint, params=params)
+    
     # ========================================================================
     # ADMIN
     # ========================================================================
@@ -47,6 +337,10 @@ class DatabaseClient:
         """GET /db/admin/all"""
         return await self._request("GET", "/db/admin/all")
     
+    async def get_admins_page(self, cursor: Optional[str] = None, limit: int = 50) -> Dict[str, Any]:
+        """GET /db/admin/page?cursor={cursor}&limit={limit}"""
+        return await self._get_page("/db/admin/page", cursor, limit)
+    
     async def get_admin(self, admin_id: str) -> Dict[str, Any]:
         """GET /db/admin/{id}"""
         return await self._request("GET", f"/db/admin/{admin_id}")
@@ -75,6 +369,10 @@ class DatabaseClient:
         """GET /db/clientes/all"""
         return await self._request("GET", "/db/clientes/all")
     
+    async def get_clientes_page(self, cursor: Optional[str] = None, limit: int = 50) -> Dict[str, Any]:
+        """GET /db/clientes/page?cursor={cursor}&limit={limit}"""
+        return await self._get_page("/db/clientes/page", cursor, limit)
+    
     async def get_active_clientes(self) -> List[Dict[str, Any]]:
         """GET /db/clientes/active"""
         return await self._request("GET", "/db/clientes/active")
@@ -103,6 +401,10 @@ class DatabaseClient:
         """DELETE /db/clientes/{id} - Revoga acesso (expira imediatamente)"""
         await self._request("DELETE", f"/db/clientes/{cliente_id}")
     
+    async def resolve_identity(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """POST /db/identity/resolve - admin/cliente por email, cria cliente se permitido (TRANSACTION)"""
+        return await self._request("POST", "/db/identity/resolve", json=data)
+    
     
     # ========================================================================
     # DEMOS
@@ -112,6 +414,10 @@ class DatabaseClient:
         """GET /db/demos/all"""
         return await self._request("GET", "/db/demos/all")
     
+    async def get_demos_page(self, cursor: Optional[str] = None, limit: int = 50) -> Dict[str, Any]:
+        """GET /db/demos/page?cursor={cursor}&limit={limit}"""
+        return await self._get_page("/db/demos/page", cursor, limit)
+    
     async def get_active_demos(self) -> List[Dict[str, Any]]:
         """GET /db/demos/active"""
         return await self._request("GET", "/db/demos/active")
@@ -124,6 +430,29 @@ class DatabaseClient:
         """GET /db/demos/by-horizontal/{horizontal}"""
         return await self._request("GET", f"/db/demos/by-horizontal/{horizontal}")
     
+    async def search_demos(
+        self,
+        q: str,
+        estado: Optional[str] = None,
+        vertical: Optional[str] = None,
+        horizontal: Optional[str] = None,
+        limit: int = 20
+    ) -> Dict[str, Any]:
+        """GET /db/demos/search?q={q} (FTS5, ordenado por relevância, com facets)"""
+        params = {"q": q, "limit": limit}
+        for name, value in (("estado", estado), ("vertical", vertical), ("horizontal", horizontal)):
+            if value is not None:
+                params[name] = value
+        return await self._request("GET", "/db/demos/search", params=params)
+    
+    async def get_demo_photo(self, photo_hash: str) -> Tuple[bytes, str]:
+        """GET /db/demos/fotos/{hash} → (conteúdo, content-type)"""
+        response = await self._stream("GET", f"/db/demos/fotos/{photo_hash}")
+        try:
+            return await response.aread(), response.headers.get("content-type", "application/octet-stream")
+        finally:
+            await response.aclose()
+    
     async def get_demo(self, demo_id: str) -> Dict[str, Any]:
         """GET /db/demos/{id}"""
         return await self._request("GET", f"/db/demos/{demo_id}")
@@ -148,6 +477,10 @@ class DatabaseClient:
         """GET /db/pedidos/all"""
         return await self._request("GET", "/db/pedidos/all")
     
+    async def get_pedidos_page(self, cursor: Optional[str] = None, limit: int = 50) -> Dict[str, Any]:
+        """GET /db/pedidos/page?cursor={cursor}&limit={limit}"""
+        return await self._get_page("/db/pedidos/page", cursor, limit)
+    
     async def get_approved_pedidos(self) -> List[Dict[str, Any]]:
         """GET /db/pedidos/approved"""
         return await self._request("GET", "/db/pedidos/approved")
@@ -198,6 +531,10 @@ class DatabaseClient:
         """GET /db/logs/all?limit={limit}"""
         return await self._request("GET", "/db/logs/all", params={"limit": limit})
     
+    async def get_logs_page(self, cursor: Optional[str] = None, limit: int = 50) -> Dict[str, Any]:
+        """GET /db/logs/page?cursor={cursor}&limit={limit}"""
+        return await self._get_page("/db/logs/page", cursor, limit)
+    
     async def get_logs_by_cliente(self, cliente_id: str, limit: int = 50) -> List[Dict[str, Any]]:
         """GET /db/logs/by-cliente/{id}"""
         return await self._request("GET", f"/db/logs/by-cliente/{cliente_id}", 
@@ -208,14 +545,114 @@ class DatabaseClient:
         return await self._request("GET", f"/db/logs/by-demo/{demo_id}", 
                                   params={"limit": limit})
     
+    async def export_logs(self, params: Dict[str, Any]) -> httpx.Response:
+        """
+        GET /db/logs/export (streaming NDJSON/CSV)
+        Sem compressão na rede interna: o GZipMiddleware do Catalog negoceia
+        a compressão com o cliente final
+        """
+        return await self._stream("GET", "/db/logs/export", params=params,
+                                  headers={"Accept-Encoding": "identity"})
+    
     async def create_log(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """POST /db/logs/"""
         return await self._request("POST", "/db/logs/", json=data)
     
+    async def create_logs_bulk(self, logs: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """POST /db/logs/bulk"""
+        return await self._request("POST", "/db/logs/bulk", json=logs)
+    
     async def get_log_stats(self) -> List[Dict[str, Any]]:
         """GET /db/logs/stats/summary"""
         return await self._request("GET", "/db/logs/stats/summary")
     
+    async def get_logs_overview_aggregate(self) -> Dict[str, Any]:
+        """GET /db/logs/aggregates/overview"""
+        return await self._request("GET", "/db/logs/aggregates/overview")
+    
+    async def get_top_clients_aggregate(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """GET /db/logs/aggregates/top-clients?limit={limit}"""
+        return await self._request("GET", "/db/logs/aggregates/top-clients",
+                                  params={"limit": limit})
+    
+    async def get_top_demos_aggregate(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """GET /db/logs/aggregates/top-demos?limit={limit}"""
+        return await self._request("GET", "/db/logs/aggregates/top-demos",
+                                  params={"limit": limit})
+    
+    async def get_demos_per_client_aggregate(self) -> List[Dict[str, Any]]:
+        """GET /db/logs/aggregates/demos-per-client"""
+        return await self._request("GET", "/db/logs/aggregates/demos-per-client")
+    
+    # ========================================================================
+    # SESSIONS
+    # ========================================================================
+    
+    async def get_session(self, session_id: str) -> Dict[str, Any]:
+        """GET /db/sessions/{id}"""
+        return await self._request("GET", f"/db/sessions/{session_id}")
+    
+    async def start_session(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """POST /db/sessions/start"""
+        return await self._request("POST", "/db/sessions/start", json=data)
+    
+    async def heartbeat_sessions(self, session_ids: List[str]) -> Dict[str, Any]:
+        """POST /db/sessions/heartbeats"""
+        return await self._request("POST", "/db/sessions/heartbeats",
+                                   json={"session_ids": session_ids})
+    
+    async def end_session(self, session_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """POST /db/sessions/{id}/end"""
+        return await self._request("POST", f"/db/sessions/{session_id}/end", json=data)
+    
+    async def expire_sessions(self, timeout_segundos: int) -> Dict[str, Any]:
+        """POST /db/sessions/expire?timeout_segundos={timeout}"""
+        return await self._request("POST", "/db/sessions/expire",
+                                   params={"timeout_segundos": timeout_segundos})
+    
+    # ========================================================================
+    # TABLE VERSIONS
+    # ========================================================================
+    
+    async def get_table_versions(self) -> Dict[str, int]:
+        """
+        GET /db/versions/ (contadores mantidos por triggers na Database)
+        
+        Guardado durante TABLE_VERSIONS_TTL segundos; qualquer escrita feita
+        por este client força nova leitura. Pedidos concorrentes partilham a
+        mesma leitura.
+        """
+        if self._versions is not None and time.monotonic() < self._versions_expires:
+            return self._versions
+        
+        async with self._versions_lock:
+            if self._versions is not None and time.monotonic() < self._versions_expires:
+                return self._versions
+            
+            writes = self._writes
+            versions = await self._request("GET", "/db/versions/")
+            self._versions = versions
+            # Uma escrita durante a leitura torna o resultado suspeito: não guardar
+            if writes == self._writes:
+                self._versions_expires = time.monotonic() + settings.TABLE_VERSIONS_TTL
+            return versions
+    
+    def cached_table_versions(self) -> Optional[Dict[str, int]]:
+        """Últimas versões lidas (sem pedido à Database)"""
+        return self._versions
+    
+    # ========================================================================
+    # QUERIES (Metrics Exporter)
+    # ========================================================================
+    
+    async def run_named_query(self, name: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """GET /db/queries/{name} (query registada, parâmetros na query string)"""
+        return await self._request("GET", f"/db/queries/{name}", params=params)
+    
+    async def run_sql(self, sql: str) -> List[Dict[str, Any]]:
+        """GET /db/query?sql={sql}"""
+        return await self._request("GET", "/db/query", params={"sql": sql})
+    
     # ========================================================================
     # DOCKER IMAGES
     # ========================================================================
@@ -2,54 +2,121 @@
 Demo Service
 Lógica de negócio para Demos
 """
-from typing import List, Dict, Any
-from app.models.demo import DemoCreate, DemoUpdate, DemoResponse
+from typing import List, Dict, Any, Optional, Tuple
+from app.core.config import settings
+from app.models.demo import DemoCreate, DemoUpdate, DemoResponse, DemoSearchResponse
+from app.models.page import Page
+from app.services.cache import TTLCache
 from app.services.database_client import db_client
 
 
+# Demos mudam raramente: as leituras são servidas a partir deste cache e
+# as escritas feitas através deste service invalidam-no explicitamente
+# (mesmo em caso de erro, pois a escrita pode ter sido aplicada).
+# As chaves incluem a versão da tabela demo, pelo que escritas feitas por
+# outras réplicas ou diretamente na Database também deixam de ser servidas.
+demo_cache = TTLCache(
+    "demos",
+    ttl=settings.DEMO_CACHE_TTL,
+    max_entries=settings.DEMO_CACHE_MAX_ENTRIES
+)
+
+
 class DemoService:
     """Service para gestão de demos"""
     
+    async def _versioned(self, key: tuple) -> tuple:
+        versions = await db_client.get_table_versions()
+        return (versions.get("demo", 0),) + key
+    
+    async def _cached_list(self, key: tuple, loader) -> List[DemoResponse]:
+        async def load():
+            demos = await loader()
+            return [DemoResponse(**d) for d in demos]
+        
+        return list(await demo_cache.get_or_load(await self._versioned(key), load))
+    
     async def get_all_demos(self) -> List[DemoResponse]:
         """Obter todas as demos"""
-        demos = await db_client.get_all_demos()
-        return [DemoResponse(**d) for d in demos]
+        return await self._cached_list(("all",), db_client.get_all_demos)
+    
+    async def get_demos_page(self, cursor: Optional[str] = None, limit: int = 50) -> Page[DemoResponse]:
+        """Obter página de demos (cursor opaco)"""
+        page = await db_client.get_demos_page(cursor=cursor, limit=limit)
+        return Page[DemoResponse](**page)
     
     async def get_active_demos(self) -> List[DemoResponse]:
         """Obter apenas demos ativas"""
-        demos = await db_client.get_active_demos()
-        return [DemoResponse(**d) for d in demos]
+        return await self._cached_list(("active",), db_client.get_active_demos)
     
     async def get_demos_by_vertical(self, vertical: str) -> List[DemoResponse]:
         """Obter demos por vertical"""
-        demos = await db_client.get_demos_by_vertical(vertical)
-        return [DemoResponse(**d) for d in demos]
+        return await self._cached_list(
+            ("vertical", vertical),
+            lambda: db_client.get_demos_by_vertical(vertical)
+        )
     
     async def get_demos_by_horizontal(self, horizontal: str) -> List[DemoResponse]:
         """Obter demos por horizontal"""
-        demos = await db_client.get_demos_by_horizontal(horizontal)
-        return [DemoResponse(**d) for d in demos]
+        return await self._cached_list(
+            ("horizontal", horizontal),
+            lambda: db_client.get_demos_by_horizontal(horizontal)
+        )
+    
+    async def search_demos(
+        self,
+        q: str,
+        estado: Optional[str] = None,
+        vertical: Optional[str] = None,
+        horizontal: Optional[str] = None,
+        limit: int = 20
+    ) -> DemoSearchResponse:
+        """Pesquisa full-text de demos (resultados em cache por pesquisa)"""
+        async def load():
+            result = await db_client.search_demos(
+                q, estado=estado, vertical=vertical, horizontal=horizontal, limit=limit
+            )
+            return DemoSearchResponse(**result)
+        
+        key = ("search", q.strip().lower(), estado, vertical, horizontal, limit)
+        return await demo_cache.get_or_load(await self._versioned(key), load)
+    
+    async def get_demo_photo(self, photo_hash: str) -> Tuple[bytes, str]:
+        """Obter foto do comercial (conteúdo, content-type)"""
+        return await db_client.get_demo_photo(photo_hash)
     
     async def get_demo(self, demo_id: str) -> DemoResponse:
         """Obter demo por ID"""
-        demo = await db_client.get_demo(demo_id)
-        return DemoResponse(**demo)
+        async def load():
+            demo = await db_client.get_demo(demo_id)
+            return DemoResponse(**demo)
+        
+        return await demo_cache.get_or_load(await self._versioned(("demo", demo_id)), load)
     
     async def create_demo(self, demo: DemoCreate) -> DemoResponse:
         """Criar nova demo"""
         demo_data = demo.model_dump()
-        created = await db_client.create_demo(demo_data)
+        try:
+            created = await db_client.create_demo(demo_data)
+        finally:
+            demo_cache.clear()
         return DemoResponse(**created)
     
     async def update_demo(self, demo_id: str, demo: DemoUpdate) -> DemoResponse:
         """Atualizar demo"""
         update_data = demo.model_dump(exclude_none=True)
-        updated = await db_client.update_demo(demo_id, update_data)
+        try:
+            updated = await db_client.update_demo(demo_id, update_data)
+        finally:
+            demo_cache.clear()
         return DemoResponse(**updated)
     
     async def delete_demo(self, demo_id: str) -> None:
         """Apagar demo"""
-        await db_client.delete_demo(demo_id)
+        try:
+            await db_client.delete_demo(demo_id)
+        finally:
+            demo_cache.clear()
 
 
 # Singleton instance
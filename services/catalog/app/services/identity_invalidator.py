@@ -0,0 +1,54 @@
+"""
+Identity Invalidator
+Avisar o Authentication Service de escritas em admin/cliente
+
+O Authentication guarda a identidade resolvida no login (role e ID) durante
+IDENTITY_CACHE_TTL segundos. Depois de criar, alterar ou apagar admins e
+clientes, o catalog pede-lhe que esqueça as entradas afetadas
+(POST /internal/identity/invalidate) em segundo plano, sem atrasar a
+resposta. Se o pedido falhar, a entrada expira pelo TTL.
+"""
+import asyncio
+from typing import Any, Dict, List, Optional, Set
+import httpx
+from app.core.config import settings
+
+
+class IdentityInvalidator:
+    """Pedidos de invalidação do cache de identidades do Authentication"""
+
+    def __init__(self):
+        self._pending: Set[asyncio.Task] = set()
+        self.sent = 0
+        self.failed = 0
+
+    def notify(self, emails: Optional[List[str]] = None) -> None:
+        """Invalidar os emails indicados (None = todas as identidades)"""
+        task = asyncio.create_task(self._send(emails))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _send(self, emails: Optional[List[str]]) -> None:
+        try:
+            async with httpx.AsyncClient(timeout=5.0) as client:
+                response = await client.post(
+                    f"{settings.AUTHENTICATION_URL}/internal/identity/invalidate",
+                    json={"emails": emails}
+                )
+                response.raise_for_status()
+            self.sent += 1
+        except Exception as e:
+            self.failed += 1
+            print(f"⚠️  Falha ao invalidar identidades no Authentication: {e}")
+
+    async def stop(self) -> None:
+        """Esperar pelos pedidos em curso (chamado no shutdown)"""
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"pending": len(self._pending), "sent": self.sent, "failed": self.failed}
+
+
+# Singleton instance
+identity_invalidator = IdentityInvalidator()
@@ -0,0 +1,194 @@
+"""
+Log Ingestor
+Ingestão de logs em batch (write-behind): os logs são postos numa fila em memória
+e escritos na Database em lotes via POST /db/logs/bulk
+"""
+import asyncio
+import secrets
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from app.core.config import settings
+from app.models.log import LogCreate
+from app.services.database_client import db_client
+
+
+class LogIngestor:
+    """
+    Fila bounded + worker que agrupa logs por tamanho ou por intervalo
+
+    - Flush quando o lote atinge `batch_size` ou passam `flush_interval` segundos
+    - Backpressure quando a fila está cheia: 'block' espera por espaço,
+      'drop' descarta o log (contabilizado em stats)
+    - O id e o timestamp são gerados no momento do evento, por isso o
+      chamador recebe o log_id logo e reenvios do mesmo lote são idempotentes
+    - Um lote que falha é reenviado até `retries` vezes (backoff exponencial);
+      a Database já aceita linhas com FKs desconhecidos, por isso as falhas
+      que restam são transitórias (timeout, 5xx, circuito aberto)
+    """
+
+    def __init__(
+        self,
+        batch_size: int,
+        flush_interval: float,
+        max_queue: int,
+        overflow: str,
+        retries: int = 3,
+        retry_backoff: float = 0.5
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.overflow = overflow
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+        self.enqueued = 0
+        self.dropped = 0
+        self.flushed = 0
+        self.batches = 0
+        self.retried_batches = 0
+        self.failed_batches = 0
+        self.failed_logs = 0
+        self.rejected_logs = 0
+
+    @property
+    def running(self) -> bool:
+        return self._worker is not None and not self._worker.done()
+
+    # ========================================================================
+    # LIFECYCLE
+    # ========================================================================
+
+    async def start(self) -> None:
+        """Criar fila e arrancar worker (chamado no startup)"""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Escrever logs pendentes e parar worker (chamado no shutdown)"""
+        if not self.running:
+            return
+        # Sentinela: o worker faz flush do que tem e termina
+        await self._queue.put(None)
+        await self._worker
+        self._worker = None
+
+    # ========================================================================
+    # INGESTÃO
+    # ========================================================================
+
+    async def submit(self, log: LogCreate) -> str:
+        """
+        Pôr log na fila e devolver o seu id
+
+        Se o worker não estiver a correr, escreve diretamente (sem batch)
+        """
+        item = log.model_dump()
+        item["id"] = secrets.token_hex(16)
+        item["timestamp"] = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+        if not self.running:
+            await db_client.create_logs_bulk([item])
+            return item["id"]
+
+        if self.overflow == "drop":
+            try:
+                self._queue.put_nowait(item)
+            except asyncio.QueueFull:
+                self.dropped += 1
+                return item["id"]
+        else:
+            await self._queue.put(item)
+
+        self.enqueued += 1
+        return item["id"]
+
+    async def _run(self) -> None:
+        """Loop do worker: junta itens até batch_size ou flush_interval"""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            item = await self._queue.get()
+            if item is None:
+                return
+
+            batch = [item]
+            deadline = loop.time() + self.flush_interval
+            stop = False
+
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+
+            await self._flush(batch)
+            if stop:
+                return
+
+    async def _flush(self, batch: List[Dict[str, Any]]) -> None:
+        """
+        Escrever lote na Database (falhas são contabilizadas, não propagadas)
+
+        Reenvios usam os mesmos ids: logs já escritos numa tentativa anterior
+        são ignorados pela Database (INSERT OR IGNORE).
+        """
+        try:
+            for tentativa in range(self.retries + 1):
+                try:
+                    result = await db_client.create_logs_bulk(batch)
+                except Exception as e:
+                    if tentativa == self.retries:
+                        self.failed_batches += 1
+                        self.failed_logs += len(batch)
+                        print(f"⚠️ Falha ao escrever {len(batch)} logs: {e}")
+                        return
+                    self.retried_batches += 1
+                    await asyncio.sleep(self.retry_backoff * (2 ** tentativa))
+                else:
+                    self.flushed += len(batch)
+                    self.rejected_logs += (result or {}).get("rejeitados", 0)
+                    return
+        finally:
+            self.batches += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Estatísticas da ingestão"""
+        return {
+            "running": self.running,
+            "queue_size": self._queue.qsize() if self._queue else 0,
+            "max_queue": self.max_queue,
+            "batch_size": self.batch_size,
+            "flush_interval": self.flush_interval,
+            "overflow": self.overflow,
+            "enqueued": self.enqueued,
+            "dropped": self.dropped,
+            "flushed": self.flushed,
+            "batches": self.batches,
+            "retried_batches": self.retried_batches,
+            "failed_batches": self.failed_batches,
+            "failed_logs": self.failed_logs,
+            "rejected_logs": self.rejected_logs
+        }
+
+
+# Singleton instance
+log_ingestor = LogIngestor(
+    batch_size=settings.LOG_BATCH_SIZE,
+    flush_interval=settings.LOG_FLUSH_INTERVAL,
+    max_queue=settings.LOG_QUEUE_MAXSIZE,
+    overflow=settings.LOG_QUEUE_OVERFLOW,
+    retries=settings.LOG_FLUSH_RETRIES,
+    retry_backoff=settings.LOG_FLUSH_RETRY_BACKOFF
+)
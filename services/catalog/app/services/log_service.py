@@ -2,9 +2,12 @@
 Log Service
 Lógica de negócio para Logs
 """
-from typing import List, Dict, Any
+import httpx
+from typing import List, Dict, Any, Optional
 from app.models.log import LogCreate, LogResponse, LogFilter
+from app.models.page import Page
 from app.services.database_client import db_client
+from app.services.log_ingestor import log_ingestor
 
 
 class LogService:
@@ -15,6 +18,11 @@ class LogService:
         logs = await db_client.get_all_logs(limit=limit)
         return [LogResponse(**l) for l in logs]
     
+    async def get_logs_page(self, cursor: Optional[str] = None, limit: int = 50) -> Page[LogResponse]:
+        """Obter página de logs, mais recentes primeiro (cursor opaco)"""
+        page = await db_client.get_logs_page(cursor=cursor, limit=limit)
+        return Page[LogResponse](**page)
+    
     async def get_logs_by_cliente(
         self, 
         cliente_id: str, 
@@ -33,17 +41,54 @@ class LogService:
         logs = await db_client.get_logs_by_demo(demo_id, limit=limit)
         return [LogResponse(**l) for l in logs]
     
+    async def export_logs(
+        self,
+        formato: str = "ndjson",
+        desde: Optional[str] = None,
+        ate: Optional[str] = None,
+        tipo: Optional[str] = None
+    ) -> httpx.Response:
+        """Abrir export em streaming da Database (resposta por fechar)"""
+        params = {"formato": formato}
+        if desde:
+            params["desde"] = desde
+        if ate:
+            params["ate"] = ate
+        if tipo:
+            params["tipo"] = tipo
+        return await db_client.export_logs(params)
+    
     async def create_log(self, log: LogCreate) -> LogResponse:
         """Criar novo log"""
         log_data = log.model_dump()
         created = await db_client.create_log(log_data)
         return LogResponse(**created)
     
+    async def enqueue_log(self, log: LogCreate) -> str:
+        """Registar log via ingestão em batch; devolve o id do log"""
+        return await log_ingestor.submit(log)
+    
     async def get_log_stats(self) -> List[Dict[str, Any]]:
         """Obter estatísticas de logs"""
         stats = await db_client.get_log_stats()
         return stats
 
+    
+    async def get_logs_overview_aggregate(self) -> Dict[str, Any]:
+        """Totais de logs por janela temporal (agregado na Database)"""
+        return await db_client.get_logs_overview_aggregate()
+    
+    async def get_top_clients_aggregate(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Clientes com mais eventos (agregado na Database)"""
+        return await db_client.get_top_clients_aggregate(limit=limit)
+    
+    async def get_top_demos_aggregate(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Demos mais abertas (agregado na Database)"""
+        return await db_client.get_top_demos_aggregate(limit=limit)
+    
+    async def get_demos_per_client_aggregate(self) -> List[Dict[str, Any]]:
+        """Aberturas por cliente e demo (agregado na Database)"""
+        return await db_client.get_demos_per_client_aggregate()
 
 # Singleton instance
 log_service = LogService()
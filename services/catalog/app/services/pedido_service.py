@@ -1,4 +1,4 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from app.models.pedido import (
     PedidoCreate, 
     PedidoUpdate, 
@@ -7,6 +7,7 @@ from app.models.pedido import (
     PedidoReject,
     PedidoResponseCliente
 )
+from app.models.page import Page
 from app.services.database_client import db_client
 
 
@@ -18,6 +19,11 @@ class PedidoService:
         pedidos = await db_client.get_all_pedidos()
         return [PedidoResponseCliente(**p) for p in pedidos]
     
+    async def get_pedidos_page(self, cursor: Optional[str] = None, limit: int = 50) -> Page[PedidoResponseCliente]:
+        """Obter página de pedidos, mais recentes primeiro (cursor opaco)"""
+        page = await db_client.get_pedidos_page(cursor=cursor, limit=limit)
+        return Page[PedidoResponseCliente](**page)
+    
     async def get_pending_pedidos(self) -> List[PedidoResponseCliente]:
         """Obter pedidos pendentes"""
         pedidos = await db_client.get_pending_pedidos()
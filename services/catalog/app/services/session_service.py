@@ -0,0 +1,181 @@
+"""
+Session Service
+Lógica de negócio para sessões de utilização de demos
+
+Os heartbeats não vão um a um para a Database: ficam num set em memória
+(deduplicados por sessão) e são escritos em batch a cada
+SESSION_HEARTBEAT_FLUSH_INTERVAL segundos. O mesmo worker fecha
+periodicamente as sessões sem heartbeat há mais de SESSION_TIMEOUT.
+
+A abertura de uma demo não espera pela escrita da sessão
+(start_session_nowait): o session_id é gerado logo e a sessão é criada em
+background; uma falha fica registada mas não impede a abertura.
+"""
+import asyncio
+import secrets
+from typing import Any, Dict, Optional, Set
+from app.core.config import settings
+from app.models.session import SessionStart, SessionEnd, SessionResponse
+from app.services.database_client import db_client
+
+
+class SessionService:
+    """Service para gestão de sessões de demos"""
+    
+    def __init__(self):
+        self._pending: Set[str] = set()
+        self._worker: Optional[asyncio.Task] = None
+        # session_id → criação em background ainda por terminar
+        self._starting: Dict[str, asyncio.Task] = {}
+        
+        self.sessions_started = 0
+        self.failed_starts = 0
+        self.heartbeats_received = 0
+        self.heartbeats_flushed = 0
+        self.flushes = 0
+        self.failed_flushes = 0
+        self.expired = 0
+    
+    @property
+    def running(self) -> bool:
+        return self._worker is not None and not self._worker.done()
+    
+    # ========================================================================
+    # LIFECYCLE
+    # ========================================================================
+    
+    async def start(self) -> None:
+        """Arrancar worker de heartbeats/expiração (chamado no startup)"""
+        if not self.running:
+            self._worker = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        """Parar worker e escrever heartbeats pendentes (chamado no shutdown)"""
+        if self.running:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        if self._starting:
+            await asyncio.gather(*self._starting.values())
+        await self._flush_heartbeats()
+    
+    # ========================================================================
+    # SESSÕES
+    # ========================================================================
+    
+    async def get_session(self, session_id: str) -> SessionResponse:
+        """Obter sessão por session_id"""
+        session = await db_client.get_session(session_id)
+        return SessionResponse(**session)
+    
+    async def start_session(self, session: SessionStart) -> SessionResponse:
+        """Iniciar sessão (idempotente em session_id)"""
+        data = session.model_dump()
+        data["session_id"] = session.session_id or secrets.token_hex(16)
+        created = await db_client.start_session(data)
+        return SessionResponse(**created)
+    
+    def start_session_nowait(self, session: SessionStart) -> str:
+        """
+        Iniciar sessão em background (write-behind) e devolver o session_id
+        
+        Uma falha (ex: cliente_id de um admin, que não existe em cliente) é
+        contabilizada e registada, sem afetar quem abriu a demo.
+        """
+        session_id = session.session_id or secrets.token_hex(16)
+        data = {**session.model_dump(), "session_id": session_id}
+        task = asyncio.create_task(self._start_in_background(data))
+        self._starting[session_id] = task
+        
+        def _done(t: asyncio.Task) -> None:
+            if self._starting.get(session_id) is t:
+                del self._starting[session_id]
+        
+        task.add_done_callback(_done)
+        return session_id
+    
+    async def _start_in_background(self, data: Dict[str, Any]) -> None:
+        try:
+            await db_client.start_session(data)
+            self.sessions_started += 1
+        except Exception as e:
+            self.failed_starts += 1
+            print(f"⚠️ Falha ao iniciar sessão {data['session_id']}: {e}")
+    
+    async def heartbeat(self, session_id: str) -> None:
+        """Registar heartbeat (escrito em batch pelo worker)"""
+        self.heartbeats_received += 1
+        self._pending.add(session_id)
+        if not self.running:
+            await self._flush_heartbeats()
+    
+    async def end_session(self, session_id: str, session: Optional[SessionEnd] = None) -> SessionResponse:
+        """Terminar sessão (idempotente: repetir não altera a duração)"""
+        self._pending.discard(session_id)
+        # Sessão aberta há instantes: esperar que a criação chegue à Database
+        starting = self._starting.get(session_id)
+        if starting is not None:
+            await asyncio.shield(starting)
+        data = (session or SessionEnd()).model_dump()
+        ended = await db_client.end_session(session_id, data)
+        return SessionResponse(**ended)
+    
+    # ========================================================================
+    # WORKER
+    # ========================================================================
+    
+    async def _run(self) -> None:
+        """Flush de heartbeats e expiração periódica de sessões"""
+        loop = asyncio.get_running_loop()
+        proxima_expiracao = loop.time() + settings.SESSION_EXPIRE_INTERVAL
+        
+        while True:
+            await asyncio.sleep(settings.SESSION_HEARTBEAT_FLUSH_INTERVAL)
+            await self._flush_heartbeats()
+            
+            if loop.time() >= proxima_expiracao:
+                proxima_expiracao = loop.time() + settings.SESSION_EXPIRE_INTERVAL
+                try:
+                    result = await db_client.expire_sessions(settings.SESSION_TIMEOUT)
+                    self.expired += result.get("atualizadas", 0)
+                except Exception as e:
+                    print(f"⚠️ Falha ao expirar sessões: {e}")
+    
+    async def _flush_heartbeats(self) -> None:
+        """Enviar heartbeats pendentes num único pedido"""
+        if not self._pending:
+            return
+        
+        session_ids, self._pending = list(self._pending), set()
+        try:
+            await db_client.heartbeat_sessions(session_ids)
+            self.heartbeats_flushed += len(session_ids)
+        except Exception as e:
+            self.failed_flushes += 1
+            # Voltam para o próximo flush (heartbeats são idempotentes)
+            self._pending.update(session_ids)
+            print(f"⚠️ Falha ao escrever {len(session_ids)} heartbeats: {e}")
+        finally:
+            self.flushes += 1
+    
+    def stats(self) -> Dict[str, Any]:
+        """Estatísticas de heartbeats e expiração"""
+        return {
+            "running": self.running,
+            "pending_starts": len(self._starting),
+            "sessions_started": self.sessions_started,
+            "failed_starts": self.failed_starts,
+            "pending_heartbeats": len(self._pending),
+            "heartbeats_received": self.heartbeats_received,
+            "heartbeats_flushed": self.heartbeats_flushed,
+            "flushes": self.flushes,
+            "failed_flushes": self.failed_flushes,
+            "expired_sessions": self.expired
+        }
+
+
+# Singleton instance
+session_service = SessionService()
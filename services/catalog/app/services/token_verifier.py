@@ -0,0 +1,186 @@
+"""
+Token Verifier
+Verificação local dos JWT emitidos pelo Authentication Service
+
+Em vez de um pedido HTTP ao Authentication por cada validação:
+- A assinatura é verificada em processo com a chave partilhada
+  (SECRET_KEY / ALGORITHM, iguais nos dois serviços)
+- Tokens já verificados ficam num cache LRU (chave = sha256 do token) até ao
+  respetivo exp; um hit custa um lookup em memória
+- Os tokens revogados (logout) chegam por polling incremental de
+  GET /api/auth/revocations a cada AUTH_REVOCATION_POLL_INTERVAL segundos;
+  um logout feito através deste catalog é aplicado de imediato
+"""
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+import httpx
+import jwt
+from fastapi import HTTPException, status
+from app.core.config import settings
+
+
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=detail)
+
+
+class TokenVerifier:
+    """Verificação de JWT com cache de tokens válidos e lista de revogados"""
+
+    def __init__(self):
+        self.max_entries = settings.AUTH_TOKEN_CACHE_MAX_ENTRIES
+        # sha256(token) → (exp, claims)
+        self._cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        # jti → exp
+        self._revoked: Dict[str, float] = {}
+        self._epoch: Optional[str] = None
+        self._version = 0
+        self._worker: Optional[asyncio.Task] = None
+        self._client: Optional[httpx.AsyncClient] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.rejected = 0
+        self.revoked_rejections = 0
+        self.polls = 0
+        self.poll_failures = 0
+
+    @property
+    def running(self) -> bool:
+        return self._worker is not None and not self._worker.done()
+
+    # ========================================================================
+    # LIFECYCLE
+    # ========================================================================
+
+    async def start(self) -> None:
+        """Arrancar polling das revogações (chamado no startup)"""
+        if self.running or settings.AUTH_REVOCATION_POLL_INTERVAL <= 0:
+            return
+        self._client = httpx.AsyncClient(
+            base_url=settings.AUTHENTICATION_URL,
+            timeout=httpx.Timeout(5.0)
+        )
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Parar polling (chamado no shutdown)"""
+        if self.running:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    # ========================================================================
+    # VERIFICAÇÃO
+    # ========================================================================
+
+    def verify(self, token: str) -> Dict[str, Any]:
+        """
+        Claims do token se for válido, não expirado e não revogado
+        Caso contrário HTTPException 401 (mesmas mensagens do Authentication)
+        """
+        key = hashlib.sha256(token.encode()).hexdigest()
+        entry = self._cache.get(key)
+
+        if entry is not None:
+            exp, claims = entry
+            if exp <= time.time():
+                del self._cache[key]
+                self.rejected += 1
+                raise _unauthorized("Token expirado")
+            self._cache.move_to_end(key)
+            self.hits += 1
+        else:
+            self.misses += 1
+            try:
+                claims = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+            except jwt.ExpiredSignatureError:
+                self.rejected += 1
+                raise _unauthorized("Token expirado")
+            except jwt.InvalidTokenError:
+                self.rejected += 1
+                raise _unauthorized("Token inválido")
+            self._store(key, claims)
+
+        if claims.get("jti") in self._revoked:
+            self.revoked_rejections += 1
+            raise _unauthorized("Token revogado")
+        return claims
+
+    def _store(self, key: str, claims: Dict[str, Any]) -> None:
+        # Sem exp o token não tem limite natural: não fica em cache
+        if self.max_entries <= 0 or "exp" not in claims:
+            return
+        self._cache[key] = (float(claims["exp"]), claims)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    # ========================================================================
+    # REVOGAÇÕES
+    # ========================================================================
+
+    def revoke(self, jti: str, exp: float) -> None:
+        """Marcar jti como revogado até exp"""
+        self._revoked[jti] = float(exp)
+
+    def _prune_revoked(self) -> None:
+        agora = time.time()
+        for jti in [j for j, exp in self._revoked.items() if exp <= agora]:
+            del self._revoked[jti]
+
+    async def refresh_revocations(self) -> None:
+        """Pedir ao Authentication as revogações desde a última versão vista"""
+        response = await self._client.get(
+            "/api/auth/revocations",
+            params={"since": self._version, "epoch": self._epoch or ""}
+        )
+        response.raise_for_status()
+        data = response.json()
+
+        # Authentication reiniciado: a resposta traz a lista completa, mas os
+        # revogados locais (logouts feitos aqui) mantêm-se até ao exp
+        self._epoch = data["epoch"]
+        self._version = data["version"]
+        for entry in data["revoked"]:
+            self.revoke(entry["jti"], entry["exp"])
+        self._prune_revoked()
+        self.polls += 1
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh_revocations()
+            except Exception as e:
+                self.poll_failures += 1
+                print(f"⚠️ Falha ao obter tokens revogados: {e}")
+            await asyncio.sleep(settings.AUTH_REVOCATION_POLL_INTERVAL)
+
+    def stats(self) -> Dict[str, Any]:
+        """Contadores para /internal/stats"""
+        lookups = self.hits + self.misses
+        return {
+            "cached_tokens": len(self._cache),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0,
+            "rejected": self.rejected,
+            "revoked_rejections": self.revoked_rejections,
+            "revoked_tokens": len(self._revoked),
+            "revocations_version": self._version,
+            "polls": self.polls,
+            "poll_failures": self.poll_failures
+        }
+
+
+# Singleton instance
+token_verifier = TokenVerifier()
@@ -0,0 +1,195 @@
+"""
+Benchmark - Serialização JSON e compressão das respostas
+
+Compara, para os payloads de /api/demos/all, /api/logs/all e
+/metrics/overview:
+- CPU de render do body: JSONResponse (json da stdlib) vs ORJSONResponse
+- bytes na rede: sem compressão vs GZip em vários níveis (e Brotli, se o
+  módulo brotli estiver instalado)
+
+Por omissão usa payloads sintéticos com a forma das respostas reais; com
+--catalog-url os payloads são pedidos ao Catalog em execução.
+
+Uso (a partir de services/catalog):
+    python -m benchmarks.bench_serialization
+    python -m benchmarks.bench_serialization --demos 200 --logs 5000 --repeat 50
+    python -m benchmarks.bench_serialization --catalog-url http://localhost:8000
+"""
+import argparse
+import gzip
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+GZIP_LEVELS = (1, 5, 9)
+TIPOS_LOG = ("login", "logout", "demo_aberta", "demo_fechada", "acesso_concedido", "erro")
+VERTICAIS = ("Retalho", "Saúde", "Banca", "Indústria", "Energia")
+HORIZONTAIS = ("Analytics", "IA", "Cloud", "Segurança")
+
+
+# ============================================================================
+# PAYLOADS
+# ============================================================================
+
+def gerar_demos(n: int) -> List[Dict[str, Any]]:
+    """Demos com a forma de DemoResponse"""
+    rnd = random.Random(1)
+    return [
+        {
+            "id": f"demo{i:05d}",
+            "nome": f"Demo {i} - {rnd.choice(VERTICAIS)}",
+            "descricao": "Demonstração de uma solução de " + " ".join(
+                rnd.choice(HORIZONTAIS).lower() for _ in range(12)
+            ),
+            "url": f"https://demos.example.com/{i}",
+            "vertical": rnd.choice(VERTICAIS),
+            "horizontal": rnd.choice(HORIZONTAIS),
+            "keywords": ",".join(rnd.sample(HORIZONTAIS, 2)),
+            "codigo_projeto": f"P{i:05d}",
+            "comercial_nome": f"Comercial {i % 20}",
+            "comercial_contacto": f"comercial{i % 20}@example.com",
+            "comercial_foto_url": f"/api/demos/fotos/{i:064x}",
+            "estado": rnd.choice(("ativa", "ativa", "inativa", "manutenção")),
+            "criado_por": "admin001",
+            "criado_em": "2025-01-01 10:00:00",
+            "atualizado_em": "2025-02-01 10:00:00"
+        }
+        for i in range(n)
+    ]
+
+
+def gerar_logs(n: int, n_clientes: int = 200, n_demos: int = 50) -> List[Dict[str, Any]]:
+    """Logs com a forma de LogResponse"""
+    rnd = random.Random(2)
+    inicio = datetime(2025, 1, 1)
+    return [
+        {
+            "id": f"{rnd.getrandbits(128):032x}",
+            "tipo": rnd.choice(TIPOS_LOG),
+            "mensagem": f"Evento {i} registado pelo frontend",
+            "cliente_id": f"cliente{rnd.randrange(n_clientes):05d}",
+            "demo_id": f"demo{rnd.randrange(n_demos):05d}",
+            "timestamp": (inicio + timedelta(seconds=37 * i)).isoformat(sep=" ")
+        }
+        for i in range(n)
+    ]
+
+
+def gerar_overview(demos: List[Dict[str, Any]], logs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Overview com a forma de /metrics/overview (agregados das etapas)"""
+    por_cliente: Dict[str, int] = {}
+    por_demo: Dict[str, int] = {}
+    for log in logs:
+        por_cliente[log["cliente_id"]] = por_cliente.get(log["cliente_id"], 0) + 1
+        por_demo[log["demo_id"]] = por_demo.get(log["demo_id"], 0) + 1
+    top = lambda contagens: [
+        {"id": k, "total": v}
+        for k, v in sorted(contagens.items(), key=lambda kv: -kv[1])[:10]
+    ]
+    return {
+        "clients": {"total": len(por_cliente), "top": top(por_cliente)},
+        "demos": {
+            "total": len(demos),
+            "por_estado": {e: sum(d["estado"] == e for d in demos) for e in ("ativa", "inativa", "manutenção")},
+            "top": top(por_demo)
+        },
+        "logs": {"total": len(logs), "por_tipo": {t: sum(l["tipo"] == t for l in logs) for t in TIPOS_LOG}},
+        "demos_per_client": [
+            {"cliente_id": k, "demos": v % 7 + 1} for k, v in por_cliente.items()
+        ],
+        "timings_ms": {"clients": 12.5, "demos": 9.1, "logs": 30.2, "total": 31.0}
+    }
+
+
+def carregar_payloads(args) -> Dict[str, Any]:
+    """Payloads sintéticos ou pedidos ao Catalog (--catalog-url)"""
+    if args.catalog_url:
+        import httpx
+
+        base = args.catalog_url.rstrip("/")
+        with httpx.Client(timeout=30.0) as client:
+            get = lambda path: client.get(f"{base}{path}").raise_for_status().json()
+            return {
+                "/api/demos/all": get("/api/demos/all"),
+                "/api/logs/all": get(f"/api/logs/all?limit={args.logs}"),
+                "/metrics/overview": get("/api/metrics/overview")
+            }
+
+    demos = gerar_demos(args.demos)
+    logs = gerar_logs(args.logs)
+    return {
+        "/api/demos/all": demos,
+        "/api/logs/all": logs,
+        "/metrics/overview": gerar_overview(demos, logs)
+    }
+
+
+# ============================================================================
+# MEDIÇÕES
+# ============================================================================
+
+def medir_render(response_class, payload: Any, repeat: int) -> float:
+    """ms por render do body (o que a rota faz depois de obter os dados)"""
+    inicio = time.perf_counter()
+    for _ in range(repeat):
+        response_class(payload)
+    return (time.perf_counter() - inicio) / repeat * 1000
+
+
+def compressores() -> List[tuple]:
+    """(nome, função) de cada codificação a comparar"""
+    lista: List[tuple] = [("raw", lambda body: body)]
+    for nivel in GZIP_LEVELS:
+        lista.append((f"gzip-{nivel}", lambda body, n=nivel: gzip.compress(body, compresslevel=n)))
+    if brotli is not None:
+        lista.append(("br-4", lambda body: brotli.compress(body, quality=4)))
+    return lista
+
+
+def medir_compressao(func: Callable[[bytes], bytes], body: bytes, repeat: int):
+    """(bytes comprimidos, ms por compressão)"""
+    inicio = time.perf_counter()
+    for _ in range(repeat):
+        comprimido = func(body)
+    return len(comprimido), (time.perf_counter() - inicio) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--demos", type=int, default=100)
+    parser.add_argument("--logs", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--catalog-url", default=None)
+    args = parser.parse_args()
+
+    payloads = carregar_payloads(args)
+
+    print("Render do body")
+    print(f"{'endpoint':<18} | {'json ms':>8} | {'orjson ms':>9} | {'speedup':>7}")
+    print("-" * 52)
+    for endpoint, payload in payloads.items():
+        stdlib_ms = medir_render(JSONResponse, payload, args.repeat)
+        orjson_ms = medir_render(ORJSONResponse, payload, args.repeat)
+        print(f"{endpoint:<18} | {stdlib_ms:>8.3f} | {orjson_ms:>9.3f} | {stdlib_ms / orjson_ms:>6.1f}x")
+
+    print()
+    print("Bytes na rede")
+    print(f"{'endpoint':<18} | {'codificação':<11} | {'bytes':>9} | {'rácio':>6} | {'ms':>7}")
+    print("-" * 64)
+    for endpoint, payload in payloads.items():
+        body = ORJSONResponse(payload).body
+        for nome, func in compressores():
+            tamanho, ms = medir_compressao(func, body, args.repeat)
+            print(f"{endpoint:<18} | {nome:<11} | {tamanho:>9} | {tamanho / len(body):>6.2f} | {ms:>7.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Testes do DatabaseClient (app/services/database_client.py)
+
+A Database é simulada com httpx.MockTransport: cada pedido segue o passo
+seguinte do guião (status + body, ou erro de transporte).
+
+Uso (a partir de services/catalog):
+    python -m pytest tests
+"""
+import asyncio
+
+import httpx
+import pytest
+
+from app.services.database_client import DatabaseClient, DatabaseServiceError
+from ecatalog_shared.resilience import IDEMPOTENCY_HEADER, CircuitBreaker
+
+
+class FakeDatabase:
+    """Handler do MockTransport: regista os pedidos e segue o guião"""
+
+    def __init__(self, *passos, latencia: float = 0):
+        self.passos = list(passos)
+        self.latencia = latencia
+        self.pedidos = []
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        indice = len(self.pedidos)
+        self.pedidos.append(request)
+        await asyncio.sleep(self.latencia)
+        passo = self.passos[min(indice, len(self.passos) - 1)]
+        if isinstance(passo, Exception):
+            raise passo
+        status, body = passo
+        return httpx.Response(status, json=body)
+
+
+def criar_client(database: FakeDatabase, failure_threshold: int = 5) -> DatabaseClient:
+    client = DatabaseClient()
+    client._client = httpx.AsyncClient(
+        base_url="http://database", transport=httpx.MockTransport(database)
+    )
+    policy = client.policy
+    policy.backoff_base = policy.backoff_max = 0.001
+    policy.breaker = CircuitBreaker("database", failure_threshold, reset_timeout=60)
+    return client
+
+
+def test_erro_do_upstream_mantem_status_e_detail():
+    """Um 4xx da Database chega ao caller como DatabaseServiceError, sem retries"""
+    database = FakeDatabase((404, {"detail": "Demo não encontrada"}))
+    client = criar_client(database)
+
+    with pytest.raises(DatabaseServiceError) as erro:
+        asyncio.run(client.get_demo("demo999"))
+
+    assert erro.value.status_code == 404
+    assert erro.value.detail == "Demo não encontrada"
+    assert len(database.pedidos) == 1
+
+
+def test_query_invalida_devolve_400():
+    database = FakeDatabase((400, {"detail": "Apenas SELECT"}))
+    client = criar_client(database)
+
+    with pytest.raises(DatabaseServiceError) as erro:
+        asyncio.run(client.run_sql("DELETE FROM demo"))
+
+    assert erro.value.status_code == 400
+    assert database.pedidos[0].url.params["sql"] == "DELETE FROM demo"
+
+
+def test_get_repete_apos_503():
+    database = FakeDatabase((503, {"detail": "ocupada"}), (200, [{"id": "demo001"}]))
+    client = criar_client(database)
+
+    assert asyncio.run(client.get_all_demos()) == [{"id": "demo001"}]
+    assert len(database.pedidos) == 2
+
+
+def test_escrita_repetida_leva_a_mesma_idempotency_key():
+    database = FakeDatabase(httpx.ConnectError("conexão recusada"), (201, {"id": "demo001"}))
+    client = criar_client(database)
+
+    assert asyncio.run(client.create_demo({"nome": "Demo"})) == {"id": "demo001"}
+
+    chaves = [pedido.headers.get(IDEMPOTENCY_HEADER) for pedido in database.pedidos]
+    assert len(chaves) == 2
+    assert chaves[0] and chaves[0] == chaves[1]
+
+
+def test_circuito_aberto_recusa_sem_contactar_a_database():
+    database = FakeDatabase(httpx.ConnectError("conexão recusada"))
+    client = criar_client(database, failure_threshold=2)
+
+    with pytest.raises(Exception, match="conexão recusada"):
+        asyncio.run(client.get_all_demos())
+    assert client.policy.breaker.state == CircuitBreaker.OPEN
+    pedidos = len(database.pedidos)
+
+    with pytest.raises(Exception, match="circuito aberto"):
+        asyncio.run(client.get_all_demos())
+    assert len(database.pedidos) == pedidos
+
+
+def test_gets_identicos_partilham_um_pedido():
+    """Single-flight: um só pedido à Database, um objeto próprio por caller"""
+    database = FakeDatabase((200, [{"id": "demo001"}]), latencia=0.02)
+    client = criar_client(database)
+
+    async def cenario():
+        return await asyncio.gather(*(client.get_all_demos() for _ in range(3)))
+
+    resultados = asyncio.run(cenario())
+
+    assert len(database.pedidos) == 1
+    assert resultados[0] == resultados[1] == resultados[2]
+    assert resultados[0] is not resultados[1]
+    assert client.coalescing_stats()["coalesced_gets"] == 2
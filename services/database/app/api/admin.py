@@ -2,10 +2,11 @@
 Tabela: admin (id, nome, email, contacto)
 Autenticação via Microsoft OAuth apenas
 """
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, status, Query
 from typing import List, Optional
 from pydantic import BaseModel, EmailStr
 from app.db.connection import DatabaseConnection as db
+from app.db.pagination import Page, fetch_page, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 
 router = APIRouter()
@@ -50,6 +51,19 @@ def get_all_admins():
     return admins
 
 
+@router.get("/page", response_model=Page[AdminResponse])
+def get_admins_page(
+    cursor: Optional[str] = None,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+):
+    """Listar administradores paginados por (nome, id)"""
+    return fetch_page(
+        "SELECT id, nome, email, contacto FROM admin",
+        keys=("nome", "id"), fields=("nome", "id"),
+        cursor=cursor, limit=limit
+    )
+
+
 @router.get("/{admin_id}", response_model=AdminResponse)
 def get_admin(admin_id: str):
     """Obter admin específico por ID"""
@@ -1,7 +1,8 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, status, Query
 from typing import List, Optional
 from pydantic import BaseModel, EmailStr
 from app.db.connection import DatabaseConnection as db
+from app.db.pagination import Page, fetch_page, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 
 router = APIRouter()
@@ -44,6 +45,19 @@ def get_all_clientes():
     return db.execute_query(query)
 
 
+@router.get("/page", response_model=Page[ClienteResponse])
+def get_clientes_page(
+    cursor: Optional[str] = None,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+):
+    """Listar clientes paginados por (nome, id)"""
+    return fetch_page(
+        "SELECT id, nome, email, data_expiracao, criado_por, data_registo FROM cliente",
+        keys=("nome", "id"), fields=("nome", "id"),
+        cursor=cursor, limit=limit
+    )
+
+
 @router.get("/active", response_model=List[ClienteResponse])
 def get_active_clientes():
     """Listar clientes ativos (não expirados)"""
@@ -1,7 +1,9 @@
-from fastapi import APIRouter, HTTPException, status
-from typing import List, Optional, Literal
+from fastapi import APIRouter, HTTPException, Response, status, Query
+from typing import Dict, List, Optional, Literal
 from pydantic import BaseModel, field_validator
 from app.db.connection import DatabaseConnection as db
+from app.db.pagination import Page, fetch_page, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.db.photos import delete_unused_photo, get_photo, prepare_photo, save_photo
 import re
 
 
@@ -22,7 +24,7 @@ class DemoBase(BaseModel):
     codigo_projeto: Optional[str] = None
     comercial_nome: Optional[str] = None
     comercial_contacto: Optional[str] = None  
-    comercial_foto_url: Optional[str] = None  # Pode ser Base64
+    comercial_foto_url: Optional[str] = None  # URL; Base64 é guardado em demo_foto
 
 
 class DemoCreate(DemoBase):
@@ -80,38 +82,188 @@ class DemoResponse(DemoBase):
     atualizado_em: str
 
 
+class DemoSearchResult(DemoResponse):
+    score: float  # bm25 (menor = mais relevante)
+
+
+class DemoSearchResponse(BaseModel):
+    query: str
+    total: int
+    results: List[DemoSearchResult]
+    facets: Dict[str, Dict[str, int]]
+
+
 # ============================================================================
 # ENDPOINTS
 # ============================================================================
 
+# Projeção das listas: fotos Base64 antigas (ainda inline) não são enviadas;
+# as novas já estão em demo_foto e a coluna só tem o URL
+DEMO_LIST_SELECT = """
+    SELECT id, estado, url, nome, descricao, vertical, horizontal, keywords,
+           codigo_projeto, comercial_nome, comercial_contacto,
+           CASE WHEN comercial_foto_url LIKE 'data:%' THEN NULL
+                ELSE comercial_foto_url END as comercial_foto_url,
+           criado_por, criado_em, atualizado_em
+    FROM demo
+"""
+
+
 @router.get("/all", response_model=List[DemoResponse])
 def get_all_demos():
     """Listar todas as demos"""
-    query = "SELECT * FROM demo ORDER BY nome ASC"
+    query = f"{DEMO_LIST_SELECT} ORDER BY nome ASC"
     return db.execute_query(query)
 
 
+@router.get("/page", response_model=Page[DemoResponse])
+def get_demos_page(
+    cursor: Optional[str] = None,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+):
+    """Listar demos paginadas por (nome, id)"""
+    return fetch_page(
+        DEMO_LIST_SELECT,
+        keys=("nome", "id"), fields=("nome", "id"),
+        cursor=cursor, limit=limit
+    )
+
+
 @router.get("/active", response_model=List[DemoResponse])
 def get_active_demos():
     """Listar demos ativas"""
-    query = "SELECT * FROM demo WHERE estado = 'ativa' ORDER BY nome"
+    query = f"{DEMO_LIST_SELECT} WHERE estado = 'ativa' ORDER BY nome"
     return db.execute_query(query)
 
 
 @router.get("/by-vertical/{vertical}", response_model=List[DemoResponse])
 def get_demos_by_vertical(vertical: str):
     """Listar demos por vertical"""
-    query = "SELECT * FROM demo WHERE vertical = ? ORDER BY nome"
+    query = f"{DEMO_LIST_SELECT} WHERE vertical = ? ORDER BY nome"
     return db.execute_query(query, (vertical,))
 
 
 @router.get("/by-horizontal/{horizontal}", response_model=List[DemoResponse])
 def get_demos_by_horizontal(horizontal: str):
     """Listar demos por horizontal"""
-    query = "SELECT * FROM demo WHERE horizontal = ? ORDER BY nome"
+    query = f"{DEMO_LIST_SELECT} WHERE horizontal = ? ORDER BY nome"
     return db.execute_query(query, (horizontal,))
 
 
+# Pesquisa full-text (tabela demo_fts, ver schema.sql). Registada antes de
+# /{demo_id} para "search" não ser tratado como id.
+# Pesos bm25 por coluna de demo_fts (nome, descricao, keywords, vertical,
+# horizontal): o nome pesa mais que as keywords e a descrição
+SEARCH_WEIGHTS = (10.0, 2.0, 5.0, 3.0, 3.0)
+SEARCH_MAX_TERMS = 10
+FACETS = ("vertical", "horizontal", "estado")
+
+
+def build_match_query(q: str) -> str:
+    """
+    Texto do utilizador → query FTS5 segura
+    Cada palavra vira um prefixo entre aspas ("invent"*), todas obrigatórias
+    """
+    terms = re.findall(r"\w+", q.lower())[:SEARCH_MAX_TERMS]
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+@router.get("/search", response_model=DemoSearchResponse)
+def search_demos(
+    q: str = Query(..., min_length=1, max_length=200),
+    estado: Optional[str] = None,
+    vertical: Optional[str] = None,
+    horizontal: Optional[str] = None,
+    limit: int = Query(default=20, ge=1, le=100)
+):
+    """
+    Pesquisa full-text em nome, descrição, keywords, vertical e horizontal
+
+    - Correspondência por prefixo em todas as palavras ("inv stock")
+    - Resultados ordenados por relevância (bm25)
+    - facets: contagens por vertical/horizontal/estado entre os resultados,
+      cada uma calculada com os restantes filtros aplicados
+    """
+    match = build_match_query(q)
+    if not match:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Pesquisa inválida: sem termos"
+        )
+
+    weights = ", ".join(str(w) for w in SEARCH_WEIGHTS)
+    matches = db.execute_query(
+        f"""
+        SELECT d.id, bm25(demo_fts, {weights}) as score,
+               d.vertical, d.horizontal, d.estado
+        FROM demo_fts f
+        JOIN demo d ON d.rowid = f.rowid
+        WHERE demo_fts MATCH ?
+        ORDER BY score
+        """,
+        (match,)
+    )
+
+    filters = {"vertical": vertical, "horizontal": horizontal, "estado": estado}
+
+    def passes(row, ignore: Optional[str] = None) -> bool:
+        return all(
+            value is None or row[field] == value
+            for field, value in filters.items() if field != ignore
+        )
+
+    facets: Dict[str, Dict[str, int]] = {}
+    for field in FACETS:
+        counts: Dict[str, int] = {}
+        for row in matches:
+            if passes(row, ignore=field) and row[field] is not None:
+                counts[row[field]] = counts.get(row[field], 0) + 1
+        facets[field] = dict(sorted(counts.items(), key=lambda kv: (-kv[1], kv[0])))
+
+    selected = [row for row in matches if passes(row)]
+    top = selected[:limit]
+
+    results = []
+    if top:
+        placeholders = ", ".join("?" for _ in top)
+        rows = db.execute_query(
+            f"{DEMO_LIST_SELECT} WHERE id IN ({placeholders})",
+            tuple(row["id"] for row in top)
+        )
+        by_id = {row["id"]: row for row in rows}
+        results = [
+            {**by_id[row["id"]], "score": row["score"]}
+            for row in top if row["id"] in by_id
+        ]
+
+    return {"query": q, "total": len(selected), "results": results, "facets": facets}
+
+
+@router.get("/fotos/{photo_hash}")
+def get_demo_photo(photo_hash: str):
+    """
+    Foto de comercial por sha256 do conteúdo
+
+    O conteúdo de um hash é imutável: cache pública de 1 ano e ETag = hash
+    """
+    photo = get_photo(photo_hash)
+    if photo is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Foto {photo_hash} não encontrada"
+        )
+    return Response(
+        content=photo["dados"],
+        media_type=photo["content_type"],
+        headers={
+            "Cache-Control": "public, max-age=31536000, immutable",
+            # Nunca interpretar como outro tipo (ex: HTML) além do declarado
+            "X-Content-Type-Options": "nosniff",
+            "ETag": f'"{photo["hash"]}"'
+        }
+    )
+
+
 @router.get("/{demo_id}", response_model=DemoResponse)
 def get_demo(demo_id: str):
     """Obter demo específica por ID"""
@@ -140,14 +292,19 @@ def create_demo(demo: DemoCreate):
         VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
     """
     
+    foto_url, foto = prepare_photo(demo.comercial_foto_url)
+    
     try:
-        db.execute_insert(
-            query,
-            (demo_id, demo.nome, demo.descricao, demo.url, demo.estado,
-             demo.vertical, demo.horizontal, demo.keywords, demo.codigo_projeto,
-             demo.comercial_nome, demo.comercial_contacto,
-             demo.comercial_foto_url, demo.criado_por)
-        )
+        # Foto e demo na mesma transação: uma demo rejeitada não deixa a foto
+        with db.get_cursor() as cursor:
+            save_photo(cursor, foto)
+            cursor.execute(
+                query,
+                (demo_id, demo.nome, demo.descricao, demo.url, demo.estado,
+                 demo.vertical, demo.horizontal, demo.keywords, demo.codigo_projeto,
+                 demo.comercial_nome, demo.comercial_contacto,
+                 foto_url, demo.criado_por)
+            )
     except Exception as e:
         if "UNIQUE constraint failed" in str(e):
             raise HTTPException(
@@ -217,9 +374,11 @@ def update_demo(demo_id: str, demo: DemoUpdate):
         updates.append("comercial_contacto = ?")
         params.append(demo.comercial_contacto)
     
+    foto = None
     if demo.comercial_foto_url is not None:
+        foto_url, foto = prepare_photo(demo.comercial_foto_url)
         updates.append("comercial_foto_url = ?")
-        params.append(demo.comercial_foto_url)
+        params.append(foto_url)
     
     if not updates:
         return get_demo(demo_id)
@@ -229,7 +388,14 @@ def update_demo(demo_id: str, demo: DemoUpdate):
     query = f"UPDATE demo SET {', '.join(updates)} WHERE id = ?"
     
     try:
-        db.execute_update(query, tuple(params))
+        with db.get_cursor() as cursor:
+            cursor.execute("SELECT comercial_foto_url FROM demo WHERE id = ?", (demo_id,))
+            anterior = cursor.fetchone()
+            save_photo(cursor, foto)
+            cursor.execute(query, tuple(params))
+            # Foto substituída: apagar a antiga se já não for usada
+            if anterior and demo.comercial_foto_url is not None:
+                delete_unused_photo(cursor, anterior["comercial_foto_url"])
     except Exception as e:
         if "UNIQUE constraint failed" in str(e):
             raise HTTPException(
@@ -246,8 +412,14 @@ def update_demo(demo_id: str, demo: DemoUpdate):
 
 @router.delete("/{demo_id}/delete", status_code=status.HTTP_204_NO_CONTENT)
 def delete_demo(demo_id: str):
-    """Apagar demo"""
-    rows_affected = db.execute_update("DELETE FROM demo WHERE id = ?", (demo_id,))
+    """Apagar demo (e a foto, se nenhuma outra demo a usar)"""
+    with db.get_cursor() as cursor:
+        cursor.execute("SELECT comercial_foto_url FROM demo WHERE id = ?", (demo_id,))
+        anterior = cursor.fetchone()
+        cursor.execute("DELETE FROM demo WHERE id = ?", (demo_id,))
+        rows_affected = cursor.rowcount
+        if anterior:
+            delete_unused_photo(cursor, anterior["comercial_foto_url"])
     
     if rows_affected == 0:
         raise HTTPException(
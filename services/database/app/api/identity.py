@@ -0,0 +1,101 @@
+"""
+Identity Endpoint
+Resolução de identidade no login (admin → cliente → domínio permitido)
+
+Substitui a sequência de pedidos do fluxo OAuth (admin por email, cliente
+por email, criar cliente, reler cliente) por um único pedido.
+"""
+from fastapi import APIRouter, HTTPException, status
+from typing import List, Optional
+from pydantic import BaseModel, EmailStr, Field
+import secrets
+from app.db.connection import DatabaseConnection as db
+
+
+router = APIRouter()
+
+
+# ============================================================================
+# MODELS
+# ============================================================================
+
+class IdentityResolveRequest(BaseModel):
+    email: EmailStr
+    nome: Optional[str] = None
+    # Domínios cujos utilizadores são criados como cliente se não existirem
+    dominios_permitidos: List[str] = []
+    criado_por: str  # admin_id dos clientes criados automaticamente
+    validade_dias: int = Field(default=30, ge=1)
+
+
+class IdentityResponse(BaseModel):
+    email: str
+    role: Optional[str]  # "admin", "viewer" ou None (não autorizado)
+    id: Optional[str]
+    criado: bool = False
+
+
+# ============================================================================
+# ENDPOINTS
+# ============================================================================
+
+@router.post("/resolve", response_model=IdentityResponse)
+def resolve_identity(request: IdentityResolveRequest):
+    """
+    Resolver (ou criar) a identidade de um email num só pedido
+
+    As leituras usam uma conexão de leitura; só a criação do cliente passa
+    pelo writer.
+
+    1. Admin com este email → role admin
+    2. Cliente com este email → role viewer
+    3. Domínio em dominios_permitidos → cliente criado, role viewer
+    4. Caso contrário → role None
+    """
+    email = request.email
+    dominio = email.rsplit("@", 1)[-1].lower()
+
+    try:
+        # Logins de quem já existe só leem: não ocupam o writer (pool de 1)
+        with db.read_cursor() as cursor:
+            cursor.execute("SELECT id FROM admin WHERE email = ?", (email,))
+            admin = cursor.fetchone()
+            if admin:
+                return {"email": email, "role": "admin", "id": admin["id"]}
+
+            cursor.execute("SELECT id FROM cliente WHERE email = ?", (email,))
+            cliente = cursor.fetchone()
+            if cliente:
+                return {"email": email, "role": "viewer", "id": cliente["id"]}
+
+        if dominio not in {d.lower() for d in request.dominios_permitidos}:
+            return {"email": email, "role": None, "id": None}
+
+        with db.get_cursor() as cursor:
+            # OR IGNORE: um login concorrente do mesmo email pode ter criado o cliente
+            cursor.execute(
+                """
+                INSERT OR IGNORE INTO cliente (id, nome, email, data_expiracao, criado_por)
+                VALUES (?, ?, ?, DATETIME('now', ?), ?)
+                """,
+                (secrets.token_hex(16), request.nome or email, email,
+                 f"+{request.validade_dias} days", request.criado_por)
+            )
+            criado = cursor.rowcount > 0
+            cursor.execute("SELECT id FROM cliente WHERE email = ?", (email,))
+            return {"email": email, "role": "viewer", "id": cursor.fetchone()["id"], "criado": criado}
+    except Exception as e:
+        if "FOREIGN KEY constraint failed" in str(e):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Admin {request.criado_por} (criado_por) não existe"
+            )
+        if "constraint failed" in str(e):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Não foi possível criar o cliente: {str(e)}"
+            )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao resolver identidade: {str(e)}"
+        )
@@ -2,10 +2,16 @@
 Log CRUD Endpoints
 Tabela: log (id, cliente_id, demo_id, tipo, mensagem, timestamp)
 """
-from fastapi import APIRouter, HTTPException, status
-from typing import List, Optional, Literal
+from fastapi import APIRouter, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
+from typing import List, Optional, Literal, Iterator, Tuple
 from pydantic import BaseModel
+import csv
+import io
+import json
+import sqlite3
 from app.db.connection import DatabaseConnection as db
+from app.db.pagination import Page, fetch_page, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 
 router = APIRouter()
@@ -28,6 +34,17 @@ class LogResponse(LogCreate):
     timestamp: str
 
 
+class LogBulkItem(LogCreate):
+    id: Optional[str] = None  # Gerado pelo cliente para tornar reenvios idempotentes
+    timestamp: Optional[str] = None  # Momento do evento (UTC); default: agora
+
+
+class LogBulkResponse(BaseModel):
+    recebidos: int
+    inseridos: int
+    rejeitados: int = 0  # Linhas inválidas descartadas (ver create_logs_bulk)
+
+
 # ============================================================================
 # ENDPOINTS
 # ============================================================================
@@ -39,6 +56,105 @@ def get_all_logs(limit: int = 100):
     return db.execute_query(query, (limit,))
 
 
+@router.get("/page", response_model=Page[LogResponse])
+def get_logs_page(
+    cursor: Optional[str] = None,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+):
+    """Listar logs paginados por (timestamp, id), mais recentes primeiro"""
+    return fetch_page(
+        "SELECT * FROM log",
+        keys=("timestamp", "id"), fields=("timestamp", "id"),
+        cursor=cursor, limit=limit, descending=True
+    )
+
+
+# ============================================================================
+# EXPORT (streaming)
+# ============================================================================
+
+EXPORT_COLUMNS = ["id", "cliente_id", "demo_id", "tipo", "mensagem", "timestamp"]
+EXPORT_BATCH_SIZE = 500
+
+
+def _export_rows(desde: Optional[str], ate: Optional[str], tipo: Optional[str]):
+    """Iterar logs por ordem cronológica, com filtros opcionais"""
+    conditions = []
+    params = []
+    if desde:
+        conditions.append("timestamp >= datetime(?)")
+        params.append(desde)
+    if ate:
+        conditions.append("timestamp < datetime(?)")
+        params.append(ate)
+    if tipo:
+        conditions.append("tipo = ?")
+        params.append(tipo)
+    
+    query = f"SELECT {', '.join(EXPORT_COLUMNS)} FROM log"
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += " ORDER BY timestamp ASC, id ASC"
+    
+    return db.iter_query(query, tuple(params), batch_size=EXPORT_BATCH_SIZE)
+
+
+def _ndjson_chunks(rows) -> Iterator[str]:
+    """Agrupar linhas NDJSON em chunks de EXPORT_BATCH_SIZE"""
+    buffer = []
+    for row in rows:
+        buffer.append(json.dumps(row, ensure_ascii=False))
+        if len(buffer) >= EXPORT_BATCH_SIZE:
+            yield "\n".join(buffer) + "\n"
+            buffer = []
+    if buffer:
+        yield "\n".join(buffer) + "\n"
+
+
+def _csv_chunks(rows) -> Iterator[str]:
+    """Cabeçalho + linhas CSV em chunks de EXPORT_BATCH_SIZE"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+    writer.writeheader()
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+        if count % EXPORT_BATCH_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+@router.get("/export")
+def export_logs(
+    formato: Literal['ndjson', 'csv'] = 'ndjson',
+    desde: Optional[str] = None,
+    ate: Optional[str] = None,
+    tipo: Optional[str] = None
+):
+    """
+    Exportar a tabela log em streaming (NDJSON ou CSV)
+    Filtros: desde (inclusive) / ate (exclusive) em formato ISO, tipo de evento
+    """
+    rows = _export_rows(desde, ate, tipo)
+    
+    if formato == 'csv':
+        return StreamingResponse(
+            _csv_chunks(rows),
+            media_type="text/csv",
+            headers={"Content-Disposition": "attachment; filename=logs.csv"}
+        )
+    
+    return StreamingResponse(
+        _ndjson_chunks(rows),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": "attachment; filename=logs.ndjson"}
+    )
+
+
 @router.get("/{log_id}", response_model=LogResponse)
 def get_log(log_id: str):
     """Obter log específico por ID"""
@@ -115,6 +231,66 @@ def create_log(log: LogCreate):
     return get_log(log_id)
 
 
+def _insert_logs_one_by_one(query: str, params: List[tuple]) -> Tuple[int, int]:
+    """
+    Fallback do bulk: cada linha no seu statement, na mesma transação
+    Uma linha inválida falha só o seu statement; devolve (inseridos, rejeitados)
+    """
+    inseridos = rejeitados = 0
+    with db.get_cursor() as cursor:
+        for row in params:
+            try:
+                cursor.execute(query, row)
+                inseridos += cursor.rowcount
+            except sqlite3.IntegrityError:
+                rejeitados += 1
+    return inseridos, rejeitados
+
+
+@router.post("/bulk", response_model=LogBulkResponse, status_code=status.HTTP_201_CREATED)
+def create_logs_bulk(logs: List[LogBulkItem]):
+    """
+    Inserir vários logs numa única transação (executemany)
+    Usado pela ingestão em batch do Catalog; logs com id já existente são ignorados
+
+    OR IGNORE não cobre FOREIGN KEYs: cliente_id/demo_id desconhecidos (ex: o
+    id do admin enviado como cliente_id ao abrir uma demo) ficam NULL, como
+    nos eventos de admin, em vez de falharem o lote inteiro. Se ainda assim
+    o lote falhar, as linhas são inseridas uma a uma e as inválidas rejeitadas.
+    """
+    import secrets
+    
+    query = """
+        INSERT OR IGNORE INTO log (id, cliente_id, demo_id, tipo, mensagem, timestamp)
+        SELECT ?,
+               (SELECT id FROM cliente WHERE id = ?),
+               (SELECT id FROM demo WHERE id = ?),
+               ?, ?, COALESCE(datetime(?), datetime('now'))
+    """
+    params = [
+        (log.id or secrets.token_hex(16), log.cliente_id, log.demo_id,
+         log.tipo, log.mensagem, log.timestamp)
+        for log in logs
+    ]
+    
+    if not params:
+        return {"recebidos": 0, "inseridos": 0}
+    
+    rejeitados = 0
+    try:
+        try:
+            inseridos = db.execute_many(query, params)
+        except sqlite3.IntegrityError:
+            inseridos, rejeitados = _insert_logs_one_by_one(query, params)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao criar logs: {str(e)}"
+        )
+    
+    return {"recebidos": len(params), "inseridos": inseridos, "rejeitados": rejeitados}
+
+
 @router.get("/stats/summary")
 def get_log_stats():
     """Obter estatísticas gerais dos logs"""
@@ -131,6 +307,111 @@ def get_log_stats():
     return db.execute_query(query)
 
 
+# ============================================================================
+# AGREGAÇÕES (usadas pelo Metrics Exporter)
+# Calculadas com GROUP BY sobre toda a tabela log: payload O(grupos)
+# ============================================================================
+
+# Janelas temporais do overview: nome → modificador datetime()
+JANELAS_OVERVIEW = {
+    "last_24h": "-24 hours",
+    "last_7d": "-7 days",
+    "last_30d": "-30 days",
+}
+
+
+@router.get("/aggregates/overview")
+def get_logs_overview_aggregate():
+    """Totais de logs por janela temporal (24h/7d/30d) e tipo de evento"""
+    colunas = ["COUNT(*) as total_logs"]
+    params = []
+    for janela, modificador in JANELAS_OVERVIEW.items():
+        colunas += [
+            f"COUNT(CASE WHEN timestamp >= datetime('now', ?) THEN 1 END) as {janela}_total",
+            f"COUNT(CASE WHEN timestamp >= datetime('now', ?) AND tipo = 'login' THEN 1 END) as {janela}_logins",
+            f"COUNT(CASE WHEN timestamp >= datetime('now', ?) AND tipo = 'demo_aberta' THEN 1 END) as {janela}_demos_abertas",
+            f"COUNT(CASE WHEN timestamp >= datetime('now', ?) AND tipo = 'erro' THEN 1 END) as {janela}_erros",
+        ]
+        params += [modificador] * 4
+    
+    query = f"SELECT {', '.join(colunas)} FROM log"
+    row = db.execute_query(query, tuple(params))[0]
+    
+    result = {"total_logs": row["total_logs"]}
+    for janela in JANELAS_OVERVIEW:
+        result[janela] = {
+            "total": row[f"{janela}_total"],
+            "logins": row[f"{janela}_logins"],
+            "demos_abertas": row[f"{janela}_demos_abertas"],
+            "erros": row[f"{janela}_erros"],
+        }
+    return result
+
+
+@router.get("/aggregates/top-clients")
+def get_top_clients_aggregate(limit: int = 10):
+    """Clientes com mais eventos registados"""
+    query = """
+        SELECT 
+            l.cliente_id,
+            COALESCE(c.nome, l.cliente_id) as cliente_nome,
+            COUNT(*) as total_eventos,
+            COUNT(CASE WHEN l.tipo = 'login' THEN 1 END) as logins,
+            COUNT(CASE WHEN l.tipo = 'demo_aberta' THEN 1 END) as demos_abertas
+        FROM log l
+        LEFT JOIN cliente c ON c.id = l.cliente_id
+        WHERE l.cliente_id IS NOT NULL
+        GROUP BY l.cliente_id
+        ORDER BY total_eventos DESC
+        LIMIT ?
+    """
+    return db.execute_query(query, (limit,))
+
+
+@router.get("/aggregates/top-demos")
+def get_top_demos_aggregate(limit: int = 10):
+    """Demos mais abertas (eventos demo_aberta)"""
+    query = """
+        SELECT 
+            l.demo_id,
+            COALESCE(d.nome, l.demo_id) as demo_nome,
+            COUNT(*) as aberturas
+        FROM log l
+        LEFT JOIN demo d ON d.id = l.demo_id
+        WHERE l.tipo = 'demo_aberta' AND l.demo_id IS NOT NULL
+        GROUP BY l.demo_id
+        ORDER BY aberturas DESC
+        LIMIT ?
+    """
+    return db.execute_query(query, (limit,))
+
+
+@router.get("/aggregates/demos-per-client")
+def get_demos_per_client_aggregate():
+    """
+    Aberturas por (cliente, demo), uma linha por par
+    total_aberturas é o total do cliente (COUNT em janela por cliente)
+    """
+    query = """
+        SELECT 
+            l.cliente_id,
+            COALESCE(c.nome, l.cliente_id) as cliente_nome,
+            l.demo_id,
+            COALESCE(d.nome, l.demo_id) as demo_nome,
+            COUNT(*) as aberturas,
+            SUM(COUNT(*)) OVER (PARTITION BY l.cliente_id) as total_aberturas
+        FROM log l
+        LEFT JOIN cliente c ON c.id = l.cliente_id
+        LEFT JOIN demo d ON d.id = l.demo_id
+        WHERE l.tipo = 'demo_aberta' 
+            AND l.cliente_id IS NOT NULL 
+            AND l.demo_id IS NOT NULL
+        GROUP BY l.cliente_id, l.demo_id
+        ORDER BY total_aberturas DESC, l.cliente_id, aberturas DESC
+    """
+    return db.execute_query(query)
+
+
 @router.delete("/{log_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_log(log_id: str):
     """Apagar log"""
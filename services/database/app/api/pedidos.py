@@ -1,7 +1,8 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, status, Query
 from typing import List, Optional, Literal
 from pydantic import BaseModel
 from app.db.connection import DatabaseConnection as db
+from app.db.pagination import Page, fetch_page, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 
 router = APIRouter()
@@ -37,6 +38,23 @@ class ApproveRejectRequest(BaseModel):
     nova_data_expiracao: Optional[str] = None  # Apenas para aprovações de renovação
 
 
+# ============================================================================
+# QUERIES
+# ============================================================================
+
+# Pedido + dados do cliente numa única query (mesmo JOIN que v_pending_requests),
+# em vez de um SELECT ao cliente por cada pedido
+PEDIDO_CLIENTE_SELECT = """
+    SELECT
+        p.*,
+        c.nome as cliente_nome,
+        c.email as cliente_email,
+        c.data_expiracao as data_expiracao_atual
+    FROM pedido p
+    INNER JOIN cliente c ON p.cliente_id = c.id
+"""
+
+
 # ============================================================================
 # ENDPOINTS
 # ============================================================================
@@ -44,119 +62,60 @@ class ApproveRejectRequest(BaseModel):
 @router.get("/all", response_model=List[PedidoResponseCliente])
 def get_all_pedidos():
     """Listar todos os pedidos"""
-    query = "SELECT * FROM pedido ORDER BY criado_em DESC"
-    pedidos = db.execute_query(query)
-    results = []
-    for pedido in pedidos:
-        
-        cliente = db.execute_query(
-            "SELECT nome, email, data_expiracao FROM cliente WHERE id = ?",
-            (pedido["cliente_id"],)
-        )
-        cliente = cliente[0] if cliente else None
-
-        result = {
-            **pedido,
-            "cliente_nome": cliente["nome"],
-            "cliente_email": cliente["email"],
-            "data_expiracao_atual": cliente["data_expiracao"],
-        }
-        results.append(result)
-
-    return results
+    query = f"{PEDIDO_CLIENTE_SELECT} ORDER BY p.criado_em DESC"
+    return db.execute_query(query)
+
+
+@router.get("/page", response_model=Page[PedidoResponseCliente])
+def get_pedidos_page(
+    cursor: Optional[str] = None,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+):
+    """Listar pedidos paginados por (criado_em, id), mais recentes primeiro"""
+    return fetch_page(
+        PEDIDO_CLIENTE_SELECT,
+        keys=("p.criado_em", "p.id"), fields=("criado_em", "id"),
+        cursor=cursor, limit=limit, descending=True
+    )
 
 
 @router.get("/pending", response_model=List[PedidoResponseCliente])
 def get_pending_pedidos():
     """Listar pedidos pendentes"""
-    query = """
-        SELECT * FROM pedido 
-        WHERE estado = 'pendente' 
-        ORDER BY criado_em ASC
+    query = f"""
+        {PEDIDO_CLIENTE_SELECT}
+        WHERE p.estado = 'pendente'
+        ORDER BY p.criado_em ASC
     """
-    pedidos = db.execute_query(query)
-    results = []
-    for pedido in pedidos:
-        
-        cliente = db.execute_query(
-            "SELECT nome, email, data_expiracao FROM cliente WHERE id = ?",
-            (pedido["cliente_id"],)
-        )
-        cliente = cliente[0] if cliente else None
-
-        result = {
-            **pedido,
-            "cliente_nome": cliente["nome"],
-            "cliente_email": cliente["email"],
-            "data_expiracao_atual": cliente["data_expiracao"],
-        }
-        results.append(result)
+    return db.execute_query(query)
 
-    return results
 
 @router.get("/approved", response_model=List[PedidoResponseCliente])
 def get_approved_pedidos():
     """Listar pedidos aprovados"""
-    query = """
-        SELECT * FROM pedido 
-        WHERE estado = 'aprovado' 
-        ORDER BY criado_em ASC
+    query = f"""
+        {PEDIDO_CLIENTE_SELECT}
+        WHERE p.estado = 'aprovado'
+        ORDER BY p.criado_em ASC
     """
-    pedidos = db.execute_query(query)
-    results = []
-    for pedido in pedidos:
-        
-        cliente = db.execute_query(
-            "SELECT nome, email, data_expiracao FROM cliente WHERE id = ?",
-            (pedido["cliente_id"],)
-        )
-        cliente = cliente[0] if cliente else None
-
-        result = {
-            **pedido,
-            "cliente_nome": cliente["nome"],
-            "cliente_email": cliente["email"],
-            "data_expiracao_atual": cliente["data_expiracao"],
-        }
-        results.append(result)
+    return db.execute_query(query)
 
 
-    return results
-
 @router.get("/rejected", response_model=List[PedidoResponseCliente])
 def get_rejected_pedidos():
     """Listar pedidos rejeitados"""
-    query = """
-        SELECT * FROM pedido 
-        WHERE estado = 'rejeitado' 
-        ORDER BY criado_em ASC
+    query = f"""
+        {PEDIDO_CLIENTE_SELECT}
+        WHERE p.estado = 'rejeitado'
+        ORDER BY p.criado_em ASC
     """
-    pedidos = db.execute_query(query)
-    results = []
-    for pedido in pedidos:
-        
-        cliente = db.execute_query(
-            "SELECT nome, email, data_expiracao FROM cliente WHERE id = ?",
-            (pedido["cliente_id"],)
-        )
-        cliente = cliente[0] if cliente else None
-
-        result = {
-            **pedido,
-            "cliente_nome": cliente["nome"],
-            "cliente_email": cliente["email"],
-            "data_expiracao_atual": cliente["data_expiracao"],
-        }
-        results.append(result)
-
-
-    return results
+    return db.execute_query(query)
 
 
 @router.get("/{pedido_id}", response_model=PedidoResponseCliente)
 def get_pedido(pedido_id: str):
     """Obter pedido específico por ID"""
-    query = "SELECT * FROM pedido WHERE id = ?"
+    query = f"{PEDIDO_CLIENTE_SELECT} WHERE p.id = ?"
     pedidos = db.execute_query(query, (pedido_id.strip(),))
     
     if not pedidos:
@@ -164,20 +123,8 @@ def get_pedido(pedido_id: str):
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Pedido {pedido_id} não encontrado"
         )
-    pedido = pedidos[0]
-    cliente = db.execute_query(
-        "SELECT nome, email, data_expiracao FROM cliente WHERE id = ?",
-        (pedido["cliente_id"],)
-    )
-    cliente = cliente[0] if cliente else None
-
-    result = {
-        **pedido,
-        "cliente_nome": cliente["nome"],
-        "cliente_email": cliente["email"],
-        "data_expiracao_atual": cliente["data_expiracao"],
-    }
-    return result
+    
+    return pedidos[0]
 
 
 @router.get("/by-cliente/{cliente_id}", response_model=List[PedidoResponseCliente])
@@ -186,10 +133,10 @@ def get_pedidos_by_cliente(cliente_id: str):
     Listar pedidos de um cliente específico
     Usado para verificar se cliente já tem pedido pendente
     """
-    query = """
-        SELECT * FROM pedido 
-        WHERE cliente_id = ? 
-        ORDER BY criado_em DESC
+    query = f"""
+        {PEDIDO_CLIENTE_SELECT}
+        WHERE p.cliente_id = ? 
+        ORDER BY p.criado_em DESC
     """
     pedidos = db.execute_query(query, (cliente_id.strip(),))
     return pedidos
@@ -0,0 +1,53 @@
+"""
+Named Queries Endpoints
+Executa queries analíticas registadas em app/db/queries.py pelo nome
+"""
+from fastapi import APIRouter, HTTPException, Request, status
+from typing import List, Dict, Any
+from app.db.executor import db_executor
+from app.db.queries import QUERIES, run_query, query_stats
+
+
+router = APIRouter()
+
+
+# ============================================================================
+# ENDPOINTS
+# ============================================================================
+
+@router.get("/")
+def list_queries() -> Dict[str, Any]:
+    """Listar queries registadas (parâmetros, TTL, descrição)"""
+    return {
+        name: {
+            "description": query.description,
+            "params": sorted(query.params),
+            "ttl": query.ttl
+        }
+        for name, query in QUERIES.items()
+    }
+
+
+@router.get("/stats")
+def get_query_stats() -> Dict[str, Any]:
+    """Tempos de execução e cache hits por query"""
+    return query_stats()
+
+
+@router.get("/{name}")
+async def execute_named_query(name: str, request: Request) -> List[Dict[str, Any]]:
+    """
+    Executar query registada
+
+    Os parâmetros vão na query string, ex: /db/queries/tempo_cliente_demo?cliente_id=cliente001
+    Corre no pool "analytics" do executor (ver app/db/executor.py).
+    """
+    try:
+        return await db_executor.run(run_query, name, dict(request.query_params), lane="analytics")
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao executar query {name}: {str(e)}"
+        )
@@ -0,0 +1,189 @@
+"""
+Sessions Endpoints
+Sessões de utilização de demos (demo_sessions): início, heartbeat e fim
+
+Todas as escritas são idempotentes em session_id, para que o Catalog possa
+repetir pedidos sem criar sessões duplicadas nem alterar durações já fechadas.
+"""
+from fastapi import APIRouter, HTTPException, status, Query
+from typing import List, Optional
+from pydantic import BaseModel
+from app.db.connection import DatabaseConnection as db
+
+
+router = APIRouter()
+
+
+# ============================================================================
+# MODELS
+# ============================================================================
+
+class SessionStart(BaseModel):
+    session_id: str
+    cliente_id: str
+    demo_id: str
+    timestamp_inicio: Optional[str] = None  # UTC; default: agora
+
+
+class SessionEnd(BaseModel):
+    timestamp_fim: Optional[str] = None  # UTC; default: agora
+
+
+class SessionHeartbeats(BaseModel):
+    session_ids: List[str]
+
+
+class SessionResponse(BaseModel):
+    session_id: str
+    cliente_id: str
+    demo_id: str
+    timestamp_inicio: str
+    timestamp_fim: Optional[str] = None
+    duracao_segundos: Optional[int] = None
+    ultimo_heartbeat: Optional[str] = None
+
+
+class SessionsAffected(BaseModel):
+    atualizadas: int
+
+
+# ============================================================================
+# QUERIES
+# ============================================================================
+
+SESSION_SELECT = """
+    SELECT session_id, cliente_id, demo_id, timestamp_inicio,
+           timestamp_fim, duracao_segundos, ultimo_heartbeat
+    FROM demo_sessions
+"""
+
+# Duração em segundos inteiros entre início e fim (nunca negativa)
+DURACAO_SQL = """
+    MAX(0, CAST(ROUND((julianday({fim}) - julianday(timestamp_inicio)) * 86400) AS INTEGER))
+"""
+
+
+# ============================================================================
+# ENDPOINTS
+# ============================================================================
+
+@router.get("/{session_id}", response_model=SessionResponse)
+def get_session(session_id: str):
+    """Obter sessão por session_id"""
+    sessions = db.execute_query(f"{SESSION_SELECT} WHERE session_id = ?", (session_id,))
+    
+    if not sessions:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Sessão {session_id} não encontrada"
+        )
+    
+    return sessions[0]
+
+
+@router.post("/start", response_model=SessionResponse, status_code=status.HTTP_201_CREATED)
+def start_session(session: SessionStart):
+    """
+    Iniciar sessão (idempotente: um session_id repetido devolve a sessão existente)
+    """
+    query = """
+        INSERT INTO demo_sessions (session_id, cliente_id, demo_id, timestamp_inicio, ultimo_heartbeat)
+        VALUES (?, ?, ?, COALESCE(datetime(?), datetime('now')), COALESCE(datetime(?), datetime('now')))
+        ON CONFLICT(session_id) DO NOTHING
+    """
+    
+    try:
+        db.execute_update(
+            query,
+            (session.session_id, session.cliente_id, session.demo_id,
+             session.timestamp_inicio, session.timestamp_inicio)
+        )
+    except Exception as e:
+        if "FOREIGN KEY constraint failed" in str(e):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cliente ou demo não existe"
+            )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao iniciar sessão: {str(e)}"
+        )
+    
+    return get_session(session.session_id)
+
+
+@router.post("/heartbeats", response_model=SessionsAffected)
+def heartbeat_sessions(heartbeats: SessionHeartbeats):
+    """
+    Registar heartbeat de várias sessões abertas numa única transação
+    Sessões desconhecidas ou já terminadas são ignoradas
+    """
+    if not heartbeats.session_ids:
+        return {"atualizadas": 0}
+    
+    query = """
+        UPDATE demo_sessions SET ultimo_heartbeat = datetime('now')
+        WHERE session_id = ? AND timestamp_fim IS NULL
+    """
+    
+    try:
+        atualizadas = db.execute_many(query, [(sid,) for sid in set(heartbeats.session_ids)])
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao registar heartbeats: {str(e)}"
+        )
+    
+    return {"atualizadas": atualizadas}
+
+
+@router.post("/expire", response_model=SessionsAffected)
+def expire_sessions(timeout_segundos: int = Query(default=300, ge=30)):
+    """
+    Fechar sessões abertas sem heartbeat há mais de timeout_segundos
+    A sessão termina no último heartbeat (o tempo sem sinal não conta)
+    """
+    fim = "COALESCE(ultimo_heartbeat, timestamp_inicio)"
+    query = f"""
+        UPDATE demo_sessions SET
+            timestamp_fim = {fim},
+            duracao_segundos = {DURACAO_SQL.format(fim=fim)}
+        WHERE timestamp_fim IS NULL
+          AND {fim} < datetime('now', ?)
+    """
+    
+    try:
+        atualizadas = db.execute_update(query, (f"-{timeout_segundos} seconds",))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao expirar sessões: {str(e)}"
+        )
+    
+    return {"atualizadas": atualizadas}
+
+
+@router.post("/{session_id}/end", response_model=SessionResponse)
+def end_session(session_id: str, session: Optional[SessionEnd] = None):
+    """
+    Terminar sessão e calcular duração
+    Idempotente: uma sessão já terminada mantém o fim e a duração originais
+    """
+    fim = "COALESCE(datetime(?), datetime('now'))"
+    timestamp_fim = session.timestamp_fim if session else None
+    query = f"""
+        UPDATE demo_sessions SET
+            timestamp_fim = {fim},
+            duracao_segundos = {DURACAO_SQL.format(fim=fim)}
+        WHERE session_id = ? AND timestamp_fim IS NULL
+    """
+    
+    try:
+        db.execute_update(query, (timestamp_fim, timestamp_fim, session_id))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao terminar sessão: {str(e)}"
+        )
+    
+    return get_session(session_id)
@@ -0,0 +1,26 @@
+"""
+Table Versions Endpoint
+Contadores de versão por tabela (mantidos por triggers, ver schema.sql)
+"""
+from fastapi import APIRouter
+from typing import Dict
+from app.db.connection import DatabaseConnection as db
+
+
+router = APIRouter()
+
+
+# ============================================================================
+# ENDPOINTS
+# ============================================================================
+
+@router.get("/")
+def get_table_versions() -> Dict[str, int]:
+    """
+    Versão atual de cada tabela, ex: {"demo": 12, "log": 3051, ...}
+
+    Um número diferente do anterior significa que a tabela foi escrita
+    entretanto; igual significa que caches derivados dela continuam válidos.
+    """
+    rows = db.execute_query("SELECT tabela, versao FROM table_versions")
+    return {row["tabela"]: row["versao"] for row in rows}
@@ -2,7 +2,7 @@
 Database Service Configuration
 """
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, Literal, Optional, Union
 
 
 class Settings(BaseSettings):
@@ -14,9 +14,45 @@ class Settings(BaseSettings):
     
     # Database settings
     DB_PATH: str = "/data/ltplabs.db"
+    # schema.sql aplicado pelo init-db.sh; também usado na migração do startup
+    SCHEMA_PATH: str = "/scripts/schema.sql"
     SQLITE_TIMEOUT: int = 30000
+    # Profile de PRAGMAs por conexão (ver app/db/pragmas.py)
+    SQLITE_PROFILE: Literal["safe", "balanced", "fast"] = "balanced"
+    # Overrides por PRAGMA, ex: SQLITE_PRAGMA_OVERRIDES='{"cache_size": -32000}'
+    SQLITE_PRAGMA_OVERRIDES: Dict[str, Union[int, str]] = {}
+    # Statements compilados em cache por conexão (queries registadas, etc.)
+    SQLITE_CACHED_STATEMENTS: int = 256
+    
+    # Pool de conexões (1 writer + N readers)
+    DB_READ_POOL_SIZE: int = 8
+    DB_POOL_TIMEOUT: float = 10.0  # segundos à espera de uma conexão livre
+    DB_POOL_HEALTH_CHECK_INTERVAL: float = 60.0  # validar conexões paradas há mais tempo
+    
+    # Threads para operações SQLite chamadas de handlers async (app/db/executor.py).
+    # Queries analíticas (/db/query, /db/queries) têm um pool próprio e pequeno
+    # (< DB_READ_POOL_SIZE), para deixarem readers livres para o CRUD
+    DB_EXECUTOR_WORKERS: int = 4
+    DB_ANALYTICS_WORKERS: int = 2
+    
+    # Cache de resultados das queries registadas (/db/queries)
+    QUERY_CACHE_TTL: float = 30.0
+    QUERY_CACHE_MAX_ENTRIES: int = 512
     LOAD_SEED_DATA: str = "true"
     
+    # Fotos de comerciais guardadas fora da tabela demo (demo_foto, por sha256).
+    # comercial_foto_url passa a ser PHOTO_URL_PREFIX + hash, servido pelo Catalog
+    PHOTO_URL_PREFIX: str = "/api/demos/fotos/"
+    PHOTO_MAX_BYTES: int = 2 * 1024 * 1024
+    
+    # Compressão das respostas (GZip acima de GZIP_MINIMUM_SIZE bytes)
+    GZIP_MINIMUM_SIZE: int = 1024
+    GZIP_COMPRESS_LEVEL: int = 5
+    
+    # Escritas com Idempotency-Key: resposta guardada para repetições (segundos)
+    IDEMPOTENCY_TTL: float = 300.0
+    IDEMPOTENCY_MAX_ENTRIES: int = 10000
+    
     # Logging
     LOG_LEVEL: str = "INFO"
     
@@ -0,0 +1,127 @@
+"""
+Idempotency
+Deduplicação de escritas repetidas pelo header Idempotency-Key
+
+O Catalog repete escritas que falharam por timeout/conexão (a primeira
+tentativa pode ter sido aplicada). Cada escrita leva uma chave única,
+igual em todas as tentativas:
+- a primeira execução guarda status + body durante IDEMPOTENCY_TTL segundos
+- uma repetição com a mesma chave recebe a resposta guardada, sem voltar a
+  executar a rota (header Idempotent-Replayed: true)
+- uma repetição que chega enquanto a primeira ainda corre espera por ela
+Respostas 5xx não são guardadas (a escrita pode ser tentada de novo).
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
+
+
+WRITE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+HEADER = b"idempotency-key"
+
+# (status, headers, body)
+StoredResponse = Tuple[int, List[Tuple[bytes, bytes]], bytes]
+
+
+class IdempotencyStore:
+    """Respostas guardadas por (método, path, chave) e execuções em curso"""
+
+    def __init__(self):
+        self._responses: "OrderedDict[Tuple[str, str, str], Tuple[float, StoredResponse]]" = OrderedDict()
+        self.pending: Dict[Tuple[str, str, str], asyncio.Event] = {}
+        self.stored = 0
+        self.replayed = 0
+
+    def get(self, key: Tuple[str, str, str]) -> Optional[StoredResponse]:
+        entry = self._responses.get(key)
+        if entry is None:
+            return None
+        expires_at, response = entry
+        if expires_at < time.monotonic():
+            del self._responses[key]
+            return None
+        return response
+
+    def store(self, key: Tuple[str, str, str], response: StoredResponse) -> None:
+        self._responses[key] = (time.monotonic() + settings.IDEMPOTENCY_TTL, response)
+        self._responses.move_to_end(key)
+        while len(self._responses) > settings.IDEMPOTENCY_MAX_ENTRIES:
+            self._responses.popitem(last=False)
+        self.stored += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._responses),
+            "in_progress": len(self.pending),
+            "stored": self.stored,
+            "replayed": self.replayed
+        }
+
+
+# Singleton instance
+idempotency_store = IdempotencyStore()
+
+
+class IdempotencyMiddleware:
+    """Middleware ASGI: replay de escritas com Idempotency-Key já vista"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def _replay(self, response: StoredResponse, send: Send) -> None:
+        status, headers, body = response
+        idempotency_store.replayed += 1
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": headers + [(b"idempotent-replayed", b"true")]
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in WRITE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        idempotency_key = dict(scope["headers"]).get(HEADER)
+        if not idempotency_key or settings.IDEMPOTENCY_TTL <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        key = (scope["method"], scope["path"], idempotency_key.decode("latin-1"))
+
+        # Repetição enquanto a primeira execução ainda corre: esperar por ela
+        pending = idempotency_store.pending.get(key)
+        if pending is not None:
+            await pending.wait()
+
+        stored = idempotency_store.get(key)
+        if stored is not None:
+            await self._replay(stored, send)
+            return
+
+        event = idempotency_store.pending[key] = asyncio.Event()
+        status = 500
+        headers: List[Tuple[bytes, bytes]] = []
+        body = bytearray()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, headers
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+            elif message["type"] == "http.response.body":
+                body.extend(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+            if status < 500:
+                idempotency_store.store(key, (status, headers, bytes(body)))
+        finally:
+            if idempotency_store.pending.get(key) is event:
+                del idempotency_store.pending[key]
+            event.set()
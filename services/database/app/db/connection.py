@@ -5,68 +5,136 @@ Provides thread-safe connection management
 import sqlite3
 import threading
 from contextlib import contextmanager
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator, Tuple, Union
 from app.core.config import settings
+from app.db.pool import ConnectionPool
+from app.db.pragmas import apply_pragmas
 
 
 class DatabaseConnection:
     """
     Thread-safe SQLite connection manager
-    Uses connection pooling per thread
+    Uses bounded connection pools: one writer and N read-only readers (WAL)
     """
     
-    _local = threading.local()
+    _lock = threading.Lock()
+    _writer: Optional[ConnectionPool] = None
+    _readers: Optional[ConnectionPool] = None
     
     @classmethod
-    def get_connection(cls) -> sqlite3.Connection:
-        """
-        Get or create a connection for the current thread
-        """
-        if not hasattr(cls._local, 'connection'):
-            cls._local.connection = sqlite3.connect(
-                settings.DB_PATH,
-                timeout=settings.SQLITE_TIMEOUT / 1000.0,  # Convert ms to seconds
-                check_same_thread=False
-            )
-            # Enable foreign keys
-            cls._local.connection.execute("PRAGMA foreign_keys = ON")
-            # Row factory for dict-like access
-            cls._local.connection.row_factory = sqlite3.Row
-        
-        return cls._local.connection
+    def _pools(cls) -> Tuple[ConnectionPool, ConnectionPool]:
+        """
+        Create pools lazily (settings.DB_PATH may change before first use)
+        """
+        if cls._writer is None:
+            with cls._lock:
+                if cls._writer is None:
+                    cls._readers = ConnectionPool(
+                        "reader",
+                        lambda: cls._connect(readonly=True),
+                        size=settings.DB_READ_POOL_SIZE,
+                        timeout=settings.DB_POOL_TIMEOUT,
+                        health_check_interval=settings.DB_POOL_HEALTH_CHECK_INTERVAL
+                    )
+                    # Um único writer: SQLite serializa as escritas de qualquer forma,
+                    # assim esperam no pool em vez de no lock da base de dados
+                    cls._writer = ConnectionPool(
+                        "writer",
+                        cls._connect,
+                        size=1,
+                        timeout=settings.DB_POOL_TIMEOUT,
+                        health_check_interval=settings.DB_POOL_HEALTH_CHECK_INTERVAL
+                    )
+        return cls._writer, cls._readers
+    
+    @classmethod
+    def _connect(cls, readonly: bool = False) -> sqlite3.Connection:
+        """
+        Open a new configured connection
+        """
+        connection = sqlite3.connect(
+            settings.DB_PATH,
+            timeout=settings.SQLITE_TIMEOUT / 1000.0,  # Convert ms to seconds
+            check_same_thread=False,
+            cached_statements=settings.SQLITE_CACHED_STATEMENTS
+        )
+        # Enable foreign keys
+        connection.execute("PRAGMA foreign_keys = ON")
+        # Tuning profile (WAL, synchronous, cache, mmap, busy_timeout)
+        apply_pragmas(connection)
+        if readonly:
+            connection.execute("PRAGMA query_only = ON")
+        # Row factory for dict-like access
+        connection.row_factory = sqlite3.Row
+        return connection
+    
+    @classmethod
+    @contextmanager
+    def connection(cls, readonly: bool = False) -> Iterator[sqlite3.Connection]:
+        """
+        Check out a pooled connection (reader or writer)
+        """
+        writer, readers = cls._pools()
+        with (readers if readonly else writer).connection() as conn:
+            yield conn
     
     @classmethod
     def close_connection(cls):
         """
-        Close connection for current thread
+        Close every pooled connection (shutdown)
+        """
+        with cls._lock:
+            for pool in (cls._writer, cls._readers):
+                if pool is not None:
+                    pool.close()
+            cls._writer = None
+            cls._readers = None
+    
+    @classmethod
+    def pool_stats(cls) -> Dict[str, Any]:
+        """
+        Metrics for the writer and reader pools
         """
-        if hasattr(cls._local, 'connection'):
-            cls._local.connection.close()
-            delattr(cls._local, 'connection')
+        writer, readers = cls._pools()
+        return {"writer": writer.stats(), "readers": readers.stats()}
     
     @classmethod
     @contextmanager
     def get_cursor(cls):
         """
-        Context manager for cursor with automatic commit/rollback
-        """
-        conn = cls.get_connection()
-        cursor = conn.cursor()
-        try:
-            yield cursor
-            conn.commit()
-        except Exception:
-            conn.rollback()
-            raise
-        finally:
-            cursor.close()
+        Context manager for cursor with automatic commit/rollback (writer)
+        """
+        with cls.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                yield cursor
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                cursor.close()
     
     @classmethod
-    def execute_query(cls, query: str, params: Optional[tuple] = None) -> List[Dict[str, Any]]:
+    @contextmanager
+    def read_cursor(cls):
+        """
+        Context manager for a cursor on a read-only connection
+        """
+        with cls.connection(readonly=True) as conn:
+            cursor = conn.cursor()
+            try:
+                yield cursor
+            finally:
+                cursor.close()
+    
+    @classmethod
+    def execute_query(cls, query: str, params: Optional[Union[tuple, Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
         """
         Execute a SELECT query and return results as list of dicts
+        Params may be positional (tuple) or named (dict for :name placeholders)
         """
-        with cls.get_cursor() as cursor:
+        with cls.read_cursor() as cursor:
             if params:
                 cursor.execute(query, params)
             else:
@@ -76,6 +144,25 @@ class DatabaseConnection:
             columns = [description[0] for description in cursor.description]
             return [dict(zip(columns, row)) for row in cursor.fetchall()]
     
+    @classmethod
+    def iter_query(cls, query: str, params: Optional[tuple] = None,
+                   batch_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """
+        Execute a SELECT query and yield rows as dicts, fetchmany() at a time
+        Holds one reader connection until the generator is exhausted or closed,
+        so it can be consumed from any thread (e.g. by a StreamingResponse)
+        without holding every row in memory
+        """
+        with cls.read_cursor() as cursor:
+            cursor.execute(query, params or ())
+            columns = [description[0] for description in cursor.description]
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield dict(zip(columns, row))
+    
     @classmethod
     def execute_update(cls, query: str, params: Optional[tuple] = None) -> int:
         """
@@ -89,6 +176,16 @@ class DatabaseConnection:
                 cursor.execute(query)
             return cursor.rowcount
     
+    @classmethod
+    def execute_many(cls, query: str, seq_of_params: List[tuple]) -> int:
+        """
+        Execute the same INSERT/UPDATE for many parameter sets (executemany)
+        in a single transaction. Returns number of affected rows
+        """
+        with cls.get_cursor() as cursor:
+            cursor.executemany(query, seq_of_params)
+            return cursor.rowcount
+    
     @classmethod
     def execute_insert(cls, query: str, params: Optional[tuple] = None) -> str:
         """
@@ -0,0 +1,108 @@
+"""
+DB Executor
+Operações SQLite fora do event loop, em thread pools dedicados e dimensionados
+
+O sqlite3 é síncrono: uma query chamada diretamente num handler `async def`
+bloqueia o event loop e, com ele, todos os outros pedidos em curso. Os
+handlers async usam esta API (ex: `await db_executor.query(sql)`), que corre
+a operação num ThreadPoolExecutor próprio:
+
+- "default" (DB_EXECUTOR_WORKERS): operações curtas (health, startup, CRUD
+  chamado a partir de código async)
+- "analytics" (DB_ANALYTICS_WORKERS): queries pesadas do Metrics Exporter
+  (/db/query, /db/queries). Com poucos workers nunca ocupam mais do que esse
+  número de conexões de leitura; as restantes ficam livres para o CRUD, que
+  mantém a latência enquanto as queries pesadas correm
+
+Os handlers `def` (síncronos) já correm no threadpool do Starlette, fora do
+event loop.
+"""
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, TypeVar, Union
+from app.core.config import settings
+from app.db.connection import DatabaseConnection as db
+
+
+T = TypeVar("T")
+LANES = ("default", "analytics")
+
+
+class DatabaseExecutor:
+    """Thread pools por tipo de carga e API async sobre o DatabaseConnection"""
+
+    def __init__(self):
+        self._executors: Dict[str, ThreadPoolExecutor] = {}
+        self._submitted = {lane: 0 for lane in LANES}
+        self._in_flight = {lane: 0 for lane in LANES}
+        self._max_in_flight = {lane: 0 for lane in LANES}
+
+    def _workers(self, lane: str) -> int:
+        if lane == "analytics":
+            return settings.DB_ANALYTICS_WORKERS
+        return settings.DB_EXECUTOR_WORKERS
+
+    def _executor(self, lane: str) -> ThreadPoolExecutor:
+        """Criar o pool da lane no primeiro uso (settings podem mudar antes)"""
+        executor = self._executors.get(lane)
+        if executor is None:
+            executor = self._executors[lane] = ThreadPoolExecutor(
+                max_workers=self._workers(lane),
+                thread_name_prefix=f"db-{lane}"
+            )
+        return executor
+
+    async def run(self, func: Callable[..., T], *args: Any, lane: str = "default", **kwargs: Any) -> T:
+        """Correr func(*args, **kwargs) no pool da lane, sem bloquear o event loop"""
+        loop = asyncio.get_running_loop()
+        self._submitted[lane] += 1
+        self._in_flight[lane] += 1
+        self._max_in_flight[lane] = max(self._max_in_flight[lane], self._in_flight[lane])
+        try:
+            return await loop.run_in_executor(
+                self._executor(lane), functools.partial(func, *args, **kwargs)
+            )
+        finally:
+            self._in_flight[lane] -= 1
+
+    # ========================================================================
+    # API ASYNC (espelha DatabaseConnection)
+    # ========================================================================
+
+    async def query(self, sql: str, params: Optional[Union[tuple, Dict[str, Any]]] = None,
+                    lane: str = "default") -> List[Dict[str, Any]]:
+        """SELECT → lista de dicts (DatabaseConnection.execute_query)"""
+        return await self.run(db.execute_query, sql, params, lane=lane)
+
+    # ========================================================================
+    # LIFECYCLE
+    # ========================================================================
+
+    async def shutdown(self) -> None:
+        """
+        Fechar os pools (shutdown): operações em fila são canceladas e as que
+        já estão a correr terminam numa thread, sem bloquear o event loop
+        """
+        executors = list(self._executors.values())
+        self._executors.clear()
+        for executor in executors:
+            executor.shutdown(wait=False, cancel_futures=True)
+        for executor in executors:
+            await asyncio.to_thread(executor.shutdown, wait=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Workers, operações em curso e submetidas por lane"""
+        return {
+            lane: {
+                "workers": self._workers(lane),
+                "in_flight": self._in_flight[lane],
+                "max_in_flight": self._max_in_flight[lane],
+                "submitted": self._submitted[lane]
+            }
+            for lane in LANES
+        }
+
+
+# Singleton instance
+db_executor = DatabaseExecutor()
@@ -0,0 +1,206 @@
+"""
+Schema Migrations
+Atualiza bases de dados existentes para o schema.sql atual (no startup)
+
+O init-db.sh só aplica o schema.sql quando cria a base de dados: volumes
+persistentes criados com versões anteriores ficavam sem as tabelas, colunas
+e triggers novos ("no such table/column"). migrate_schema() é idempotente:
+- tabelas, índices e tabelas virtuais em falta são criados
+- views, triggers e tabelas virtuais cuja definição mudou são recriados
+- colunas novas de tabelas existentes (COLUMNS) são adicionadas com
+  ALTER TABLE, se PRAGMA table_info ainda não as tiver
+- tabelas derivadas criadas agora (rollups de tempo, índice FTS de demos)
+  são preenchidas a partir das tabelas base (BACKFILL)
+- o índice demo_fts é reconstruído se os rowids de demo mudaram (VACUUM)
+Numa base de dados por inicializar (sem tabela admin) não faz nada: o
+init-db.sh aplica o schema completo.
+"""
+import re
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+from app.core.config import settings
+from app.db.connection import DatabaseConnection as db
+
+
+# Colunas acrescentadas a tabelas que já existiam: (tabela, coluna, definição)
+COLUMNS: List[Tuple[str, str, str]] = [
+    ("demo_sessions", "ultimo_heartbeat", "TEXT"),
+]
+
+_SESSAO_CONCLUIDA = "duracao_segundos IS NOT NULL AND timestamp_fim IS NOT NULL"
+
+# Tabela derivada → SQL que a preenche a partir das tabelas base
+BACKFILL: Dict[str, str] = {
+    "rollup_tempo_cliente": f"""
+        INSERT INTO rollup_tempo_cliente (cliente_id, total_sessoes, tempo_total_segundos, ultima_sessao)
+        SELECT cliente_id, COUNT(*), SUM(duracao_segundos), MAX(timestamp_fim)
+        FROM demo_sessions WHERE {_SESSAO_CONCLUIDA}
+        GROUP BY cliente_id
+    """,
+    "rollup_tempo_demo": f"""
+        INSERT INTO rollup_tempo_demo (demo_id, total_sessoes, tempo_total_segundos, ultima_sessao)
+        SELECT demo_id, COUNT(*), SUM(duracao_segundos), MAX(timestamp_fim)
+        FROM demo_sessions WHERE {_SESSAO_CONCLUIDA}
+        GROUP BY demo_id
+    """,
+    "rollup_tempo_cliente_demo": f"""
+        INSERT INTO rollup_tempo_cliente_demo (cliente_id, demo_id, total_sessoes, tempo_total_segundos, ultima_sessao)
+        SELECT cliente_id, demo_id, COUNT(*), SUM(duracao_segundos), MAX(timestamp_fim)
+        FROM demo_sessions WHERE {_SESSAO_CONCLUIDA}
+        GROUP BY cliente_id, demo_id
+    """,
+    "rollup_tempo_dia": f"""
+        INSERT INTO rollup_tempo_dia (data, sessoes, tempo_total_segundos)
+        SELECT date(timestamp_fim), COUNT(*), SUM(duracao_segundos)
+        FROM demo_sessions WHERE {_SESSAO_CONCLUIDA}
+        GROUP BY date(timestamp_fim)
+    """,
+    "rollup_tempo_hora": f"""
+        INSERT INTO rollup_tempo_hora (data, hora, sessoes, tempo_total_segundos)
+        SELECT date(timestamp_inicio), CAST(strftime('%H', timestamp_inicio) AS INTEGER),
+               COUNT(*), SUM(duracao_segundos)
+        FROM demo_sessions WHERE {_SESSAO_CONCLUIDA}
+        GROUP BY date(timestamp_inicio), CAST(strftime('%H', timestamp_inicio) AS INTEGER)
+    """,
+    "demo_fts": "INSERT INTO demo_fts (demo_fts) VALUES ('rebuild')",
+}
+
+_CREATE = re.compile(
+    r"^CREATE\s+(?:UNIQUE\s+)?(?:VIRTUAL\s+)?(TABLE|INDEX|VIEW|TRIGGER)\s+"
+    r"(?:IF\s+NOT\s+EXISTS\s+)?(\w+)",
+    re.IGNORECASE
+)
+_LEADING_COMMENTS = re.compile(r"^(\s*--[^\n]*\n|\s*\n)+")
+
+
+# ============================================================================
+# SCHEMA.SQL
+# ============================================================================
+
+def _schema_path() -> Optional[Path]:
+    """schema.sql do container (/scripts) ou do repositório (desenvolvimento)"""
+    for path in (Path(settings.SCHEMA_PATH), Path(__file__).resolve().parents[2] / "schema.sql"):
+        if path.is_file():
+            return path
+    return None
+
+
+def _statements(script: str) -> Iterator[str]:
+    """Statements completos do script (triggers incluídos), sem comentários iniciais"""
+    buffer = ""
+    for line in script.splitlines(keepends=True):
+        buffer += line
+        if sqlite3.complete_statement(buffer):
+            statement = _LEADING_COMMENTS.sub("", buffer).strip()
+            buffer = ""
+            if statement:
+                yield statement
+
+
+def _normalize(sql: str) -> str:
+    """Comparar definições como o SQLite as guarda (sem IF NOT EXISTS nem ;)"""
+    sql = re.sub(r"\s+", " ", sql).strip().rstrip(";").strip()
+    return re.sub(r"\s+IF\s+NOT\s+EXISTS\s+", " ", sql, flags=re.IGNORECASE).lower()
+
+
+# ============================================================================
+# MIGRAÇÃO
+# ============================================================================
+
+def _add_columns(conn: sqlite3.Connection) -> List[str]:
+    adicionadas = []
+    for tabela, coluna, definicao in COLUMNS:
+        colunas = {row[1] for row in conn.execute(f"PRAGMA table_info({tabela})")}
+        if colunas and coluna not in colunas:
+            conn.execute(f"ALTER TABLE {tabela} ADD COLUMN {coluna} {definicao}")
+            adicionadas.append(f"{tabela}.{coluna}")
+    return adicionadas
+
+
+def _apply_schema(conn: sqlite3.Connection, script: str) -> Tuple[List[str], List[str]]:
+    """Criar objetos em falta e recriar os alterados; devolve (criados, recriados)"""
+    existentes = {
+        name: (tipo, sql or "")
+        for name, tipo, sql in conn.execute("SELECT name, type, sql FROM sqlite_master")
+    }
+    criados, recriados = [], []
+
+    for statement in _statements(script):
+        if statement.upper().startswith("PRAGMA"):
+            continue
+        match = _CREATE.match(statement)
+        if match is None:
+            # Ex: INSERT OR IGNORE das linhas base de table_versions
+            conn.execute(statement)
+            continue
+
+        tipo, nome = match.group(1).lower(), match.group(2)
+        atual = existentes.get(nome)
+        if atual is not None:
+            virtual = statement.upper().startswith("CREATE VIRTUAL")
+            # Tabelas normais e índices ficam como estão (colunas via COLUMNS)
+            if tipo in ("table", "index") and not virtual:
+                continue
+            if _normalize(atual[1]) == _normalize(statement):
+                continue
+            conn.execute(f"DROP {'TABLE' if virtual else tipo.upper()} {nome}")
+            recriados.append(nome)
+        else:
+            criados.append(nome)
+        conn.execute(statement)
+
+    return criados, recriados
+
+
+def _fts_stale(conn: sqlite3.Connection) -> bool:
+    """
+    demo_fts (conteúdo externo) indexa rowids que já não são os de demo?
+    O VACUUM renumera os rowids de tabelas sem INTEGER PRIMARY KEY
+    """
+    existe = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = 'demo_fts_docsize'"
+    ).fetchone()
+    if not existe:
+        return False
+    diferentes = conn.execute("""
+        SELECT EXISTS (SELECT id FROM demo_fts_docsize EXCEPT SELECT rowid FROM demo)
+            OR EXISTS (SELECT rowid FROM demo EXCEPT SELECT id FROM demo_fts_docsize)
+    """).fetchone()[0]
+    return bool(diferentes)
+
+
+def migrate_schema() -> Dict[str, List[str]]:
+    """
+    Aplicar ao DB_PATH o que falta do schema.sql (ver docstring do módulo)
+    Corre numa única transação; devolve o que foi alterado
+    """
+    path = _schema_path()
+    if path is None:
+        raise FileNotFoundError(f"schema.sql não encontrado ({settings.SCHEMA_PATH})")
+    script = path.read_text(encoding="utf-8")
+
+    with db.connection() as conn:
+        inicializada = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'admin'"
+        ).fetchone()
+        if not inicializada:
+            return {}
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            colunas = _add_columns(conn)
+            criados, recriados = _apply_schema(conn, script)
+            preenchidos = [nome for nome in BACKFILL if nome in criados or nome in recriados]
+            if "demo_fts" not in preenchidos and _fts_stale(conn):
+                preenchidos.append("demo_fts")
+            for nome in preenchidos:
+                conn.execute(BACKFILL[nome])
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    alteracoes = {"colunas": colunas, "criados": criados, "recriados": recriados,
+                  "preenchidos": preenchidos}
+    return {k: v for k, v in alteracoes.items() if v}
@@ -0,0 +1,102 @@
+"""
+Keyset (cursor) Pagination
+Páginas ordenadas por (coluna, id) com cursores opacos
+
+O cursor codifica os valores de ordenação da última linha devolvida; a
+página seguinte é obtida com uma comparação de row values, p.ex.
+(timestamp, id) < (?, ?), que usa os índices existentes em vez de OFFSET.
+Custo por página constante, independentemente da posição na tabela.
+"""
+import base64
+import json
+from typing import Any, Dict, Generic, List, Optional, Sequence, TypeVar
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+from app.db.connection import DatabaseConnection as db
+
+
+T = TypeVar("T")
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 1000
+
+
+class Page(BaseModel, Generic[T]):
+    """Página de resultados + cursor para a página seguinte (None no fim)"""
+    items: List[T]
+    next_cursor: Optional[str] = None
+    limit: int
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Codificar valores de ordenação num cursor opaco (base64 url-safe)"""
+    raw = json.dumps(list(values), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """Descodificar cursor; 400 se for inválido"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception:
+        values = None
+    
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor inválido"
+        )
+    return values
+
+
+def fetch_page(
+    select: str,
+    keys: Sequence[str],
+    fields: Sequence[str],
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    descending: bool = False,
+    where: Optional[str] = None,
+    params: Sequence[Any] = ()
+) -> Dict[str, Any]:
+    """
+    Executar uma query paginada por keyset
+    
+    Args:
+        select: SELECT ... FROM ... (sem WHERE/ORDER BY/LIMIT)
+        keys: colunas SQL de ordenação, a última deve ser única (ex: "l.id")
+        fields: nomes dessas colunas nas linhas devolvidas
+        cursor: cursor devolvido pela página anterior
+        limit: tamanho da página
+        descending: ordem decrescente (ex: logs mais recentes primeiro)
+        where: condição adicional (opcional)
+        params: parâmetros da condição adicional
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    conditions = [f"({where})"] if where else []
+    query_params = list(params)
+    
+    if cursor:
+        values = decode_cursor(cursor, len(keys))
+        op = "<" if descending else ">"
+        placeholders = ", ".join("?" for _ in keys)
+        conditions.append(f"({', '.join(keys)}) {op} ({placeholders})")
+        query_params += values
+    
+    direction = "DESC" if descending else "ASC"
+    query = select
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += " ORDER BY " + ", ".join(f"{k} {direction}" for k in keys)
+    query += " LIMIT ?"
+    query_params.append(limit + 1)  # +1 para saber se existe página seguinte
+    
+    rows = db.execute_query(query, tuple(query_params))
+    
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([rows[-1][f] for f in fields])
+    
+    return {"items": rows, "next_cursor": next_cursor, "limit": limit}
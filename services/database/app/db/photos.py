@@ -0,0 +1,197 @@
+"""
+Demo Photos
+Fotos de comerciais fora da tabela demo, endereçadas pelo conteúdo (sha256)
+
+O frontend envia a foto como data URI Base64 em comercial_foto_url. Em vez
+de guardar esse texto (centenas de KB) em cada linha de demo, o conteúdo é
+guardado em demo_foto e a coluna fica com PHOTO_URL_PREFIX + hash. As listas
+de demos deixam de transportar imagens e a foto é servida à parte, com cache
+imutável (o conteúdo de um hash nunca muda).
+
+A foto é escrita na mesma transação que a demo; ao substituir a foto ou
+apagar a demo, a foto antiga é apagada se nenhuma outra demo a usar.
+
+Só são aceites imagens raster (PHOTO_TYPES), verificadas pelos magic bytes
+e não apenas pelo tipo declarado: a foto é servida a partir da origem da
+API, e um SVG (ou HTML disfarçado) com script executaria ao abrir o URL.
+"""
+import base64
+import binascii
+import hashlib
+import re
+import sqlite3
+from typing import Any, Dict, Optional, Tuple
+from fastapi import HTTPException, status
+from app.core.config import settings
+from app.db.connection import DatabaseConnection as db
+
+
+# (hash, content_type, dados) de uma foto por guardar
+Photo = Tuple[str, str, bytes]
+
+DATA_URI = re.compile(r"^data:(image/[\w.+-]+);base64,(.*)$", re.DOTALL)
+PHOTO_HASH = re.compile(r"^[0-9a-f]{64}$")
+
+# Tipos aceites (image/jpg é um alias comum de image/jpeg)
+PHOTO_TYPES = {"image/png", "image/jpeg", "image/webp", "image/gif"}
+TYPE_ALIASES = {"image/jpg": "image/jpeg", "image/pjpeg": "image/jpeg"}
+
+
+def sniff_image_type(dados: bytes) -> Optional[str]:
+    """Tipo raster pelos magic bytes (None se não for PNG/JPEG/WebP/GIF)"""
+    if dados.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if dados.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if dados.startswith((b"GIF87a", b"GIF89a")):
+        return "image/gif"
+    if dados[:4] == b"RIFF" and dados[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+
+def parse_data_uri(value: str) -> Optional[Tuple[str, bytes]]:
+    """
+    data:image/...;base64,... → (content_type, bytes); None se não for data URI
+    O tipo declarado tem de ser raster e coincidir com o conteúdo
+    """
+    match = DATA_URI.match(value)
+    if match is None:
+        return None
+    try:
+        dados = base64.b64decode(match.group(2), validate=True)
+    except (binascii.Error, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Foto inválida: Base64 mal formado"
+        )
+    if not dados:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Foto inválida: sem conteúdo"
+        )
+    if len(dados) > settings.PHOTO_MAX_BYTES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Foto demasiado grande (máximo {settings.PHOTO_MAX_BYTES} bytes)"
+        )
+    declarado = match.group(1).lower()
+    declarado = TYPE_ALIASES.get(declarado, declarado)
+    if declarado not in PHOTO_TYPES or sniff_image_type(dados) != declarado:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Foto inválida: só são aceites imagens PNG, JPEG, WebP ou GIF"
+        )
+    return declarado, dados
+
+
+def prepare_photo(value: Optional[str]) -> Tuple[Optional[str], Optional[Photo]]:
+    """
+    Validar a foto antes da escrita: (valor para comercial_foto_url, foto)
+    Valores que não são data URI (URLs, None) ficam sem alterações e sem foto
+    """
+    if not value:
+        return value, None
+    parsed = parse_data_uri(value)
+    if parsed is None:
+        return value, None
+
+    content_type, dados = parsed
+    photo_hash = hashlib.sha256(dados).hexdigest()
+    return f"{settings.PHOTO_URL_PREFIX}{photo_hash}", (photo_hash, content_type, dados)
+
+
+def save_photo(cursor: sqlite3.Cursor, photo: Optional[Photo]) -> None:
+    """Guardar a foto em demo_foto, na transação da escrita da demo"""
+    if photo is None:
+        return
+    photo_hash, content_type, dados = photo
+    cursor.execute(
+        """
+        INSERT OR IGNORE INTO demo_foto (hash, content_type, tamanho, dados)
+        VALUES (?, ?, ?, ?)
+        """,
+        (photo_hash, content_type, len(dados), dados)
+    )
+
+
+def delete_unused_photo(cursor: sqlite3.Cursor, url: Optional[str]) -> int:
+    """
+    Apagar a foto de um URL antigo se nenhuma demo a referenciar
+    Chamado na transação que substitui a foto ou apaga a demo
+    """
+    if not url or not url.startswith(settings.PHOTO_URL_PREFIX):
+        return 0
+    cursor.execute(
+        """
+        DELETE FROM demo_foto
+        WHERE hash = ? AND NOT EXISTS (SELECT 1 FROM demo WHERE comercial_foto_url = ?)
+        """,
+        (url[len(settings.PHOTO_URL_PREFIX):], url)
+    )
+    return cursor.rowcount
+
+
+def get_photo(photo_hash: str) -> Optional[Dict[str, Any]]:
+    """
+    Foto por hash (None se não existir)
+    Conteúdo guardado antes da validação que não seja raster também não é
+    servido; o content_type vem dos magic bytes
+    """
+    if not PHOTO_HASH.match(photo_hash):
+        return None
+    rows = db.execute_query(
+        "SELECT hash, content_type, tamanho, dados FROM demo_foto WHERE hash = ?",
+        (photo_hash,)
+    )
+    if not rows:
+        return None
+    photo = rows[0]
+    content_type = sniff_image_type(photo["dados"])
+    if content_type is None:
+        return None
+    return {**photo, "content_type": content_type}
+
+
+def migrate_inline_photos() -> int:
+    """
+    Mover fotos Base64 ainda guardadas em demo para demo_foto (idempotente)
+    Devolve o número de demos atualizadas
+    """
+    rows = db.execute_query(
+        "SELECT id, comercial_foto_url FROM demo WHERE comercial_foto_url LIKE 'data:%'"
+    )
+    migradas = 0
+    for row in rows:
+        try:
+            url, photo = prepare_photo(row["comercial_foto_url"])
+        except HTTPException:
+            continue  # conteúdo inválido: fica como está (e fora das listas)
+        if photo is None:
+            continue
+        with db.get_cursor() as cursor:
+            save_photo(cursor, photo)
+            cursor.execute(
+                "UPDATE demo SET comercial_foto_url = ? WHERE id = ?",
+                (url, row["id"])
+            )
+            migradas += cursor.rowcount
+    return migradas
+
+
+def delete_orphan_photos() -> int:
+    """
+    Apagar fotos que nenhuma demo referencia (ex: deixadas por versões
+    anteriores, que guardavam a foto antes de escrever a demo)
+    """
+    prefixo = settings.PHOTO_URL_PREFIX
+    return db.execute_update(
+        """
+        DELETE FROM demo_foto
+        WHERE hash NOT IN (
+            SELECT substr(comercial_foto_url, ?) FROM demo
+            WHERE substr(comercial_foto_url, 1, ?) = ?
+        )
+        """,
+        (len(prefixo) + 1, len(prefixo), prefixo)
+    )
@@ -0,0 +1,220 @@
+"""
+SQLite Connection Pool
+Pool bounded de conexões com checkout timeout e health check
+"""
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+
+class PoolTimeout(Exception):
+    """Nenhuma conexão ficou livre dentro do checkout timeout"""
+
+
+# Códigos primários SQLite que podem deixar a conexão inutilizável
+FATAL_ERROR_CODES = frozenset({
+    sqlite3.SQLITE_CORRUPT,
+    sqlite3.SQLITE_NOTADB,
+    sqlite3.SQLITE_IOERR,
+    sqlite3.SQLITE_CANTOPEN,
+    sqlite3.SQLITE_FULL,
+    sqlite3.SQLITE_NOMEM,
+})
+
+
+def is_connection_error(exc: sqlite3.DatabaseError) -> bool:
+    """
+    Erro que pode deixar a conexão inutilizável (descartá-la)?
+
+    Decide pelo código SQLite (sqlite_errorcode, Python 3.11+). Erros de
+    SQL ("no such table", sintaxe), UNIQUE/FK, "database is locked" ou
+    "readonly database" deixam a conexão válida: descartá-la só obrigaria a
+    reabrir (PRAGMAs, mmap, cache de statements). Só corrupção, I/O, disco
+    cheio, etc. justificam fechar a conexão.
+    """
+    code = getattr(exc, "sqlite_errorcode", None)
+    return code is not None and (code & 0xFF) in FATAL_ERROR_CODES
+
+
+class ConnectionPool:
+    """
+    Pool bounded de conexões SQLite
+
+    - Cria conexões on demand até `size`; depois os pedidos esperam até `timeout`
+    - LIFO: reutiliza a conexão mais recente (cache de páginas quente)
+    - Conexões paradas há mais de `health_check_interval` segundos são
+      validadas com SELECT 1 antes de serem entregues (e recriadas se falharem)
+    - Capacidade controlada por uma Condition: uma conexão devolvida ou
+      descartada acorda um pedido em espera (que reutiliza ou cria outra)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        factory: Callable[[], sqlite3.Connection],
+        size: int,
+        timeout: float,
+        health_check_interval: float
+    ):
+        self.name = name
+        self.size = size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self._factory = factory
+        # Conexões livres (LIFO: a última devolvida é a primeira entregue)
+        self._idle: List[Tuple[sqlite3.Connection, float]] = []
+        self._cond = threading.Condition()
+        self._created = 0
+        self._in_use = 0
+        self._closed = False
+
+        self.checkouts = 0
+        self.waits = 0
+        self.wait_time = 0.0
+        self.timeouts = 0
+        self.health_check_failures = 0
+        self.max_in_use = 0
+
+    # ========================================================================
+    # CHECKOUT / CHECKIN
+    # ========================================================================
+
+    def acquire(self) -> sqlite3.Connection:
+        """Obter conexão (cria nova se houver espaço, senão espera)"""
+        limite = time.monotonic() + self.timeout
+        while True:
+            conn, last_used = self._checkout(limite)
+            if self._check(conn, last_used):
+                break
+
+        with self._cond:
+            self.checkouts += 1
+            self._in_use += 1
+            self.max_in_use = max(self.max_in_use, self._in_use)
+        return conn
+
+    def release(self, conn: sqlite3.Connection, discard: bool = False) -> None:
+        """Devolver conexão ao pool (discard=True fecha-a e liberta o lugar)"""
+        with self._cond:
+            self._in_use -= 1
+
+        if not discard and not self._closed:
+            try:
+                # Nunca devolver uma transação a meio ao pool
+                if conn.in_transaction:
+                    conn.rollback()
+            except sqlite3.Error:
+                pass
+            else:
+                with self._cond:
+                    self._idle.append((conn, time.monotonic()))
+                    self._cond.notify()
+                return
+
+        self._discard(conn)
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Context manager: acquire + release"""
+        conn = self.acquire()
+        discard = False
+        try:
+            yield conn
+        except sqlite3.DatabaseError as e:
+            # Só erros que podem deixar a conexão num estado inválido
+            discard = is_connection_error(e)
+            raise
+        finally:
+            self.release(conn, discard=discard)
+
+    def _checkout(self, limite: float) -> Tuple[sqlite3.Connection, float]:
+        """Conexão livre, ou nova se houver lugar; senão esperar até `limite`"""
+        inicio = time.monotonic()
+        esperou = False
+        with self._cond:
+            try:
+                while True:
+                    if self._closed:
+                        raise PoolTimeout(f"Pool {self.name} está fechado")
+                    if self._idle:
+                        return self._idle.pop()
+                    if self._created < self.size:
+                        self._created += 1
+                        break
+                    restante = limite - time.monotonic()
+                    if restante <= 0:
+                        self.timeouts += 1
+                        raise PoolTimeout(
+                            f"Nenhuma conexão {self.name} livre após {self.timeout}s "
+                            f"({self.size} em uso)"
+                        )
+                    esperou = True
+                    self._cond.wait(restante)
+            finally:
+                if esperou:
+                    self.waits += 1
+                    self.wait_time += time.monotonic() - inicio
+
+        # Lugar reservado: criar a conexão fora do lock
+        try:
+            return self._factory(), time.monotonic()
+        except Exception:
+            self._free_slot()
+            raise
+
+    def _check(self, conn: sqlite3.Connection, last_used: float) -> bool:
+        """Health check de conexões paradas há muito tempo (False = descartada)"""
+        if time.monotonic() - last_used < self.health_check_interval:
+            return True
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            with self._cond:
+                self.health_check_failures += 1
+            self._discard(conn)
+            return False
+
+    def _free_slot(self) -> None:
+        """Libertar um lugar e acordar um pedido em espera (pode criar outra)"""
+        with self._cond:
+            self._created -= 1
+            self._cond.notify()
+
+    def _discard(self, conn: sqlite3.Connection) -> None:
+        self._free_slot()
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    # ========================================================================
+    # LIFECYCLE / STATS
+    # ========================================================================
+
+    def close(self) -> None:
+        """Fechar todas as conexões livres (as em uso fecham ao ser devolvidas)"""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            # Pedidos em espera falham de imediato
+            self._cond.notify_all()
+        for conn, _ in idle:
+            self._discard(conn)
+
+    def stats(self) -> Dict[str, Any]:
+        """Métricas do pool"""
+        return {
+            "size": self.size,
+            "created": self._created,
+            "in_use": self._in_use,
+            "idle": len(self._idle),
+            "max_in_use": self.max_in_use,
+            "checkouts": self.checkouts,
+            "waits": self.waits,
+            "avg_wait_ms": round(self.wait_time / self.waits * 1000, 3) if self.waits else 0.0,
+            "timeouts": self.timeouts,
+            "health_check_failures": self.health_check_failures
+        }
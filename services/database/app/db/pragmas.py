@@ -0,0 +1,86 @@
+"""
+SQLite Tuning Profiles
+PRAGMAs aplicados a cada nova conexão (ver DatabaseConnection._connect)
+"""
+import sqlite3
+from typing import Any, Dict, Optional, Union
+from app.core.config import settings
+
+
+PragmaValue = Union[int, str]
+
+
+# ============================================================================
+# PROFILES
+# ============================================================================
+
+# journal_mode vem primeiro: synchronous=NORMAL só é seguro em WAL
+PROFILES: Dict[str, Dict[str, PragmaValue]] = {
+    # Durabilidade máxima: fsync em cada commit, defaults do SQLite para memória
+    "safe": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "cache_size": -2000,        # ~2 MB
+        "temp_store": "DEFAULT",
+        "mmap_size": 0,
+    },
+    # Produção: em WAL, NORMAL só pode perder os últimos commits num crash do SO
+    "balanced": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -16000,       # ~16 MB
+        "temp_store": "MEMORY",
+        "mmap_size": 67108864,      # 64 MB
+    },
+    # Cargas em massa / benchmarks: sem fsync (pode corromper num crash do SO)
+    "fast": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "cache_size": -64000,       # ~64 MB
+        "temp_store": "MEMORY",
+        "mmap_size": 268435456,     # 256 MB
+    },
+}
+
+# PRAGMAs aceites em overrides (os nomes não podem ser parametrizados em SQL)
+ALLOWED_PRAGMAS = {
+    "journal_mode", "synchronous", "cache_size", "temp_store",
+    "mmap_size", "busy_timeout", "wal_autocheckpoint", "journal_size_limit",
+}
+
+
+def profile_pragmas(profile: Optional[str] = None) -> Dict[str, PragmaValue]:
+    """
+    PRAGMAs efetivos: profile + busy_timeout (SQLITE_TIMEOUT) + overrides
+    """
+    profile = profile or settings.SQLITE_PROFILE
+    if profile not in PROFILES:
+        raise ValueError(f"Profile SQLite desconhecido: {profile}")
+
+    pragmas: Dict[str, PragmaValue] = dict(PROFILES[profile])
+    pragmas["busy_timeout"] = settings.SQLITE_TIMEOUT
+    pragmas.update(settings.SQLITE_PRAGMA_OVERRIDES)
+
+    unknown = set(pragmas) - ALLOWED_PRAGMAS
+    if unknown:
+        raise ValueError(f"PRAGMA não suportado: {', '.join(sorted(unknown))}")
+
+    return pragmas
+
+
+def apply_pragmas(connection: sqlite3.Connection,
+                  pragmas: Optional[Dict[str, PragmaValue]] = None) -> None:
+    """Aplicar PRAGMAs a uma conexão"""
+    for name, value in (pragmas or profile_pragmas()).items():
+        if isinstance(value, str) and not value.isalnum():
+            raise ValueError(f"Valor inválido para PRAGMA {name}: {value}")
+        connection.execute(f"PRAGMA {name} = {value}")
+
+
+def pragma_report(connection: sqlite3.Connection) -> Dict[str, Any]:
+    """Ler os valores efetivos dos PRAGMAs geridos (para logs de arranque / health)"""
+    report = {}
+    for name in sorted(ALLOWED_PRAGMAS | {"foreign_keys"}):
+        row = connection.execute(f"PRAGMA {name}").fetchone()
+        report[name] = row[0] if row else None
+    return report
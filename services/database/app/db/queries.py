@@ -0,0 +1,270 @@
+"""
+Named Query Registry
+Queries analíticas parametrizadas, chamadas pelo nome (GET /db/queries/{name})
+
+- O SQL é fixo por nome: o statement cache do sqlite3 (cached_statements)
+  reutiliza o statement compilado em cada conexão em vez de o recompilar
+- Os parâmetros são named (:nome) e validados/convertidos antes da execução
+- Resultados em cache com TTL, por (nome, parâmetros)
+- Estatísticas de tempo por query
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+from fastapi import HTTPException, status
+from app.core.config import settings
+from app.db.connection import DatabaseConnection as db
+
+
+REQUIRED = object()
+
+
+class NamedQuery:
+    """
+    Query registada: SQL com parâmetros :nome, tipos/defaults e TTL do resultado
+    """
+
+    def __init__(
+        self,
+        sql: str,
+        params: Optional[Dict[str, Tuple[Callable[[Any], Any], Any]]] = None,
+        ttl: Optional[float] = None,
+        description: str = ""
+    ):
+        self.sql = sql
+        self.params = params or {}
+        self.ttl = settings.QUERY_CACHE_TTL if ttl is None else ttl
+        self.description = description
+
+        self.calls = 0
+        self.cache_hits = 0
+        self.executions = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.rows = 0
+
+    def bind(self, raw: Dict[str, Any]) -> Dict[str, Any]:
+        """Validar e converter parâmetros recebidos (400 se inválidos)"""
+        unknown = set(raw) - set(self.params)
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Parâmetros desconhecidos: {', '.join(sorted(unknown))}"
+            )
+
+        bound = {}
+        for name, (convert, default) in self.params.items():
+            if name not in raw:
+                if default is REQUIRED:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail=f"Parâmetro obrigatório em falta: {name}"
+                    )
+                bound[name] = default
+                continue
+            try:
+                bound[name] = convert(raw[name])
+            except (TypeError, ValueError):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Valor inválido para {name}: {raw[name]}"
+                )
+        return bound
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "params": sorted(self.params),
+            "ttl": self.ttl,
+            "calls": self.calls,
+            "cache_hits": self.cache_hits,
+            "executions": self.executions,
+            "avg_ms": round(self.total_time / self.executions * 1000, 3) if self.executions else 0.0,
+            "max_ms": round(self.max_time * 1000, 3),
+            "avg_rows": round(self.rows / self.executions, 1) if self.executions else 0.0
+        }
+
+
+def positive_int(value: Any) -> int:
+    value = int(value)
+    if value < 1:
+        raise ValueError(value)
+    return value
+
+
+# ============================================================================
+# REGISTRY
+# ============================================================================
+
+# As queries de tempo leem os rollups mantidos por triggers em demo_sessions
+# (ver schema.sql), pelo que o custo não cresce com o histórico de sessões
+QUERIES: Dict[str, NamedQuery] = {
+    "tempo_overview": NamedQuery(
+        """
+        SELECT
+            COALESCE(SUM(total_sessoes), 0) as total_sessoes,
+            COALESCE(SUM(tempo_total_segundos), 0) as tempo_total_segundos,
+            COALESCE((SELECT sessoes FROM rollup_tempo_dia
+                      WHERE data = date('now')), 0) as sessoes_hoje,
+            COALESCE((SELECT tempo_total_segundos FROM rollup_tempo_dia
+                      WHERE data = date('now')), 0) as tempo_hoje_segundos
+        FROM rollup_tempo_cliente
+        """,
+        description="Totais de sessões concluídas (global e hoje)"
+    ),
+    "tempo_por_cliente": NamedQuery(
+        """
+        SELECT
+            v.*,
+            (SELECT COUNT(*) FROM rollup_tempo_cliente) as total_clientes
+        FROM view_tempo_por_cliente v
+        ORDER BY v.tempo_total_segundos DESC
+        LIMIT :limit
+        """,
+        params={"limit": (positive_int, 10)},
+        description="Top clientes por tempo total de utilização"
+    ),
+    "tempo_por_demo": NamedQuery(
+        """
+        SELECT
+            v.*,
+            (SELECT COUNT(*) FROM rollup_tempo_demo) as total_demos
+        FROM view_tempo_por_demo v
+        ORDER BY v.tempo_total_segundos DESC
+        LIMIT :limit
+        """,
+        params={"limit": (positive_int, 10)},
+        description="Top demos por tempo total de utilização"
+    ),
+    "tempo_cliente_demo": NamedQuery(
+        """
+        SELECT * FROM view_tempo_cliente_demo
+        WHERE cliente_id = :cliente_id
+        ORDER BY tempo_total_segundos DESC
+        """,
+        params={"cliente_id": (str, REQUIRED)},
+        description="Tempo de um cliente em cada demo"
+    ),
+    "sessoes_ativas": NamedQuery(
+        "SELECT * FROM view_sessoes_ativas ORDER BY timestamp_inicio",
+        ttl=5.0,
+        description="Sessões abertas (sem fim)"
+    ),
+    "tempo_por_dia": NamedQuery(
+        """
+        SELECT
+            data,
+            sessoes,
+            tempo_total_segundos,
+            ROUND(tempo_total_segundos / 60.0, 2) as tempo_total_minutos,
+            ROUND(tempo_total_segundos / 60.0 / sessoes, 2) as duracao_media_minutos
+        FROM rollup_tempo_dia
+        WHERE data >= date('now', '-' || :dias || ' days')
+        ORDER BY data DESC
+        """,
+        params={"dias": (positive_int, 7)},
+        description="Tempo de utilização por dia nos últimos N dias"
+    ),
+    "heatmap_utilizacao": NamedQuery(
+        """
+        SELECT
+            CAST(strftime('%w', data) AS INTEGER) as dia_semana,
+            hora,
+            SUM(sessoes) as sessoes,
+            ROUND(SUM(tempo_total_segundos) / 60.0, 2) as tempo_total_minutos
+        FROM rollup_tempo_hora
+        WHERE data >= date('now', '-' || :dias || ' days')
+        GROUP BY dia_semana, hora
+        ORDER BY dia_semana, hora
+        """,
+        params={"dias": (positive_int, 30)},
+        description="Sessões por dia da semana e hora"
+    ),
+}
+
+
+# ============================================================================
+# EXECUÇÃO + CACHE
+# ============================================================================
+
+class QueryResultCache:
+    """Cache LRU com TTL por entrada, partilhado entre threads"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[List[Dict[str, Any]]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, rows = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return rows
+
+    def set(self, key: Hashable, rows: List[Dict[str, Any]], ttl: float) -> None:
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, rows)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+result_cache = QueryResultCache(settings.QUERY_CACHE_MAX_ENTRIES)
+
+
+def get_query(name: str) -> NamedQuery:
+    query = QUERIES.get(name)
+    if query is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Query {name} não encontrada"
+        )
+    return query
+
+
+def run_query(name: str, raw_params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Executar query registada (ou devolver resultado em cache)"""
+    query = get_query(name)
+    params = query.bind(raw_params)
+    key = (name, tuple(sorted(params.items())))
+
+    query.calls += 1
+    rows = result_cache.get(key)
+    if rows is not None:
+        query.cache_hits += 1
+        return rows
+
+    inicio = time.perf_counter()
+    rows = db.execute_query(query.sql, params)
+    duracao = time.perf_counter() - inicio
+
+    query.executions += 1
+    query.total_time += duracao
+    query.max_time = max(query.max_time, duracao)
+    query.rows += len(rows)
+
+    result_cache.set(key, rows, query.ttl)
+    return rows
+
+
+def query_stats() -> Dict[str, Any]:
+    """Estatísticas por query + estado do cache"""
+    return {
+        "queries": {name: query.stats() for name, query in QUERIES.items()},
+        "cache_entries": len(result_cache)
+    }
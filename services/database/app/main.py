@@ -2,12 +2,21 @@
 Database Service - Mini API FastAPI
 Fornece endpoints CRUD internos para o serviço Catalog
 """
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 from app.core.config import settings
+from app.core.idempotency import IdempotencyMiddleware, idempotency_store
+from ecatalog_shared.telemetry import TelemetryMiddleware, metrics_response
 from app.api import admin
 from fastapi import HTTPException
 from app.db.connection import DatabaseConnection as db
+from app.db.executor import db_executor
+from app.db.pool import PoolTimeout
+from app.db.migrations import migrate_schema
+from app.db.photos import delete_orphan_photos, migrate_inline_photos
+from app.db.pragmas import pragma_report
 
 
 app = FastAPI(
@@ -15,7 +24,18 @@ app = FastAPI(
     description="Mini API interna para acesso à base de dados SQLite",
     version=settings.VERSION,
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse
+)
+
+# Repetições de escritas com a mesma Idempotency-Key (retries do Catalog)
+app.add_middleware(IdempotencyMiddleware)
+
+# Compressão (dentro da telemetria, para esta medir bytes enviados)
+app.add_middleware(
+    GZipMiddleware,
+    minimum_size=settings.GZIP_MINIMUM_SIZE,
+    compresslevel=settings.GZIP_COMPRESS_LEVEL
 )
 
 # CORS (interno, mas deixamos aberto para desenvolvimento)
@@ -27,6 +47,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Latência por rota, pedidos em curso e tamanho das respostas (/metrics)
+app.add_middleware(TelemetryMiddleware)
+
+
+@app.exception_handler(PoolTimeout)
+async def pool_timeout_handler(request: Request, exc: PoolTimeout):
+    """Pool de conexões esgotado → 503 (o cliente pode tentar de novo)"""
+    return JSONResponse(status_code=503, content={"detail": str(exc)})
+
 
 # ============================================================================
 # HEALTH CHECK
@@ -35,18 +64,20 @@ app.add_middleware(
 @app.get("/health")
 async def health():
     """Health check endpoint"""
-    from app.db.connection import DatabaseConnection as db
-    
     try:
-        # Testar conexão à database
-        result = db.execute_query("SELECT 1 as test")
+        # Testar conexão à database (fora do event loop)
+        result = await db_executor.query("SELECT 1 as test")
         
         return {
             "status": "healthy",
             "service": settings.SERVICE_NAME,
             "version": settings.VERSION,
             "database": "connected",
-            "db_path": settings.DB_PATH
+            "db_path": settings.DB_PATH,
+            "sqlite_profile": settings.SQLITE_PROFILE,
+            "pool": db.pool_stats(),
+            "executor": db_executor.stats(),
+            "idempotency": idempotency_store.stats()
         }
     except Exception as e:
         return {
@@ -58,6 +89,18 @@ async def health():
         }
 
 
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Métricas de performance em formato Prometheus"""
+    return metrics_response()
+
+
+@app.get("/db/pool")
+async def pool_stats():
+    """Métricas do pool de conexões (writer + readers) e do executor"""
+    return {**db.pool_stats(), "executor": db_executor.stats()}
+
+
 @app.get("/")
 async def root():
     """Root endpoint"""
@@ -75,7 +118,7 @@ async def root():
 # INCLUIR ROUTERS
 # ============================================================================
 
-from app.api import clientes, demos, pedidos, logs, views
+from app.api import clientes, demos, pedidos, logs, views, queries, sessions, versions, identity
 
 # Admin endpoints
 app.include_router(
@@ -119,11 +162,44 @@ app.include_router(
     tags=["Views"]
 )
 
+# Sessões de demos (métricas de tempo)
+app.include_router(
+    sessions.router,
+    prefix="/db/sessions",
+    tags=["Sessions"]
+)
+
+# Queries analíticas registadas (por nome)
+app.include_router(
+    queries.router,
+    prefix="/db/queries",
+    tags=["Queries"]
+)
+
+# Versões das tabelas (invalidação de caches)
+app.include_router(
+    versions.router,
+    prefix="/db/versions",
+    tags=["Versions"]
+)
+
+# Resolução de identidade no login (Authentication, via Catalog)
+app.include_router(
+    identity.router,
+    prefix="/db/identity",
+    tags=["Identity"]
+)
+
 
 # ============================================================================
 # STARTUP/SHUTDOWN
 # ============================================================================
 
+def _read_pragmas():
+    with db.connection() as conn:
+        return pragma_report(conn)
+
+
 @app.on_event("startup")
 async def startup_event():
     print("=" * 60)
@@ -133,14 +209,38 @@ async def startup_event():
     print(f"🌍 Environment: {settings.ENVIRONMENT}")
     print(f"📍 Port: {settings.DATABASE_PORT}")
     print(f"💾 Database: {settings.DB_PATH}")
+    try:
+        # Volumes criados com um schema.sql anterior (antes das fotos, que
+        # precisam da tabela demo_foto)
+        alteracoes = await db_executor.run(migrate_schema)
+        for tipo, nomes in alteracoes.items():
+            print(f"🧱 Schema migrado ({tipo}): {', '.join(nomes)}")
+    except Exception as e:
+        print(f"⚠️  Não foi possível migrar o schema: {e}")
+    try:
+        pragmas = await db_executor.run(_read_pragmas)
+        print(f"⚙️  SQLite profile: {settings.SQLITE_PROFILE}")
+        print("   " + ", ".join(f"{k}={v}" for k, v in pragmas.items()))
+    except Exception as e:
+        print(f"⚠️  Não foi possível ler PRAGMAs: {e}")
+    try:
+        migradas = await db_executor.run(migrate_inline_photos)
+        if migradas:
+            print(f"🖼️  Fotos Base64 movidas para demo_foto: {migradas}")
+        orfas = await db_executor.run(delete_orphan_photos)
+        if orfas:
+            print(f"🖼️  Fotos sem demo apagadas: {orfas}")
+    except Exception as e:
+        print(f"⚠️  Não foi possível migrar fotos inline: {e}")
     print(f"📖 Docs: http://localhost:{settings.DATABASE_PORT}/docs")
     print("=" * 60)
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
-    from app.db.connection import DatabaseConnection
-    DatabaseConnection.close_connection()
+    # Esperar pelas operações em curso antes de fechar as conexões
+    await db_executor.shutdown()
+    db.close_connection()
     print("🛑 Database Service Stopped")
 
 
@@ -149,8 +249,9 @@ async def execute_query(sql: str):
     """Endpoint genérico para queries SQL - usado pelo Metrics Exporter"""
     
     try:
-        # Executar query usando o DatabaseConnection existente
-        results = db.execute_query(sql)
+        # Pool "analytics": queries pesadas não bloqueiam o event loop nem
+        # ocupam todas as conexões de leitura
+        results = await db_executor.query(sql, lane="analytics")
         return results
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
\ No newline at end of file
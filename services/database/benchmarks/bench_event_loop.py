@@ -0,0 +1,150 @@
+"""
+Benchmark - Latência do CRUD com queries analíticas pesadas em paralelo
+
+Arranca o Database Service (uvicorn, numa thread) sobre uma base de dados
+temporária e mede a latência de pedidos CRUD curtos (/health e
+/db/pedidos/pending) em três cenários:
+- repouso: só o CRUD
+- executor: CRUD + N queries pesadas concorrentes em /db/query, que correm
+  no pool "analytics" do executor (app/db/executor.py)
+- inline: o mesmo, mas com o SQLite chamado diretamente nos handlers async
+  (comportamento anterior ao executor), bloqueando o event loop
+
+Com o executor, a latência do CRUD deve manter-se próxima da de repouso.
+
+Uso (a partir de services/database):
+    python -m benchmarks.bench_event_loop
+    python -m benchmarks.bench_event_loop --heavy 4 --rows 1000000 --probes 100
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+import httpx
+
+from benchmarks.bench_pedidos import criar_base_dados
+
+PORT = 18091
+BASE_URL = f"http://127.0.0.1:{PORT}"
+
+
+def heavy_sql(rows: int) -> str:
+    """Query CPU-bound (CTE recursiva) que demora centenas de ms"""
+    return (
+        "WITH RECURSIVE seq(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM seq "
+        f"WHERE x < {rows}) SELECT count(*) AS n, sum(x % 7) AS s FROM seq"
+    )
+
+
+def arrancar_servidor():
+    """uvicorn numa thread (mesmo processo, para o modo inline)"""
+    import uvicorn
+    from app.main import app
+
+    server = uvicorn.Server(uvicorn.Config(app, port=PORT, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, thread
+
+
+def modo_inline(ativo: bool):
+    """Substituir DatabaseExecutor.run por uma chamada síncrona (bloqueante)"""
+    from app.db.executor import DatabaseExecutor
+
+    if not hasattr(DatabaseExecutor, "_run_original"):
+        DatabaseExecutor._run_original = DatabaseExecutor.run
+
+    async def run_inline(self, func, *args, lane="default", **kwargs):
+        return func(*args, **kwargs)
+
+    DatabaseExecutor.run = run_inline if ativo else DatabaseExecutor._run_original
+
+
+async def sondar(client: httpx.AsyncClient, probes: int, intervalo: float):
+    """Latências (ms) de pedidos CRUD curtos, alternando os endpoints"""
+    paths = ("/health", "/db/pedidos/pending")
+    latencias = []
+    for i in range(probes):
+        inicio = time.perf_counter()
+        response = await client.get(paths[i % len(paths)])
+        response.raise_for_status()
+        latencias.append((time.perf_counter() - inicio) * 1000)
+        await asyncio.sleep(intervalo)
+    return latencias
+
+
+async def carga_pesada(client: httpx.AsyncClient, sql: str, parar: asyncio.Event):
+    """Repetir a query pesada até `parar`; devolve o número de execuções"""
+    n = 0
+    while not parar.is_set():
+        response = await client.get("/db/query", params={"sql": sql}, timeout=120)
+        response.raise_for_status()
+        n += 1
+    return n
+
+
+async def cenario(heavy: int, sql: str, probes: int, intervalo: float):
+    async with httpx.AsyncClient(base_url=BASE_URL, timeout=120) as client:
+        await client.get("/health")
+        parar = asyncio.Event()
+        pesadas = [asyncio.create_task(carga_pesada(client, sql, parar)) for _ in range(heavy)]
+        if heavy:
+            await asyncio.sleep(0.2)
+        latencias = await sondar(client, probes, intervalo)
+        parar.set()
+        execucoes = sum(await asyncio.gather(*pesadas))
+    return latencias, execucoes
+
+
+def percentil(valores, p: float) -> float:
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--heavy", type=int, default=4, help="queries pesadas concorrentes")
+    parser.add_argument("--rows", type=int, default=500_000, help="linhas da CTE pesada")
+    parser.add_argument("--probes", type=int, default=60, help="pedidos CRUD por cenário")
+    parser.add_argument("--interval", type=float, default=0.01, help="segundos entre pedidos CRUD")
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.mkdtemp(prefix="bench_event_loop_"), "event_loop.db")
+    criar_base_dados(db_path, 1000)
+
+    # A conexão é criada a partir de settings.DB_PATH
+    from app.core.config import settings
+    settings.DB_PATH = db_path
+    settings.LOAD_SEED_DATA = "false"
+
+    server, thread = arrancar_servidor()
+    sql = heavy_sql(args.rows)
+
+    print(f"heavy={args.heavy} rows={args.rows} analytics_workers={settings.DB_ANALYTICS_WORKERS} "
+          f"read_pool={settings.DB_READ_POOL_SIZE}")
+    print(f"{'cenário':<9} | {'p50 ms':>8} | {'p95 ms':>8} | {'max ms':>8} | {'média ms':>8} | {'pesadas':>7}")
+    print("-" * 62)
+    try:
+        for nome, heavy, inline in (
+            ("repouso", 0, False),
+            ("executor", args.heavy, False),
+            ("inline", args.heavy, True),
+        ):
+            modo_inline(inline)
+            latencias, execucoes = asyncio.run(cenario(heavy, sql, args.probes, args.interval))
+            print(f"{nome:<9} | {percentil(latencias, 0.5):>8.2f} | {percentil(latencias, 0.95):>8.2f} | "
+                  f"{max(latencias):>8.2f} | {statistics.mean(latencias):>8.2f} | {execucoes:>7}")
+    finally:
+        modo_inline(False)
+        server.should_exit = True
+        thread.join(timeout=10)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Benchmark - Listagem de pedidos com dados do cliente
+
+Cria uma base de dados temporária a partir do schema.sql, popula-a com
+volumes crescentes de pedidos e mede, para cada endpoint de listagem:
+- número de statements SQL executados por chamada
+- latência média por chamada e por linha devolvida
+
+O endpoint /pending mantém um número fixo de pedidos pendentes enquanto a
+tabela cresce, pelo que a sua latência deve manter-se estável.
+
+Uso (a partir de services/database):
+    python -m benchmarks.bench_pedidos
+    python -m benchmarks.bench_pedidos --sizes 1000 10000 50000 --repeat 5
+"""
+import argparse
+import os
+import secrets
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+SCHEMA_PATH = Path(__file__).resolve().parent.parent / "schema.sql"
+PENDENTES = 50
+
+
+def criar_base_dados(path: str, n_pedidos: int, n_clientes: int = 500):
+    """Criar base de dados com n_pedidos (PENDENTES ficam 'pendente')"""
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA_PATH.read_text())
+    conn.execute(
+        "INSERT INTO admin (id, nome, email) VALUES ('admin001', 'Admin', 'admin@bench.local')"
+    )
+    clientes = [
+        (f"cliente{i:05d}", f"Cliente {i}", f"cliente{i}@bench.local", "2030-12-31", "admin001")
+        for i in range(n_clientes)
+    ]
+    conn.executemany(
+        "INSERT INTO cliente (id, nome, email, data_expiracao, criado_por) VALUES (?, ?, ?, ?, ?)",
+        clientes
+    )
+    pedidos = []
+    for i in range(n_pedidos):
+        estado = "pendente" if i < PENDENTES else ("aprovado" if i % 2 else "rejeitado")
+        pedidos.append((
+            secrets.token_hex(16),
+            clientes[i % n_clientes][0],
+            estado,
+            "renovação",
+            f"2025-01-01 00:00:{i % 60:02d}"
+        ))
+    conn.executemany(
+        "INSERT INTO pedido (id, cliente_id, estado, tipo_pedido, criado_em) VALUES (?, ?, ?, ?, ?)",
+        pedidos
+    )
+    conn.commit()
+    conn.close()
+
+
+def medir(func, repeat: int):
+    """Executar func `repeat` vezes; devolve (ms por chamada, linhas, statements)"""
+    from app.db.connection import DatabaseConnection
+
+    statements = []
+    # Com DB_READ_POOL_SIZE=1 todas as leituras usam esta mesma conexão
+    with DatabaseConnection.connection(readonly=True) as conn:
+        conn.set_trace_callback(statements.append)
+    try:
+        inicio = time.perf_counter()
+        for _ in range(repeat):
+            rows = func()
+        duracao = (time.perf_counter() - inicio) / repeat
+    finally:
+        with DatabaseConnection.connection(readonly=True) as conn:
+            conn.set_trace_callback(None)
+
+    # Ignorar COMMITs implícitos do get_cursor
+    selects = [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+    return duracao * 1000, len(rows), len(selects) // repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp(prefix="bench_pedidos_")
+
+    print(f"{'pedidos':>8} | {'endpoint':<9} | {'linhas':>7} | {'queries':>7} | {'ms/call':>9} | {'µs/linha':>8}")
+    print("-" * 64)
+
+    for size in args.sizes:
+        db_path = os.path.join(tmpdir, f"pedidos_{size}.db")
+        criar_base_dados(db_path, size)
+
+        # A conexão é criada a partir de settings.DB_PATH
+        from app.core.config import settings
+        from app.db.connection import DatabaseConnection
+        from app.api import pedidos
+
+        DatabaseConnection.close_connection()
+        settings.DB_PATH = db_path
+        settings.DB_READ_POOL_SIZE = 1
+
+        for nome, func in (
+            ("all", pedidos.get_all_pedidos),
+            ("pending", pedidos.get_pending_pedidos),
+        ):
+            ms, linhas, queries = medir(func, args.repeat)
+            por_linha = (ms * 1000 / linhas) if linhas else 0
+            print(f"{size:>8} | {nome:<9} | {linhas:>7} | {queries:>7} | {ms:>9.2f} | {por_linha:>8.2f}")
+
+        DatabaseConnection.close_connection()
+
+
+if __name__ == "__main__":
+    main()
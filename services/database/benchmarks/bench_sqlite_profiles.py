@@ -0,0 +1,148 @@
+"""
+Benchmark - Profiles de PRAGMAs SQLite (safe / balanced / fast)
+
+Para cada profile, parte da mesma base de dados (sintética ou uma cópia de
+uma base de dados real) e mede, através do DatabaseConnection:
+- escrita: inserts de 1 log por transação (como POST /db/logs/)
+- escrita em batch: executemany em lotes (como POST /db/logs/bulk)
+- leitura: endpoints de agregação de logs e lookups por id
+
+Uso (a partir de services/database):
+    python -m benchmarks.bench_sqlite_profiles
+    python -m benchmarks.bench_sqlite_profiles --logs 500000 --writes 2000
+    python -m benchmarks.bench_sqlite_profiles --source /backups/ltplabs.db
+"""
+import argparse
+import os
+import random
+import secrets
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+SCHEMA_PATH = Path(__file__).resolve().parent.parent / "schema.sql"
+TIPOS = ("login", "logout", "demo_aberta", "demo_fechada", "erro")
+
+
+def criar_base_dados(path: str, n_logs: int, n_clientes: int = 500, n_demos: int = 50):
+    """Criar base de dados sintética com n_logs logs"""
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA_PATH.read_text())
+    conn.execute(
+        "INSERT INTO admin (id, nome, email) VALUES ('admin001', 'Admin', 'admin@bench.local')"
+    )
+    conn.executemany(
+        "INSERT INTO cliente (id, nome, email, data_expiracao, criado_por) VALUES (?, ?, ?, ?, ?)",
+        [(f"cliente{i:05d}", f"Cliente {i}", f"cliente{i}@bench.local", "2030-12-31", "admin001")
+         for i in range(n_clientes)]
+    )
+    conn.executemany(
+        "INSERT INTO demo (id, nome, url, comercial_foto_url, criado_por) VALUES (?, ?, ?, ?, ?)",
+        [(f"demo{i:04d}", f"Demo {i}", f"https://demo{i}.bench.local", "-", "admin001")
+         for i in range(n_demos)]
+    )
+    rnd = random.Random(42)
+    conn.executemany(
+        "INSERT INTO log (id, cliente_id, demo_id, tipo, timestamp) "
+        "VALUES (?, ?, ?, ?, datetime('now', ?))",
+        [(secrets.token_hex(16),
+          f"cliente{rnd.randrange(n_clientes):05d}",
+          f"demo{rnd.randrange(n_demos):04d}",
+          rnd.choice(TIPOS),
+          f"-{rnd.randrange(90 * 24 * 60)} minutes")
+         for _ in range(n_logs)]
+    )
+    conn.commit()
+    conn.close()
+
+
+def copiar_base_dados(origem: str, destino: str):
+    """Copiar base de dados real (backup API, consistente mesmo com WAL)"""
+    src = sqlite3.connect(origem)
+    dst = sqlite3.connect(destino)
+    src.backup(dst)
+    dst.close()
+    src.close()
+
+
+def cronometrar(func, n: int) -> float:
+    """Segundos totais para executar func n vezes"""
+    inicio = time.perf_counter()
+    for i in range(n):
+        func(i)
+    return time.perf_counter() - inicio
+
+
+def correr_profile(profile: str, db_path: str, args) -> dict:
+    from app.core.config import settings
+    from app.db.connection import DatabaseConnection as db
+    from app.api import logs
+
+    db.close_connection()
+    settings.DB_PATH = db_path
+    settings.SQLITE_PROFILE = profile
+
+    ids = [r["id"] for r in db.execute_query("SELECT id FROM log LIMIT 1000")]
+    resultados = {}
+
+    # Escrita: 1 insert + commit por log
+    query = "INSERT INTO log (id, cliente_id, demo_id, tipo) VALUES (?, NULL, NULL, 'aviso')"
+    t = cronometrar(lambda i: db.execute_insert(query, (secrets.token_hex(16),)), args.writes)
+    resultados["insert/s"] = args.writes / t
+
+    # Escrita em batch: executemany por lote
+    lotes = max(1, args.writes // args.batch)
+    t = cronometrar(
+        lambda i: db.execute_many(query, [(secrets.token_hex(16),) for _ in range(args.batch)]),
+        lotes
+    )
+    resultados["bulk rows/s"] = lotes * args.batch / t
+
+    # Leitura: lookups por chave primária
+    t = cronometrar(lambda i: db.execute_query("SELECT * FROM log WHERE id = ?",
+                                               (ids[i % len(ids)],)), args.reads)
+    resultados["lookup/s"] = args.reads / t
+
+    # Leitura: agregações usadas pelo Metrics Exporter
+    t = cronometrar(lambda i: logs.get_logs_overview_aggregate(), args.repeat)
+    resultados["overview ms"] = t * 1000 / args.repeat
+    t = cronometrar(lambda i: logs.get_top_clients_aggregate(10), args.repeat)
+    resultados["top-clients ms"] = t * 1000 / args.repeat
+
+    db.close_connection()
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--profiles", nargs="+", default=["safe", "balanced", "fast"])
+    parser.add_argument("--source", help="Base de dados real a copiar (em vez de dados sintéticos)")
+    parser.add_argument("--logs", type=int, default=200000, help="Logs na base de dados sintética")
+    parser.add_argument("--writes", type=int, default=1000)
+    parser.add_argument("--batch", type=int, default=500)
+    parser.add_argument("--reads", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp(prefix="bench_profiles_")
+    base = os.path.join(tmpdir, "base.db")
+    if args.source:
+        copiar_base_dados(args.source, base)
+    else:
+        criar_base_dados(base, args.logs)
+
+    colunas = ("insert/s", "bulk rows/s", "lookup/s", "overview ms", "top-clients ms")
+    print(f"{'profile':<9} | " + " | ".join(f"{c:>14}" for c in colunas))
+    print("-" * (12 + 17 * len(colunas)))
+
+    for profile in args.profiles:
+        # Cada profile começa de uma cópia idêntica (sem cache de páginas quente)
+        db_path = os.path.join(tmpdir, f"{profile}.db")
+        copiar_base_dados(base, db_path)
+        resultados = correr_profile(profile, db_path, args)
+        print(f"{profile:<9} | " + " | ".join(f"{resultados[c]:>14.1f}" for c in colunas))
+
+
+if __name__ == "__main__":
+    main()
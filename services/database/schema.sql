@@ -14,6 +14,7 @@ CREATE TABLE admin (
 );
 
 CREATE INDEX idx_admin_email ON admin(email);
+CREATE INDEX idx_admin_nome ON admin(nome, id);
 
 -- ============================================================================
 -- CLIENTES (externos com acesso temporário)
@@ -31,6 +32,7 @@ CREATE TABLE cliente (
 
 CREATE INDEX idx_client_email ON cliente(email);
 CREATE INDEX idx_client_access_dates ON cliente(data_registo, data_expiracao);
+CREATE INDEX idx_client_nome ON cliente(nome, id);
 
 
 -- ============================================================================
@@ -60,6 +62,7 @@ CREATE TABLE demo (
 CREATE INDEX idx_demos_status ON demo(estado);
 CREATE INDEX idx_demos_vertical ON demo(vertical);
 CREATE INDEX idx_demos_project_code ON demo(codigo_projeto);
+CREATE INDEX idx_demos_nome ON demo(nome, id);
 
 -- ============================================================================
 -- PEDIDOS DE ACESSO (renovação/revogação)
@@ -80,6 +83,8 @@ CREATE TABLE pedido (
 
 CREATE INDEX idx_request_client ON pedido(cliente_id);
 CREATE INDEX idx_request_status ON pedido(estado);
+CREATE INDEX idx_request_status_date ON pedido(estado, criado_em);
+CREATE INDEX idx_request_date ON pedido(criado_em, id);
 
 -- ============================================================================
 -- LOG 
@@ -106,6 +111,7 @@ CREATE INDEX idx_logs_client ON log(cliente_id);
 CREATE INDEX idx_logs_demo ON log(demo_id);
 CREATE INDEX idx_logs_timestamp ON log(timestamp);
 CREATE INDEX idx_logs_event_type ON log(tipo);
+CREATE INDEX idx_logs_tipo_cliente_demo ON log(tipo, cliente_id, demo_id);
 
 
 
@@ -121,6 +127,68 @@ END;
 
 
 
+-- ============================================================================
+-- FOTOS DOS COMERCIAIS (fora da tabela demo)
+-- ============================================================================
+-- Imagens enviadas em Base64 são guardadas aqui, endereçadas pelo sha256 do
+-- conteúdo; demo.comercial_foto_url fica apenas com o URL da foto. O conteúdo
+-- de um hash nunca muda, pelo que pode ser servido com cache imutável.
+
+CREATE TABLE IF NOT EXISTS demo_foto (
+    hash TEXT PRIMARY KEY,          -- sha256 hex do conteúdo
+    content_type TEXT NOT NULL,
+    tamanho INTEGER NOT NULL,
+    dados BLOB NOT NULL,
+    criado_em TEXT DEFAULT (datetime('now'))
+);
+
+
+
+-- ============================================================================
+-- PESQUISA FULL-TEXT DE DEMOS (FTS5)
+-- ============================================================================
+-- Índice FTS5 de conteúdo externo sobre demo (content_rowid = rowid de demo),
+-- sincronizado por triggers com o comando 'delete' do FTS5. O VACUUM pode
+-- renumerar os rowids de demo (PK TEXT): a migração do startup
+-- (app/db/migrations.py) deteta a diferença e faz 'rebuild'.
+-- remove_diacritics: "logistica" encontra "Logística".
+
+CREATE VIRTUAL TABLE IF NOT EXISTS demo_fts USING fts5(
+    nome,
+    descricao,
+    keywords,
+    vertical,
+    horizontal,
+    content = 'demo',
+    content_rowid = 'rowid',
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_demo_fts_insert
+AFTER INSERT ON demo
+BEGIN
+    INSERT INTO demo_fts (rowid, nome, descricao, keywords, vertical, horizontal)
+    VALUES (NEW.rowid, NEW.nome, NEW.descricao, NEW.keywords, NEW.vertical, NEW.horizontal);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_demo_fts_update
+AFTER UPDATE OF nome, descricao, keywords, vertical, horizontal ON demo
+BEGIN
+    INSERT INTO demo_fts (demo_fts, rowid, nome, descricao, keywords, vertical, horizontal)
+    VALUES ('delete', OLD.rowid, OLD.nome, OLD.descricao, OLD.keywords, OLD.vertical, OLD.horizontal);
+    INSERT INTO demo_fts (rowid, nome, descricao, keywords, vertical, horizontal)
+    VALUES (NEW.rowid, NEW.nome, NEW.descricao, NEW.keywords, NEW.vertical, NEW.horizontal);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_demo_fts_delete
+AFTER DELETE ON demo
+BEGIN
+    INSERT INTO demo_fts (demo_fts, rowid, nome, descricao, keywords, vertical, horizontal)
+    VALUES ('delete', OLD.rowid, OLD.nome, OLD.descricao, OLD.keywords, OLD.vertical, OLD.horizontal);
+END;
+
+
+
 -- ============================================================================
 -- VIEWS úteis
 -- ============================================================================
@@ -186,6 +254,7 @@ CREATE TABLE IF NOT EXISTS demo_sessions (
     timestamp_inicio TEXT NOT NULL,
     timestamp_fim TEXT,
     duracao_segundos INTEGER,
+    ultimo_heartbeat TEXT,  -- atualizado pelo catalog enquanto a demo está aberta
     created_at TEXT DEFAULT (datetime('now')),
     
     FOREIGN KEY (cliente_id) REFERENCES cliente(id) ON DELETE CASCADE,
@@ -196,6 +265,439 @@ CREATE INDEX IF NOT EXISTS idx_demo_sessions_cliente ON demo_sessions(cliente_id
 CREATE INDEX IF NOT EXISTS idx_demo_sessions_demo ON demo_sessions(demo_id);
 CREATE INDEX IF NOT EXISTS idx_demo_sessions_inicio ON demo_sessions(timestamp_inicio);
 
+-- Sessões abertas (view_sessoes_ativas)
+CREATE INDEX IF NOT EXISTS idx_demo_sessions_ativas
+    ON demo_sessions(timestamp_inicio) WHERE timestamp_fim IS NULL;
+
+-- ============================================================================
+-- ROLLUPS DE TEMPO (mantidos por triggers em demo_sessions)
+-- ============================================================================
+-- Só contam sessões concluídas (timestamp_fim e duracao_segundos preenchidos).
+-- Cada escrita em demo_sessions atualiza apenas as linhas afetadas, pelo que
+-- as métricas de tempo são lookups indexados independentemente do histórico.
+
+CREATE TABLE IF NOT EXISTS rollup_tempo_cliente (
+    cliente_id TEXT PRIMARY KEY,
+    total_sessoes INTEGER NOT NULL DEFAULT 0,
+    tempo_total_segundos INTEGER NOT NULL DEFAULT 0,
+    ultima_sessao TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_rollup_tempo_cliente_total
+    ON rollup_tempo_cliente(tempo_total_segundos);
+
+CREATE TABLE IF NOT EXISTS rollup_tempo_demo (
+    demo_id TEXT PRIMARY KEY,
+    total_sessoes INTEGER NOT NULL DEFAULT 0,
+    tempo_total_segundos INTEGER NOT NULL DEFAULT 0,
+    ultima_sessao TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_rollup_tempo_demo_total
+    ON rollup_tempo_demo(tempo_total_segundos);
+
+CREATE TABLE IF NOT EXISTS rollup_tempo_cliente_demo (
+    cliente_id TEXT NOT NULL,
+    demo_id TEXT NOT NULL,
+    total_sessoes INTEGER NOT NULL DEFAULT 0,
+    tempo_total_segundos INTEGER NOT NULL DEFAULT 0,
+    ultima_sessao TEXT,
+    PRIMARY KEY (cliente_id, demo_id)
+);
+CREATE INDEX IF NOT EXISTS idx_rollup_tempo_cliente_demo_demo
+    ON rollup_tempo_cliente_demo(demo_id);
+
+-- Por dia de fim da sessão
+CREATE TABLE IF NOT EXISTS rollup_tempo_dia (
+    data TEXT PRIMARY KEY,
+    sessoes INTEGER NOT NULL DEFAULT 0,
+    tempo_total_segundos INTEGER NOT NULL DEFAULT 0
+);
+
+-- Por dia e hora de início da sessão (heatmap)
+CREATE TABLE IF NOT EXISTS rollup_tempo_hora (
+    data TEXT NOT NULL,
+    hora INTEGER NOT NULL,
+    sessoes INTEGER NOT NULL DEFAULT 0,
+    tempo_total_segundos INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (data, hora)
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_demo_sessions_rollup_insert
+AFTER INSERT ON demo_sessions
+WHEN NEW.duracao_segundos IS NOT NULL AND NEW.timestamp_fim IS NOT NULL
+BEGIN
+    INSERT INTO rollup_tempo_cliente (cliente_id, total_sessoes, tempo_total_segundos, ultima_sessao)
+    VALUES (NEW.cliente_id, 1, NEW.duracao_segundos, NEW.timestamp_fim)
+    ON CONFLICT(cliente_id) DO UPDATE SET
+        total_sessoes = total_sessoes + 1,
+        tempo_total_segundos = tempo_total_segundos + excluded.tempo_total_segundos,
+        ultima_sessao = MAX(ultima_sessao, excluded.ultima_sessao);
+
+    INSERT INTO rollup_tempo_demo (demo_id, total_sessoes, tempo_total_segundos, ultima_sessao)
+    VALUES (NEW.demo_id, 1, NEW.duracao_segundos, NEW.timestamp_fim)
+    ON CONFLICT(demo_id) DO UPDATE SET
+        total_sessoes = total_sessoes + 1,
+        tempo_total_segundos = tempo_total_segundos + excluded.tempo_total_segundos,
+        ultima_sessao = MAX(ultima_sessao, excluded.ultima_sessao);
+
+    INSERT INTO rollup_tempo_cliente_demo (cliente_id, demo_id, total_sessoes, tempo_total_segundos, ultima_sessao)
+    VALUES (NEW.cliente_id, NEW.demo_id, 1, NEW.duracao_segundos, NEW.timestamp_fim)
+    ON CONFLICT(cliente_id, demo_id) DO UPDATE SET
+        total_sessoes = total_sessoes + 1,
+        tempo_total_segundos = tempo_total_segundos + excluded.tempo_total_segundos,
+        ultima_sessao = MAX(ultima_sessao, excluded.ultima_sessao);
+
+    INSERT INTO rollup_tempo_dia (data, sessoes, tempo_total_segundos)
+    VALUES (date(NEW.timestamp_fim), 1, NEW.duracao_segundos)
+    ON CONFLICT(data) DO UPDATE SET
+        sessoes = sessoes + 1,
+        tempo_total_segundos = tempo_total_segundos + excluded.tempo_total_segundos;
+
+    INSERT INTO rollup_tempo_hora (data, hora, sessoes, tempo_total_segundos)
+    VALUES (date(NEW.timestamp_inicio), CAST(strftime('%H', NEW.timestamp_inicio) AS INTEGER), 1, NEW.duracao_segundos)
+    ON CONFLICT(data, hora) DO UPDATE SET
+        sessoes = sessoes + 1,
+        tempo_total_segundos = tempo_total_segundos + excluded.tempo_total_segundos;
+END;
+
+-- Update: retirar a versão antiga e somar a nova (a ordem entre os dois
+-- triggers não importa; ultima_sessao é recalculada a partir da tabela base)
+CREATE TRIGGER IF NOT EXISTS trg_demo_sessions_rollup_update_old
+AFTER UPDATE OF timestamp_inicio, timestamp_fim, duracao_segundos, cliente_id, demo_id ON demo_sessions
+WHEN OLD.duracao_segundos IS NOT NULL AND OLD.timestamp_fim IS NOT NULL
+BEGIN
+    UPDATE rollup_tempo_cliente SET
+        total_sessoes = total_sessoes - 1,
+        tempo_total_segundos = tempo_total_segundos - OLD.duracao_segundos,
+        ultima_sessao = (SELECT MAX(timestamp_fim) FROM demo_sessions
+                         WHERE cliente_id = OLD.cliente_id AND duracao_segundos IS NOT NULL)
+    WHERE cliente_id = OLD.cliente_id;
+    DELETE FROM rollup_tempo_cliente WHERE cliente_id = OLD.cliente_id AND total_sessoes <= 0;
+
+    UPDATE rollup_tempo_demo SET
+        total_sessoes = total_sessoes - 1,
+        tempo_total_segundos = tempo_total_segundos - OLD.duracao_segundos,
+        ultima_sessao = (SELECT MAX(timestamp_fim) FROM demo_sessions
+                         WHERE demo_id = OLD.demo_id AND duracao_segundos IS NOT NULL)
+    WHERE demo_id = OLD.demo_id;
+    DELETE FROM rollup_tempo_demo WHERE demo_id = OLD.demo_id AND total_sessoes <= 0;
+
+    UPDATE rollup_tempo_cliente_demo SET
+        total_sessoes = total_sessoes - 1,
+        tempo_total_segundos = tempo_total_segundos - OLD.duracao_segundos,
+        ultima_sessao = (SELECT MAX(timestamp_fim) FROM demo_sessions
+                         WHERE cliente_id = OLD.cliente_id AND demo_id = OLD.demo_id
+                           AND duracao_segundos IS NOT NULL)
+    WHERE cliente_id = OLD.cliente_id AND demo_id = OLD.demo_id;
+    DELETE FROM rollup_tempo_cliente_demo
+    WHERE cliente_id = OLD.cliente_id AND demo_id = OLD.demo_id AND total_sessoes <= 0;
+
+    UPDATE rollup_tempo_dia SET
+        sessoes = sessoes - 1,
+        tempo_total_segundos = tempo_total_segundos - OLD.duracao_segundos
+    WHERE data = date(OLD.timestamp_fim);
+    DELETE FROM rollup_tempo_dia WHERE data = date(OLD.timestamp_fim) AND sessoes <= 0;
+
+    UPDATE rollup_tempo_hora SET
+        sessoes = sessoes - 1,
+        tempo_total_segundos = tempo_total_segundos - OLD.duracao_segundos
+    WHERE data = date(OLD.timestamp_inicio)
+      AND hora = CAST(strftime('%H', OLD.timestamp_inicio) AS INTEGER);
+    DELETE FROM rollup_tempo_hora
+    WHERE data = date(OLD.timestamp_inicio)
+      AND hora = CAST(strftime('%H', OLD.timestamp_inicio) AS INTEGER)
+      AND sessoes <= 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_demo_sessions_rollup_update_new
+AFTER UPDATE OF timestamp_inicio, timestamp_fim, duracao_segundos, cliente_id, demo_id ON demo_sessions
+WHEN NEW.duracao_segundos IS NOT NULL AND NEW.timestamp_fim IS NOT NULL
+BEGIN
+    INSERT INTO rollup_tempo_cliente (cliente_id, total_sessoes, tempo_total_segundos, ultima_sessao)
+    VALUES (NEW.cliente_id, 1, NEW.duracao_segundos, NEW.timestamp_fim)
+    ON CONFLICT(cliente_id) DO UPDATE SET
+        total_sessoes = total_sessoes + 1,
+        tempo_total_segundos = tempo_total_segundos + excluded.tempo_total_segundos,
+        ultima_sessao = MAX(ultima_sessao, excluded.ultima_sessao);
+
+    INSERT INTO rollup_tempo_demo (demo_id, total_sessoes, tempo_total_segundos, ultima_sessao)
+    VALUES (NEW.demo_id, 1, NEW.duracao_segundos, NEW.timestamp_fim)
+    ON CONFLICT(demo_id) DO UPDATE SET
+        total_sessoes = total_sessoes + 1,
+        tempo_total_segundos = tempo_total_segundos + excluded.tempo_total_segundos,
+        ultima_sessao = MAX(ultima_sessao, excluded.ultima_sessao);
+
+    INSERT INTO rollup_tempo_cliente_demo (cliente_id, demo_id, total_sessoes, tempo_total_segundos, ultima_sessao)
+    VALUES (NEW.cliente_id, NEW.demo_id, 1, NEW.duracao_segundos, NEW.timestamp_fim)
+    ON CONFLICT(cliente_id, demo_id) DO UPDATE SET
+        total_sessoes = total_sessoes + 1,
+        tempo_total_segundos = tempo_total_segundos + excluded.tempo_total_segundos,
+        ultima_sessao = MAX(ultima_sessao, excluded.ultima_sessao);
+
+    INSERT INTO rollup_tempo_dia (data, sessoes, tempo_total_segundos)
+    VALUES (date(NEW.timestamp_fim), 1, NEW.duracao_segundos)
+    ON CONFLICT(data) DO UPDATE SET
+        sessoes = sessoes + 1,
+        tempo_total_segundos = tempo_total_segundos + excluded.tempo_total_segundos;
+
+    INSERT INTO rollup_tempo_hora (data, hora, sessoes, tempo_total_segundos)
+    VALUES (date(NEW.timestamp_inicio), CAST(strftime('%H', NEW.timestamp_inicio) AS INTEGER), 1, NEW.duracao_segundos)
+    ON CONFLICT(data, hora) DO UPDATE SET
+        sessoes = sessoes + 1,
+        tempo_total_segundos = tempo_total_segundos + excluded.tempo_total_segundos;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_demo_sessions_rollup_delete
+AFTER DELETE ON demo_sessions
+WHEN OLD.duracao_segundos IS NOT NULL AND OLD.timestamp_fim IS NOT NULL
+BEGIN
+    UPDATE rollup_tempo_cliente SET
+        total_sessoes = total_sessoes - 1,
+        tempo_total_segundos = tempo_total_segundos - OLD.duracao_segundos,
+        ultima_sessao = (SELECT MAX(timestamp_fim) FROM demo_sessions
+                         WHERE cliente_id = OLD.cliente_id AND duracao_segundos IS NOT NULL)
+    WHERE cliente_id = OLD.cliente_id;
+    DELETE FROM rollup_tempo_cliente WHERE cliente_id = OLD.cliente_id AND total_sessoes <= 0;
+
+    UPDATE rollup_tempo_demo SET
+        total_sessoes = total_sessoes - 1,
+        tempo_total_segundos = tempo_total_segundos - OLD.duracao_segundos,
+        ultima_sessao = (SELECT MAX(timestamp_fim) FROM demo_sessions
+                         WHERE demo_id = OLD.demo_id AND duracao_segundos IS NOT NULL)
+    WHERE demo_id = OLD.demo_id;
+    DELETE FROM rollup_tempo_demo WHERE demo_id = OLD.demo_id AND total_sessoes <= 0;
+
+    UPDATE rollup_tempo_cliente_demo SET
+        total_sessoes = total_sessoes - 1,
+        tempo_total_segundos = tempo_total_segundos - OLD.duracao_segundos,
+        ultima_sessao = (SELECT MAX(timestamp_fim) FROM demo_sessions
+                         WHERE cliente_id = OLD.cliente_id AND demo_id = OLD.demo_id
+                           AND duracao_segundos IS NOT NULL)
+    WHERE cliente_id = OLD.cliente_id AND demo_id = OLD.demo_id;
+    DELETE FROM rollup_tempo_cliente_demo
+    WHERE cliente_id = OLD.cliente_id AND demo_id = OLD.demo_id AND total_sessoes <= 0;
+
+    UPDATE rollup_tempo_dia SET
+        sessoes = sessoes - 1,
+        tempo_total_segundos = tempo_total_segundos - OLD.duracao_segundos
+    WHERE data = date(OLD.timestamp_fim);
+    DELETE FROM rollup_tempo_dia WHERE data = date(OLD.timestamp_fim) AND sessoes <= 0;
+
+    UPDATE rollup_tempo_hora SET
+        sessoes = sessoes - 1,
+        tempo_total_segundos = tempo_total_segundos - OLD.duracao_segundos
+    WHERE data = date(OLD.timestamp_inicio)
+      AND hora = CAST(strftime('%H', OLD.timestamp_inicio) AS INTEGER);
+    DELETE FROM rollup_tempo_hora
+    WHERE data = date(OLD.timestamp_inicio)
+      AND hora = CAST(strftime('%H', OLD.timestamp_inicio) AS INTEGER)
+      AND sessoes <= 0;
+END;
+
+-- Views de tempo (sobre os rollups)
+CREATE VIEW IF NOT EXISTS view_tempo_por_cliente AS
+SELECT
+    r.cliente_id,
+    c.nome as cliente_nome,
+    c.email as cliente_email,
+    r.total_sessoes,
+    (SELECT COUNT(*) FROM rollup_tempo_cliente_demo cd
+     WHERE cd.cliente_id = r.cliente_id) as demos_utilizadas,
+    r.tempo_total_segundos,
+    ROUND(r.tempo_total_segundos / 60.0, 2) as tempo_total_minutos,
+    ROUND(r.tempo_total_segundos / 60.0 / r.total_sessoes, 2) as duracao_media_minutos,
+    r.ultima_sessao
+FROM rollup_tempo_cliente r
+LEFT JOIN cliente c ON c.id = r.cliente_id;
+
+CREATE VIEW IF NOT EXISTS view_tempo_por_demo AS
+SELECT
+    r.demo_id,
+    d.nome as demo_nome,
+    r.total_sessoes,
+    (SELECT COUNT(*) FROM rollup_tempo_cliente_demo cd
+     WHERE cd.demo_id = r.demo_id) as clientes_unicos,
+    r.tempo_total_segundos,
+    ROUND(r.tempo_total_segundos / 60.0, 2) as tempo_total_minutos,
+    ROUND(r.tempo_total_segundos / 60.0 / r.total_sessoes, 2) as duracao_media_minutos,
+    r.ultima_sessao
+FROM rollup_tempo_demo r
+LEFT JOIN demo d ON d.id = r.demo_id;
+
+CREATE VIEW IF NOT EXISTS view_tempo_cliente_demo AS
+SELECT
+    r.cliente_id,
+    r.demo_id,
+    d.nome as demo_nome,
+    r.total_sessoes,
+    r.tempo_total_segundos,
+    ROUND(r.tempo_total_segundos / 60.0, 2) as tempo_total_minutos,
+    r.ultima_sessao
+FROM rollup_tempo_cliente_demo r
+LEFT JOIN demo d ON d.id = r.demo_id;
+
+CREATE VIEW IF NOT EXISTS view_sessoes_ativas AS
+SELECT
+    s.session_id,
+    s.cliente_id,
+    c.nome as cliente_nome,
+    s.demo_id,
+    d.nome as demo_nome,
+    s.timestamp_inicio,
+    ROUND((julianday('now') - julianday(s.timestamp_inicio)) * 1440, 2) as minutos_decorridos
+FROM demo_sessions s
+LEFT JOIN cliente c ON c.id = s.cliente_id
+LEFT JOIN demo d ON d.id = s.demo_id
+WHERE s.timestamp_fim IS NULL;
+
+-- ============================================================================
+-- VERSÕES DAS TABELAS (invalidação de caches)
+-- ============================================================================
+-- Contador monotónico por tabela, incrementado por triggers em cada INSERT,
+-- UPDATE ou DELETE. Os caches dos outros serviços comparam estes números
+-- (GET /db/versions/) em vez de voltar a ler as tabelas.
+
+CREATE TABLE IF NOT EXISTS table_versions (
+    tabela TEXT PRIMARY KEY,
+    versao INTEGER NOT NULL DEFAULT 0,
+    atualizado_em TEXT DEFAULT (datetime('now'))
+);
+
+INSERT OR IGNORE INTO table_versions (tabela) VALUES
+    ('admin'),
+    ('cliente'),
+    ('demo'),
+    ('pedido'),
+    ('log'),
+    ('demo_sessions');
+
+CREATE TRIGGER IF NOT EXISTS trg_admin_version_insert
+AFTER INSERT ON admin
+BEGIN
+    UPDATE table_versions SET versao = versao + 1, atualizado_em = datetime('now')
+    WHERE tabela = 'admin';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_admin_version_update
+AFTER UPDATE ON admin
+BEGIN
+    UPDATE table_versions SET versao = versao + 1, atualizado_em = datetime('now')
+    WHERE tabela = 'admin';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_admin_version_delete
+AFTER DELETE ON admin
+BEGIN
+    UPDATE table_versions SET versao = versao + 1, atualizado_em = datetime('now')
+    WHERE tabela = 'admin';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_cliente_version_insert
+AFTER INSERT ON cliente
+BEGIN
+    UPDATE table_versions SET versao = versao + 1, atualizado_em = datetime('now')
+    WHERE tabela = 'cliente';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_cliente_version_update
+AFTER UPDATE ON cliente
+BEGIN
+    UPDATE table_versions SET versao = versao + 1, atualizado_em = datetime('now')
+    WHERE tabela = 'cliente';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_cliente_version_delete
+AFTER DELETE ON cliente
+BEGIN
+    UPDATE table_versions SET versao = versao + 1, atualizado_em = datetime('now')
+    WHERE tabela = 'cliente';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_demo_version_insert
+AFTER INSERT ON demo
+BEGIN
+    UPDATE table_versions SET versao = versao + 1, atualizado_em = datetime('now')
+    WHERE tabela = 'demo';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_demo_version_update
+AFTER UPDATE ON demo
+BEGIN
+    UPDATE table_versions SET versao = versao + 1, atualizado_em = datetime('now')
+    WHERE tabela = 'demo';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_demo_version_delete
+AFTER DELETE ON demo
+BEGIN
+    UPDATE table_versions SET versao = versao + 1, atualizado_em = datetime('now')
+    WHERE tabela = 'demo';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_pedido_version_insert
+AFTER INSERT ON pedido
+BEGIN
+    UPDATE table_versions SET versao = versao + 1, atualizado_em = datetime('now')
+    WHERE tabela = 'pedido';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_pedido_version_update
+AFTER UPDATE ON pedido
+BEGIN
+    UPDATE table_versions SET versao = versao + 1, atualizado_em = datetime('now')
+    WHERE tabela = 'pedido';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_pedido_version_delete
+AFTER DELETE ON pedido
+BEGIN
+    UPDATE table_versions SET versao = versao + 1, atualizado_em = datetime('now')
+    WHERE tabela = 'pedido';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_log_version_insert
+AFTER INSERT ON log
+BEGIN
+    UPDATE table_versions SET versao = versao + 1, atualizado_em = datetime('now')
+    WHERE tabela = 'log';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_log_version_update
+AFTER UPDATE ON log
+BEGIN
+    UPDATE table_versions SET versao = versao + 1, atualizado_em = datetime('now')
+    WHERE tabela = 'log';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_log_version_delete
+AFTER DELETE ON log
+BEGIN
+    UPDATE table_versions SET versao = versao + 1, atualizado_em = datetime('now')
+    WHERE tabela = 'log';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_demo_sessions_version_insert
+AFTER INSERT ON demo_sessions
+BEGIN
+    UPDATE table_versions SET versao = versao + 1, atualizado_em = datetime('now')
+    WHERE tabela = 'demo_sessions';
+END;
+
+-- Heartbeats (ultimo_heartbeat) não mudam a versão: só as colunas que
+-- alimentam os rollups e as métricas de tempo
+CREATE TRIGGER IF NOT EXISTS trg_demo_sessions_version_update
+AFTER UPDATE OF timestamp_inicio, timestamp_fim, duracao_segundos, cliente_id, demo_id ON demo_sessions
+BEGIN
+    UPDATE table_versions SET versao = versao + 1, atualizado_em = datetime('now')
+    WHERE tabela = 'demo_sessions';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_demo_sessions_version_delete
+AFTER DELETE ON demo_sessions
+BEGIN
+    UPDATE table_versions SET versao = versao + 1, atualizado_em = datetime('now')
+    WHERE tabela = 'demo_sessions';
+END;
+
 -- ============================================================================
 -- END
 -- ============================================================================
\ No newline at end of file
@@ -0,0 +1,141 @@
+"""
+Testes do IdempotencyMiddleware (app/core/idempotency.py)
+
+A rota é uma app ASGI falsa que conta execuções e pode ficar presa até o
+teste a libertar (para simular uma repetição com a primeira ainda a correr).
+
+Uso (a partir de services/database):
+    python -m pytest tests
+"""
+import asyncio
+import json
+
+import pytest
+
+from app.core.idempotency import IdempotencyMiddleware, idempotency_store
+
+
+class FakeRoute:
+    """App ASGI: responde {"execucao": N} com o status pedido"""
+
+    def __init__(self, status: int = 201):
+        self.status = status
+        self.execucoes = 0
+        self.iniciada = asyncio.Event()
+        self.libertar = asyncio.Event()
+        self.libertar.set()
+
+    async def __call__(self, scope, receive, send):
+        self.execucoes += 1
+        self.iniciada.set()
+        await self.libertar.wait()
+        body = json.dumps({"execucao": self.execucoes}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": self.status,
+            "headers": [(b"content-type", b"application/json")]
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+async def pedido(app, chave: str = "k1", method: str = "POST", path: str = "/db/demos/"):
+    """Enviar um pedido ASGI e devolver (status, headers, body)"""
+    headers = [(b"idempotency-key", chave.encode())] if chave else []
+    scope = {"type": "http", "method": method, "path": path, "headers": headers}
+    mensagens = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        mensagens.append(message)
+
+    await app(scope, receive, send)
+    inicio = mensagens[0]
+    body = b"".join(m.get("body", b"") for m in mensagens[1:])
+    return inicio["status"], dict(inicio["headers"]), json.loads(body)
+
+
+@pytest.fixture(autouse=True)
+def store_limpa():
+    """O store é um singleton: isolar cada teste"""
+    idempotency_store.__init__()
+    yield
+    idempotency_store.__init__()
+
+
+def test_repeticao_recebe_resposta_guardada():
+    async def cenario():
+        rota = FakeRoute()
+        app = IdempotencyMiddleware(rota)
+        primeira = await pedido(app)
+        repeticao = await pedido(app)
+        return rota, primeira, repeticao
+
+    rota, primeira, repeticao = asyncio.run(cenario())
+
+    assert rota.execucoes == 1
+    assert repeticao[0] == primeira[0] == 201
+    assert repeticao[2] == primeira[2] == {"execucao": 1}
+    assert repeticao[1][b"idempotent-replayed"] == b"true"
+    assert b"idempotent-replayed" not in primeira[1]
+    assert idempotency_store.replayed == 1
+
+
+def test_repeticao_espera_pela_primeira_execucao():
+    """Uma repetição que chega a meio espera e recebe a mesma resposta, sem executar"""
+    async def cenario():
+        rota = FakeRoute()
+        rota.libertar.clear()
+        app = IdempotencyMiddleware(rota)
+
+        primeira = asyncio.ensure_future(pedido(app))
+        await rota.iniciada.wait()
+        repeticao = asyncio.ensure_future(pedido(app))
+        await asyncio.sleep(0.01)
+        assert not repeticao.done()
+        assert idempotency_store.stats()["in_progress"] == 1
+
+        rota.libertar.set()
+        return rota, await primeira, await repeticao
+
+    rota, primeira, repeticao = asyncio.run(cenario())
+
+    assert rota.execucoes == 1
+    assert repeticao[2] == primeira[2]
+    assert repeticao[1][b"idempotent-replayed"] == b"true"
+    assert idempotency_store.stats()["in_progress"] == 0
+
+
+def test_5xx_nao_e_guardado():
+    """Depois de um 5xx a repetição volta a executar a rota"""
+    async def cenario():
+        rota = FakeRoute(status=503)
+        app = IdempotencyMiddleware(rota)
+        await pedido(app)
+        rota.status = 201
+        return rota, await pedido(app)
+
+    rota, repeticao = asyncio.run(cenario())
+
+    assert rota.execucoes == 2
+    assert repeticao[0] == 201
+    assert b"idempotent-replayed" not in repeticao[1]
+    assert idempotency_store.stored == 1
+
+
+def test_chaves_e_metodos_distintos_executam():
+    async def cenario():
+        rota = FakeRoute()
+        app = IdempotencyMiddleware(rota)
+        await pedido(app, chave="k1")
+        await pedido(app, chave="k2")
+        await pedido(app, chave="k1", path="/db/demos/demo001", method="PUT")
+        await pedido(app, chave="")
+        await pedido(app, chave="k1", method="GET")
+        return rota
+
+    rota = asyncio.run(cenario())
+
+    assert rota.execucoes == 5
+    assert idempotency_store.replayed == 0
@@ -0,0 +1,119 @@
+"""
+Testes do ConnectionPool (app/db/pool.py)
+
+Uso (a partir de services/database):
+    python -m pytest tests
+"""
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from app.db.pool import ConnectionPool, is_connection_error
+
+
+def criar_pool(tmp_path, size=1, timeout=3.0) -> ConnectionPool:
+    path = str(tmp_path / "pool.db")
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        "CREATE TABLE pai (id TEXT PRIMARY KEY);"
+        "CREATE TABLE filho (id TEXT PRIMARY KEY, pai_id TEXT REFERENCES pai(id));"
+        "INSERT INTO pai (id) VALUES ('p1');"
+    )
+    conn.commit()
+    conn.close()
+
+    def factory():
+        conn = sqlite3.connect(path, check_same_thread=False)
+        conn.execute("PRAGMA foreign_keys = ON")
+        return conn
+
+    return ConnectionPool("teste", factory, size=size, timeout=timeout, health_check_interval=60)
+
+
+def test_integrity_error_mantem_conexao(tmp_path):
+    """UNIQUE/FK violados são input normal: a conexão volta ao pool"""
+    pool = criar_pool(tmp_path)
+
+    with pool.connection() as conn:
+        original = conn
+    for sql in ("INSERT INTO pai (id) VALUES ('p1')",
+                "INSERT INTO filho (id, pai_id) VALUES ('f1', 'desconhecido')"):
+        with pytest.raises(sqlite3.IntegrityError):
+            with pool.connection() as conn:
+                conn.execute(sql)
+
+    stats = pool.stats()
+    assert stats["created"] == 1
+    assert stats["idle"] == 1
+    with pool.connection() as conn:
+        assert conn is original
+
+
+def erro_sqlite(cls, mensagem: str, code: int) -> sqlite3.Error:
+    """Exceção como as do sqlite3 (com sqlite_errorcode)"""
+    erro = cls(mensagem)
+    erro.sqlite_errorcode = code
+    return erro
+
+
+def test_erros_de_sql_mantem_conexao(tmp_path):
+    """Sintaxe, tabela inexistente ou "database is locked" não descartam"""
+    pool = criar_pool(tmp_path)
+
+    with pool.connection() as conn:
+        original = conn
+    for sql in ("SELECT * FROM tabela_inexistente", "SELEC 1"):
+        with pytest.raises(sqlite3.OperationalError):
+            with pool.connection() as conn:
+                conn.execute(sql)
+    with pytest.raises(sqlite3.OperationalError):
+        with pool.connection():
+            raise erro_sqlite(sqlite3.OperationalError, "database is locked", sqlite3.SQLITE_BUSY)
+
+    assert pool.stats()["created"] == 1
+    with pool.connection() as conn:
+        assert conn is original
+
+
+def test_is_connection_error_por_codigo():
+    assert is_connection_error(erro_sqlite(sqlite3.OperationalError, "disk I/O error",
+                                           sqlite3.SQLITE_IOERR_READ))
+    assert is_connection_error(erro_sqlite(sqlite3.DatabaseError, "file is not a database",
+                                           sqlite3.SQLITE_NOTADB))
+    assert not is_connection_error(erro_sqlite(sqlite3.OperationalError, "attempt to write a readonly database",
+                                               sqlite3.SQLITE_READONLY))
+    assert not is_connection_error(sqlite3.DatabaseError("sem código"))
+
+
+def test_discard_acorda_pedido_em_espera(tmp_path):
+    """Uma conexão descartada liberta o lugar para quem está à espera"""
+    pool = criar_pool(tmp_path, timeout=3.0)
+    adquirida = threading.Event()
+    resultado = {}
+
+    def dono():
+        with pytest.raises(sqlite3.OperationalError):
+            with pool.connection():
+                adquirida.set()
+                time.sleep(0.2)
+                raise erro_sqlite(sqlite3.OperationalError, "disk I/O error", sqlite3.SQLITE_IOERR)
+
+    def em_espera():
+        adquirida.wait()
+        inicio = time.monotonic()
+        with pool.connection() as conn:
+            conn.execute("SELECT 1").fetchone()
+        resultado["espera"] = time.monotonic() - inicio
+
+    threads = [threading.Thread(target=dono), threading.Thread(target=em_espera)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+
+    assert resultado["espera"] < 1.0
+    stats = pool.stats()
+    assert stats["timeouts"] == 0
+    assert stats["created"] == 1
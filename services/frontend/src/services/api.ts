@@ -6,7 +6,7 @@
  * CORREÇÃO: Lida corretamente com 204 No Content (DELETE)
  */
 
-const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000'
+export const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000'
 
 class ApiClient {
   private baseURL: string
@@ -0,0 +1,30 @@
+/**
+ * Demo session tracking
+ * Mantém a sessão de utilização viva enquanto a janela da demo está aberta
+ * (heartbeats) e termina-a quando a janela é fechada
+ */
+
+const HEARTBEAT_INTERVAL_MS = 30000;
+
+export function trackDemoSession(
+  catalogUrl: string,
+  sessionId: string,
+  demoWindow: Window | null
+): void {
+  if (!sessionId || !demoWindow) return;
+
+  const post = (path: string) =>
+    fetch(`${catalogUrl}/api/sessions/${sessionId}/${path}`, {
+      method: "POST",
+      keepalive: true,
+    }).catch((error) => console.error(`Erro ao registar ${path} da sessão:`, error));
+
+  const interval = window.setInterval(() => {
+    if (demoWindow.closed) {
+      window.clearInterval(interval);
+      post("end");
+    } else {
+      post("heartbeat");
+    }
+  }, HEARTBEAT_INTERVAL_MS);
+}
@@ -1,8 +1,10 @@
 import { useEffect, useState } from "react";
 import { useNavigate, useParams } from "react-router-dom";
 import { demoService } from "../services/demoService";
+import { API_BASE_URL } from "../services/api";
 import type { Demo } from "../types/Demo";
 import { getAuthUser } from "../utils/cookies";
+import { trackDemoSession } from "../utils/demoSession";
 
 type User = { id: string; name: string; role: "admin" | "viewer" };
 
@@ -17,7 +19,7 @@ const PLACEHOLDER_SVG = `data:image/svg+xml,%3Csvg xmlns='http://www.w3.org/2000
 
 /**
  * Componente de Avatar do Comercial
- * Suporta URLs HTTPS/HTTP e Base64
+ * Suporta URLs HTTPS/HTTP, fotos servidas pela API (/api/demos/fotos/...) e Base64
  * CORRIGIDO: Usa SVG inline como fallback
  */
 function ComercialAvatar({
@@ -73,6 +75,12 @@ function ComercialAvatar({
       return;
     }
 
+    // Foto guardada pela API (caminho relativo ao Catalog)
+    if (v.startsWith("/api/")) {
+      setImageUrl(`${API_BASE_URL}${v}`);
+      return;
+    }
+
     // Aceita URLs HTTPS/HTTP
     if (/^https?:\/\//i.test(v)) {
       console.log("3. Formato: URL HTTP/HTTPS");
@@ -295,14 +303,17 @@ export default function Detalhe({ user }: Props) {
         })
       });
       
+      let sessionId = "";
       if (!response.ok) {
         console.error("Erro ao registar abertura de demo:", await response.text());
       } else {
+        sessionId = (await response.json()).session_id;
         console.log("Demo aberta registada com sucesso");
       }
       
-      // Abrir demo em nova tab
-      window.open(demo.url, "_blank");
+      // Abrir demo em nova tab (sessão de tempo termina quando a tab fecha)
+      const demoWindow = window.open(demo.url, "_blank");
+      trackDemoSession(CATALOG_URL, sessionId, demoWindow);
       
     } catch (error) {
       console.error("Erro ao abrir demo:", error);
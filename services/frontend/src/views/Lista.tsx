@@ -13,6 +13,7 @@ import { useClienteAuth } from "../hooks/useClienteAuth";
 import ExpirationBanner from "../components/ExpirationBanner";
 import type { Demo } from "../types/Demo";
 import { getAuthUser } from "../utils/cookies";
+import { trackDemoSession } from "../utils/demoSession";
 
 type User = { id: string; name: string; role: "admin" | "viewer" };
 
@@ -75,13 +76,16 @@ export default function Lista({ user }: Props) {
         })
       });
       
+      let sessionId = "";
       if (!response.ok) {
         console.error("Erro ao registar abertura de demo:", await response.text());
       } else {
+        sessionId = (await response.json()).session_id;
         console.log("Demo aberta registada com sucesso");
       }
       
-      window.open(demo.url, "_blank");
+      const demoWindow = window.open(demo.url, "_blank");
+      trackDemoSession(CATALOG_URL, sessionId, demoWindow);
       
     } catch (error) {
       console.error("Erro ao abrir demo:", error);
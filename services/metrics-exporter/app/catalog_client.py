@@ -2,9 +2,13 @@
 Catalog Client para Metrics Exporter
 Cliente HTTP para comunicar com o Catalog Service
 """
+import asyncio
 import httpx
-from typing import List, Dict, Any
+import time
+from typing import List, Dict, Any, Optional
 from app.core.config import settings
+from ecatalog_shared.resilience import UpstreamPolicy
+from ecatalog_shared.telemetry import observe_upstream
 
 
 class CatalogClient:
@@ -18,29 +22,88 @@ class CatalogClient:
     
     def __init__(self):
         self.base_url = settings.CATALOG_URL
-        self.timeout = 30.0
+        self.timeout = settings.CATALOG_TIMEOUT
+        self.policy = UpstreamPolicy(
+            "catalog",
+            retries=settings.UPSTREAM_RETRIES,
+            backoff_base=settings.UPSTREAM_BACKOFF_BASE,
+            backoff_max=settings.UPSTREAM_BACKOFF_MAX,
+            hedge_enabled=settings.UPSTREAM_HEDGE_ENABLED,
+            hedge_min_delay=settings.UPSTREAM_HEDGE_MIN_DELAY,
+            failure_threshold=settings.CIRCUIT_FAILURE_THRESHOLD,
+            reset_timeout=settings.CIRCUIT_RESET_TIMEOUT
+        )
+        # Limite de chamadas simultâneas ao Catalog (gather + scheduler)
+        self._limiter = asyncio.Semaphore(settings.CATALOG_MAX_CONCURRENCY)
+        self._client: Optional[httpx.AsyncClient] = None
+    
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """
+        httpx.AsyncClient partilhado (conexões keep-alive ao Catalog)
+        Criado no primeiro pedido; fechado no shutdown (close)
+        """
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                limits=httpx.Limits(
+                    max_connections=settings.CATALOG_MAX_CONCURRENCY,
+                    max_keepalive_connections=settings.CATALOG_MAX_CONCURRENCY
+                )
+            )
+        return self._client
+    
+    async def close(self) -> None:
+        """Fechar o pool de conexões (shutdown da aplicação)"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
     
     async def _request(self, method: str, endpoint: str, **kwargs) -> Any:
-        """Fazer request HTTP ao Catalog Service"""
-        url = f"{self.base_url}{endpoint}"
+        """
+        Fazer request HTTP ao Catalog Service (espera por vaga no limitador)
         
-        try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.request(method, url, **kwargs)
+        Deadline por endpoint para o conjunto das tentativas, retries com
+        jitter, hedging opcional e circuit breaker (ver ecatalog_shared.resilience)
+        """
+        async with self._limiter:
+            try:
+                async def attempt(restante: float) -> httpx.Response:
+                    inicio = time.perf_counter()
+                    status = None
+                    try:
+                        response = await self.client.request(method, endpoint, timeout=restante, **kwargs)
+                        status = response.status_code
+                        return response
+                    finally:
+                        observe_upstream("catalog", method, endpoint, status, time.perf_counter() - inicio)
+                
+                response = await self.policy.execute(
+                    method, endpoint, attempt, self.deadline_for(endpoint)
+                )
                 response.raise_for_status()
                 
                 if response.status_code == 204:
                     return None
                 
                 return response.json()
-        except httpx.HTTPStatusError as e:
-            try:
-                error_detail = e.response.json().get("detail", str(e))
-            except Exception:
-                error_detail = str(e)
-            raise Exception(f"Catalog Service error: {error_detail}")
-        except Exception as e:
-            raise Exception(f"Failed to communicate with Catalog: {str(e)}")
+            except httpx.HTTPStatusError as e:
+                try:
+                    error_detail = e.response.json().get("detail", str(e))
+                except Exception:
+                    error_detail = str(e)
+                raise Exception(f"Catalog Service error: {error_detail}")
+            except Exception as e:
+                raise Exception(f"Failed to communicate with Catalog: {str(e)}")
+    
+    def deadline_for(self, endpoint: str) -> float:
+        """Deadline do endpoint (prefixo mais longo em CATALOG_ENDPOINT_TIMEOUTS)"""
+        timeout = self.timeout
+        match = ""
+        for prefix, value in settings.CATALOG_ENDPOINT_TIMEOUTS.items():
+            if endpoint.startswith(prefix) and len(prefix) > len(match):
+                match, timeout = prefix, value
+        return timeout
     
     # ========================================================================
     # ENDPOINTS USADOS PELAS MÉTRICAS
@@ -58,14 +121,33 @@ class CatalogClient:
         """GET /api/logs/all"""
         return await self._request("GET", f"/api/logs/all?limit={limit}")
     
-    async def execute_query(self, sql: str) -> List[Dict[str, Any]]:
+    async def get_logs_overview_aggregate(self) -> Dict[str, Any]:
+        """GET /api/logs/aggregates/overview"""
+        return await self._request("GET", "/api/logs/aggregates/overview")
+    
+    async def get_top_clients_aggregate(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """GET /api/logs/aggregates/top-clients"""
+        return await self._request("GET", "/api/logs/aggregates/top-clients", params={"limit": limit})
+    
+    async def get_top_demos_aggregate(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """GET /api/logs/aggregates/top-demos"""
+        return await self._request("GET", "/api/logs/aggregates/top-demos", params={"limit": limit})
+    
+    async def get_demos_per_client_aggregate(self) -> List[Dict[str, Any]]:
+        """GET /api/logs/aggregates/demos-per-client"""
+        return await self._request("GET", "/api/logs/aggregates/demos-per-client")
+    
+    async def get_table_versions(self) -> Dict[str, int]:
+        """GET /api/db/versions (contador de versão por tabela)"""
+        return await self._request("GET", "/api/db/versions")
+    
+    async def run_query(self, name: str, **params: Any) -> List[Dict[str, Any]]:
         """
-        GET /api/db/query
+        GET /api/db/queries/{name}
         
-        Executa query SQL genérica através do Catalog
-        Usado para queries customizadas (views, agregações, etc)
+        Executa query analítica registada na Database (por nome, parametrizada)
         """
-        return await self._request("GET", "/api/db/query", params={"sql": sql})
+        return await self._request("GET", f"/api/db/queries/{name}", params=params)
 
 
 # Singleton instance
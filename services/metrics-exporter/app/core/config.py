@@ -1,9 +1,44 @@
 from pydantic_settings import BaseSettings
+from typing import Dict
 
 class Settings(BaseSettings):
     CATALOG_URL: str = "http://catalog:8000"
+    # Máximo de pedidos simultâneos ao Catalog
+    CATALOG_MAX_CONCURRENCY: int = 8
+    # Deadline por chamada ao Catalog (tentativas incluídas) e exceções por
+    # prefixo do endpoint
+    CATALOG_TIMEOUT: float = 10.0
+    CATALOG_ENDPOINT_TIMEOUTS: Dict[str, float] = {"/api/db/queries": 60.0, "/api/db/query": 60.0}
+    
+    # Resiliência das chamadas ao Catalog (ecatalog_shared.resilience)
+    UPSTREAM_RETRIES: int = 2
+    UPSTREAM_BACKOFF_BASE: float = 0.1
+    UPSTREAM_BACKOFF_MAX: float = 1.0
+    # Segundo pedido para GETs mais lentos do que o p95 recente do endpoint
+    UPSTREAM_HEDGE_ENABLED: bool = False
+    UPSTREAM_HEDGE_MIN_DELAY: float = 0.05
+    # Falhas seguidas que abrem o circuito e segundos até novo teste
+    CIRCUIT_FAILURE_THRESHOLD: int = 5
+    CIRCUIT_RESET_TIMEOUT: float = 10.0
+    
+    # Compressão das respostas (GZip acima de GZIP_MINIMUM_SIZE bytes)
+    GZIP_MINIMUM_SIZE: int = 1024
+    GZIP_COMPRESS_LEVEL: int = 5
+
+    # Scheduler de pré-cálculo (segundos entre refreshes; 0 desliga o loop
+    # e a família passa a ser calculada on-demand no primeiro pedido)
+    METRICS_SCHEDULER_ENABLED: bool = True
+    METRICS_REFRESH_LOGS: float = 30.0
+    METRICS_REFRESH_CLIENTS: float = 60.0
+    METRICS_REFRESH_DEMOS: float = 60.0
+    METRICS_REFRESH_TIME: float = 60.0
+    METRICS_REFRESH_SESSIONS: float = 10.0
+    # Jobs que dependem só de tabelas (sem janelas temporais) não são
+    # recalculados enquanto as versões das tabelas não mudarem, até este
+    # limite de idade do snapshot
+    METRICS_MAX_SNAPSHOT_AGE: float = 600.0
     
     class Config:
         env_file = ".env"
 
-settings = Settings()
\ No newline at end of file
+settings = Settings()
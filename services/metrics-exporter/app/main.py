@@ -1,21 +1,83 @@
 """Metrics Exporter Service"""
+import asyncio
+import time
+from typing import Any, Awaitable, Dict
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from app.core.config import settings
+from ecatalog_shared.telemetry import TelemetryMiddleware, metrics_response
 from app.catalog_client import catalog_client
 from app.metrics.logs_metrics import LogsMetrics
 from app.metrics.clients_metrics import ClientsMetrics
 from app.metrics.demos_metrics import DemosMetrics
 from app.metrics.time_metrics import TimeMetrics
+from app.scheduler import scheduler
 
-app = FastAPI(title="E-Catalog Metrics Exporter", version="1.0.0")
+app = FastAPI(title="E-Catalog Metrics Exporter", version="1.0.0", default_response_class=ORJSONResponse)
+# Compressão (dentro da telemetria, para esta medir bytes enviados)
+app.add_middleware(GZipMiddleware, minimum_size=settings.GZIP_MINIMUM_SIZE, compresslevel=settings.GZIP_COMPRESS_LEVEL)
 app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_credentials=True, allow_methods=["*"], allow_headers=["*"])
+# Latência por rota, pedidos em curso e tamanho das respostas (/metrics)
+app.add_middleware(TelemetryMiddleware)
 
 logs_metrics = LogsMetrics(catalog_client)
 clients_metrics = ClientsMetrics(catalog_client)
 demos_metrics = DemosMetrics(catalog_client)
 time_metrics = TimeMetrics(catalog_client)
 
+DEFAULT_LIMIT = 10
+DEFAULT_DAYS = 7
+
+# Snapshots pré-calculados (parâmetros por omissão); pedidos com outros
+# parâmetros continuam a ser calculados on-demand. `tables` só é indicado
+# quando o resultado não depende da hora atual (janelas, expirações)
+scheduler.register("logs_overview", logs_metrics.get_logs_overview, settings.METRICS_REFRESH_LOGS)
+scheduler.register("logs_top_clients", lambda: logs_metrics.get_top_active_clients(DEFAULT_LIMIT), settings.METRICS_REFRESH_LOGS, tables=("log", "cliente"))
+scheduler.register("logs_demos_per_client", logs_metrics.get_demos_por_cliente, settings.METRICS_REFRESH_LOGS, tables=("log", "cliente", "demo"))
+scheduler.register("clients_overview", clients_metrics.get_clients_overview, settings.METRICS_REFRESH_CLIENTS)
+scheduler.register("demos_overview", demos_metrics.get_demos_overview, settings.METRICS_REFRESH_DEMOS, tables=("demo",))
+scheduler.register("demos_top_used", lambda: demos_metrics.get_top_used_demos(DEFAULT_LIMIT), settings.METRICS_REFRESH_DEMOS, tables=("log", "demo"))
+scheduler.register("time_overview", time_metrics.get_tempo_overview, settings.METRICS_REFRESH_TIME)
+scheduler.register("time_top_clients", lambda: time_metrics.get_tempo_por_cliente(DEFAULT_LIMIT), settings.METRICS_REFRESH_TIME, tables=("demo_sessions", "cliente"))
+scheduler.register("time_top_demos", lambda: time_metrics.get_tempo_por_demo(DEFAULT_LIMIT), settings.METRICS_REFRESH_TIME, tables=("demo_sessions", "demo"))
+scheduler.register("time_by_period", lambda: time_metrics.get_tempo_por_periodo(DEFAULT_DAYS), settings.METRICS_REFRESH_TIME)
+scheduler.register("time_heatmap", time_metrics.get_heatmap_utilizacao, settings.METRICS_REFRESH_TIME)
+scheduler.register("time_active_sessions", time_metrics.get_sessoes_ativas, settings.METRICS_REFRESH_SESSIONS)
+
+async def run_stages(stages: Dict[str, Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+    """
+    Correr etapas independentes em paralelo (asyncio.gather)
+    
+    As chamadas ao Catalog ficam sujeitas ao limitador do catalog_client.
+    Devolve os resultados por etapa + "timings_ms" com a duração de cada uma.
+    """
+    timings: Dict[str, float] = {}
+
+    async def timed(name: str, stage: Awaitable[Dict[str, Any]]) -> Dict[str, Any]:
+        inicio = time.perf_counter()
+        try:
+            return await stage
+        finally:
+            timings[name] = round((time.perf_counter() - inicio) * 1000, 2)
+
+    inicio = time.perf_counter()
+    results = await asyncio.gather(*(timed(name, stage) for name, stage in stages.items()))
+    timings["total"] = round((time.perf_counter() - inicio) * 1000, 2)
+
+    return {**dict(zip(stages, results)), "timings_ms": timings}
+
+@app.on_event("startup")
+async def startup_event():
+    if settings.METRICS_SCHEDULER_ENABLED:
+        await scheduler.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await scheduler.stop()
+    await catalog_client.close()
+
 @app.get("/")
 async def root():
     return {"service": "metrics-exporter", "version": "1.0.0", "status": "running"}
@@ -24,62 +86,87 @@ async def root():
 async def health():
     return {"status": "healthy"}
 
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Métricas de performance em formato Prometheus"""
+    return metrics_response()
+
+@app.get("/metrics/scheduler")
+async def get_scheduler_stats():
+    """Idade, duração e erros de cada snapshot"""
+    return scheduler.stats()
+
+@app.get("/metrics/upstream")
+async def get_upstream_stats():
+    """Circuit breaker, retries e hedging das chamadas ao Catalog"""
+    return catalog_client.policy.stats()
+
 @app.get("/metrics/logs/overview")
-async def get_logs_overview():
-    return await logs_metrics.get_logs_overview()
+async def get_logs_overview(refresh: bool = False):
+    return await scheduler.get("logs_overview", refresh)
 
 @app.get("/metrics/logs/top-clients")
-async def get_top_clients(limit: int = 10):
-    return await logs_metrics.get_top_active_clients(limit)
+async def get_top_clients(limit: int = DEFAULT_LIMIT, refresh: bool = False):
+    if limit != DEFAULT_LIMIT:
+        return await logs_metrics.get_top_active_clients(limit)
+    return await scheduler.get("logs_top_clients", refresh)
 
 @app.get("/metrics/logs/demos-per-client")
-async def get_demos_per_client():
-    return await logs_metrics.get_demos_por_cliente()
+async def get_demos_per_client(refresh: bool = False):
+    return await scheduler.get("logs_demos_per_client", refresh)
 
 @app.get("/metrics/clients/overview")
-async def get_clients_overview():
-    return await clients_metrics.get_clients_overview()
+async def get_clients_overview(refresh: bool = False):
+    return await scheduler.get("clients_overview", refresh)
 
 @app.get("/metrics/demos/overview")
-async def get_demos_overview():
-    return await demos_metrics.get_demos_overview()
+async def get_demos_overview(refresh: bool = False):
+    return await scheduler.get("demos_overview", refresh)
 
 @app.get("/metrics/demos/top-used")
-async def get_top_demos(limit: int = 10):
-    return await demos_metrics.get_top_used_demos(limit)
+async def get_top_demos(limit: int = DEFAULT_LIMIT, refresh: bool = False):
+    if limit != DEFAULT_LIMIT:
+        return await demos_metrics.get_top_used_demos(limit)
+    return await scheduler.get("demos_top_used", refresh)
 
 @app.get("/metrics/overview")
-async def get_overview():
-    return {
-        "logs": await logs_metrics.get_logs_overview(),
-        "clients": await clients_metrics.get_clients_overview(),
-        "demos": await demos_metrics.get_demos_overview()
-    }
+async def get_overview(refresh: bool = False):
+    return await run_stages({
+        "logs": scheduler.get("logs_overview", refresh),
+        "clients": scheduler.get("clients_overview", refresh),
+        "demos": scheduler.get("demos_overview", refresh)
+    })
 
 @app.get("/metrics/time/overview")
-async def get_time_overview():
-    return await time_metrics.get_tempo_overview()
+async def get_time_overview(refresh: bool = False):
+    return await scheduler.get("time_overview", refresh)
 
 @app.get("/metrics/time/top-clients")
-async def get_time_top_clients(limit: int = 10):
-    return await time_metrics.get_tempo_por_cliente(limit)
+async def get_time_top_clients(limit: int = DEFAULT_LIMIT, refresh: bool = False):
+    if limit != DEFAULT_LIMIT:
+        return await time_metrics.get_tempo_por_cliente(limit)
+    return await scheduler.get("time_top_clients", refresh)
 
 @app.get("/metrics/time/top-demos")
-async def get_time_top_demos(limit: int = 10):
-    return await time_metrics.get_tempo_por_demo(limit)
+async def get_time_top_demos(limit: int = DEFAULT_LIMIT, refresh: bool = False):
+    if limit != DEFAULT_LIMIT:
+        return await time_metrics.get_tempo_por_demo(limit)
+    return await scheduler.get("time_top_demos", refresh)
 
 @app.get("/metrics/time/client/{cliente_id}")
 async def get_time_client(cliente_id: str):
     return await time_metrics.get_tempo_cliente_especifico(cliente_id)
 
 @app.get("/metrics/time/active-sessions")
-async def get_active_sessions():
-    return await time_metrics.get_sessoes_ativas()
+async def get_active_sessions(refresh: bool = False):
+    return await scheduler.get("time_active_sessions", refresh)
 
 @app.get("/metrics/time/by-period")
-async def get_time_by_period(days: int = 7):
-    return await time_metrics.get_tempo_por_periodo(days)
+async def get_time_by_period(days: int = DEFAULT_DAYS, refresh: bool = False):
+    if days != DEFAULT_DAYS:
+        return await time_metrics.get_tempo_por_periodo(days)
+    return await scheduler.get("time_by_period", refresh)
 
 @app.get("/metrics/time/heatmap")
-async def get_usage_heatmap():
-    return await time_metrics.get_heatmap_utilizacao()
\ No newline at end of file
+async def get_usage_heatmap(refresh: bool = False):
+    return await scheduler.get("time_heatmap", refresh)
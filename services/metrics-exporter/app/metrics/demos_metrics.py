@@ -28,26 +28,7 @@ class DemosMetrics:
         }
     
     async def get_top_used_demos(self, limit: int = 10) -> Dict[str, Any]:
-        # Buscar logs e demos
-        logs = await self.catalog_client.get_all_logs(limit=1000)
-        demos = await self.catalog_client.get_all_demos()
-        
-        # Criar mapa ID → Nome
-        demos_map = {d['id']: d['nome'] for d in demos}
-        
-        demo_logs = [l for l in logs if l['tipo'] == 'demo_aberta' and l.get('demo_id')]
-        demo_counts = {}
-        for log in demo_logs:
-            demo_id = log['demo_id']
-            demo_counts[demo_id] = demo_counts.get(demo_id, 0) + 1
-        
-        top_demos = sorted([
-            {
-                "demo_id": did,
-                "demo_nome": demos_map.get(did, did),
-                "aberturas": count
-            } 
-            for did, count in demo_counts.items()
-        ], key=lambda x: x['aberturas'], reverse=True)[:limit]
+        # Agregado na Database (GROUP BY demo_id), já com o nome da demo
+        top_demos = await self.catalog_client.get_top_demos_aggregate(limit)
         
         return {"top_demos": top_demos, "limit": limit, "timestamp": datetime.now().isoformat()}
\ No newline at end of file
@@ -12,33 +12,13 @@ class TimeMetrics:
     
     async def get_tempo_overview(self) -> Dict[str, Any]:
         """Visão geral do tempo de utilização"""
-        # Usar método execute_query do catalog_client
-        sessions = await self.catalog_client.execute_query(
-            "SELECT * FROM demo_sessions WHERE duracao_segundos IS NOT NULL"
-        )
+        # Totais calculados na Database (query registada)
+        resumo = await self.catalog_client.run_query("tempo_overview")
+        resumo = resumo[0] if resumo else {}
         
-        if not sessions:
-            return {
-                "total_sessoes": 0,
-                "tempo_total_minutos": 0,
-                "tempo_total_horas": 0,
-                "duracao_media_minutos": 0,
-                "sessoes_hoje": 0,
-                "tempo_hoje_minutos": 0,
-                "timestamp": datetime.now().isoformat()
-            }
-        
-        total_segundos = sum(s.get('duracao_segundos', 0) for s in sessions)
-        total_sessoes = len(sessions)
-        
-        # Sessões de hoje
-        hoje = datetime.now().date()
-        sessoes_hoje = [
-            s for s in sessions 
-            if s.get('timestamp_fim') and 
-            datetime.fromisoformat(s['timestamp_fim'].replace('Z', '+00:00')).date() == hoje
-        ]
-        tempo_hoje_segundos = sum(s.get('duracao_segundos', 0) for s in sessoes_hoje)
+        total_sessoes = resumo.get('total_sessoes') or 0
+        total_segundos = resumo.get('tempo_total_segundos') or 0
+        tempo_hoje_segundos = resumo.get('tempo_hoje_segundos') or 0
         
         return {
             "total_sessoes": total_sessoes,
@@ -46,46 +26,42 @@ class TimeMetrics:
             "tempo_total_minutos": round(total_segundos / 60, 2),
             "tempo_total_horas": round(total_segundos / 3600, 2),
             "duracao_media_minutos": round((total_segundos / total_sessoes) / 60, 2) if total_sessoes > 0 else 0,
-            "sessoes_hoje": len(sessoes_hoje),
+            "sessoes_hoje": resumo.get('sessoes_hoje') or 0,
             "tempo_hoje_minutos": round(tempo_hoje_segundos / 60, 2),
             "timestamp": datetime.now().isoformat()
         }
     
     async def get_tempo_por_cliente(self, limite: int = 10) -> Dict[str, Any]:
         """Top clientes por tempo total de utilização"""
-        clientes = await self.catalog_client.execute_query(
-            "SELECT * FROM view_tempo_por_cliente ORDER BY tempo_total_minutos DESC"
-        )
-        
-        top_clientes = clientes[:limite]
+        clientes = await self.catalog_client.run_query("tempo_por_cliente", limit=limite)
+        total_clientes = clientes[0]['total_clientes'] if clientes else 0
         
         return {
-            "top_clientes": top_clientes,
-            "total_clientes": len(clientes),
+            "top_clientes": [
+                {k: v for k, v in c.items() if k != 'total_clientes'} for c in clientes
+            ],
+            "total_clientes": total_clientes,
             "limit": limite,
             "timestamp": datetime.now().isoformat()
         }
     
     async def get_tempo_por_demo(self, limite: int = 10) -> Dict[str, Any]:
         """Top demos por tempo total de utilização"""
-        demos = await self.catalog_client.execute_query(
-            "SELECT * FROM view_tempo_por_demo ORDER BY tempo_total_minutos DESC"
-        )
-        
-        top_demos = demos[:limite]
+        demos = await self.catalog_client.run_query("tempo_por_demo", limit=limite)
+        total_demos = demos[0]['total_demos'] if demos else 0
         
         return {
-            "top_demos": top_demos,
-            "total_demos": len(demos),
+            "top_demos": [
+                {k: v for k, v in d.items() if k != 'total_demos'} for d in demos
+            ],
+            "total_demos": total_demos,
             "limit": limite,
             "timestamp": datetime.now().isoformat()
         }
     
     async def get_tempo_cliente_especifico(self, cliente_id: str) -> Dict[str, Any]:
         """Tempo que um cliente específico passou em cada demo"""
-        demos = await self.catalog_client.execute_query(
-            f"SELECT * FROM view_tempo_cliente_demo WHERE cliente_id = '{cliente_id}' ORDER BY tempo_total_minutos DESC"
-        )
+        demos = await self.catalog_client.run_query("tempo_cliente_demo", cliente_id=cliente_id)
         
         return {
             "cliente_id": cliente_id,
@@ -97,9 +73,7 @@ class TimeMetrics:
     
     async def get_sessoes_ativas(self) -> Dict[str, Any]:
         """Sessões ativas neste momento (demos abertas sem fim)"""
-        sessoes = await self.catalog_client.execute_query(
-            "SELECT * FROM view_sessoes_ativas"
-        )
+        sessoes = await self.catalog_client.run_query("sessoes_ativas")
         
         return {
             "sessoes_ativas": sessoes,
@@ -109,20 +83,7 @@ class TimeMetrics:
     
     async def get_tempo_por_periodo(self, dias: int = 7) -> Dict[str, Any]:
         """Tempo de utilização por dia nos últimos N dias"""
-        sql = f"""
-            SELECT 
-                DATE(timestamp_fim) as data,
-                COUNT(*) as sessoes,
-                SUM(duracao_segundos) as tempo_total_segundos,
-                ROUND(SUM(duracao_segundos) / 60.0, 2) as tempo_total_minutos,
-                ROUND(AVG(duracao_segundos) / 60.0, 2) as duracao_media_minutos
-            FROM demo_sessions
-            WHERE duracao_segundos IS NOT NULL
-                AND DATE(timestamp_fim) >= DATE('now', '-{dias} days')
-            GROUP BY DATE(timestamp_fim)
-            ORDER BY data DESC
-        """
-        dados = await self.catalog_client.execute_query(sql)
+        dados = await self.catalog_client.run_query("tempo_por_dia", dias=dias)
         
         return {
             "periodo_dias": dias,
@@ -133,19 +94,7 @@ class TimeMetrics:
     
     async def get_heatmap_utilizacao(self) -> Dict[str, Any]:
         """Heatmap de utilização (hora do dia vs dia da semana)"""
-        sql = """
-            SELECT 
-                CAST(strftime('%w', timestamp_inicio) AS INTEGER) as dia_semana,
-                CAST(strftime('%H', timestamp_inicio) AS INTEGER) as hora,
-                COUNT(*) as sessoes,
-                ROUND(SUM(duracao_segundos) / 60.0, 2) as tempo_total_minutos
-            FROM demo_sessions
-            WHERE duracao_segundos IS NOT NULL
-                AND DATE(timestamp_inicio) >= DATE('now', '-30 days')
-            GROUP BY dia_semana, hora
-            ORDER BY dia_semana, hora
-        """
-        dados = await self.catalog_client.execute_query(sql)
+        dados = await self.catalog_client.run_query("heatmap_utilizacao", dias=30)
         
         # Mapear dia da semana
         dias_nomes = ['Domingo', 'Segunda', 'Terça', 'Quarta', 'Quinta', 'Sexta', 'Sábado']
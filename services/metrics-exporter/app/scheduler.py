@@ -0,0 +1,200 @@
+"""
+Metrics Scheduler
+Pré-cálculo periódico das métricas (snapshots em memória)
+
+Cada job recalcula uma métrica no seu próprio intervalo e guarda o último
+resultado. Os endpoints servem o snapshot de imediato (com a idade), pelo
+que a carga sobre o Catalog/Database não depende de quantos painéis do
+Grafana estão a fazer polling. Um refresh on-demand continua disponível.
+
+Jobs registados com `tables` só são recalculados quando a versão de alguma
+dessas tabelas muda (GET /api/db/versions, um pedido mínimo partilhado por
+todos os jobs) ou o snapshot excede METRICS_MAX_SNAPSHOT_AGE.
+"""
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from app.catalog_client import catalog_client
+from app.core.config import settings
+
+VERSIONS_MAX_AGE = 1.0
+
+
+class MetricJob:
+    """Job de uma métrica: loader, intervalo e último snapshot"""
+
+    def __init__(self, name: str, loader: Callable[[], Awaitable[Dict[str, Any]]],
+                 interval: float, tables: Tuple[str, ...] = ()):
+        self.name = name
+        self.loader = loader
+        self.interval = interval
+        self.tables = tables
+        self.versions: Optional[Dict[str, int]] = None
+        self.value: Optional[Dict[str, Any]] = None
+        self.computed_at: Optional[datetime] = None
+        self.computed_monotonic = 0.0
+        # Última vez que o snapshot foi calculado ou confirmado como atual
+        self.validated_monotonic = 0.0
+        self.skipped = 0
+        self.duration_ms = 0.0
+        self.last_error: Optional[str] = None
+        self.refreshes = 0
+        self.failures = 0
+        self.lock = asyncio.Lock()
+
+    def meta(self) -> Dict[str, Any]:
+        """Metadados do snapshot (idade / staleness)"""
+        return {
+            "computed_at": self.computed_at.isoformat() if self.computed_at else None,
+            # Desde a última validação (recalculado ou tabelas sem alterações)
+            "age_seconds": round(time.monotonic() - self.validated_monotonic, 3)
+                if self.computed_at else None,
+            "refresh_interval": self.interval,
+            "duration_ms": round(self.duration_ms, 2),
+            "last_error": self.last_error
+        }
+
+
+class MetricsScheduler:
+    """Scheduler asyncio com um loop de refresh por job"""
+
+    def __init__(self):
+        self._jobs: Dict[str, MetricJob] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._versions: Optional[Dict[str, int]] = None
+        self._versions_at = 0.0
+        self._versions_lock = asyncio.Lock()
+
+    def register(self, name: str, loader: Callable[[], Awaitable[Dict[str, Any]]],
+                 interval: float, tables: Tuple[str, ...] = ()) -> None:
+        """
+        Registar job (antes do start)
+        tables: tabelas de que o resultado depende exclusivamente (sem
+        janelas temporais); vazio = recalcular sempre
+        """
+        self._jobs[name] = MetricJob(name, loader, interval, tables)
+
+    # ========================================================================
+    # LIFECYCLE
+    # ========================================================================
+
+    async def start(self) -> None:
+        """Arrancar um loop por job (o primeiro refresh é imediato)"""
+        for name, job in self._jobs.items():
+            if name not in self._tasks and job.interval > 0:
+                self._tasks[name] = asyncio.create_task(self._loop(job))
+
+    async def stop(self) -> None:
+        """Cancelar todos os loops"""
+        for task in self._tasks.values():
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        self._tasks.clear()
+
+    async def _loop(self, job: MetricJob) -> None:
+        while True:
+            try:
+                if not await self._unchanged(job):
+                    await self.refresh(job.name)
+            except Exception as e:
+                print(f"⚠️ Falha ao atualizar métrica {job.name}: {e}")
+            await asyncio.sleep(job.interval)
+
+    # ========================================================================
+    # VERSÕES DAS TABELAS
+    # ========================================================================
+
+    async def _table_versions(self) -> Dict[str, int]:
+        """Versões das tabelas, partilhadas entre jobs durante VERSIONS_MAX_AGE"""
+        async with self._versions_lock:
+            if self._versions is None or time.monotonic() - self._versions_at > VERSIONS_MAX_AGE:
+                self._versions = await catalog_client.get_table_versions()
+                self._versions_at = time.monotonic()
+            return self._versions
+
+    async def _job_versions(self, job: MetricJob) -> Optional[Dict[str, int]]:
+        if not job.tables:
+            return None
+        try:
+            versions = await self._table_versions()
+        except Exception:
+            return None
+        return {table: versions.get(table, 0) for table in job.tables}
+
+    async def _unchanged(self, job: MetricJob) -> bool:
+        """True se o snapshot continua atual (tabelas sem escritas)"""
+        if job.value is None or job.versions is None:
+            return False
+        if time.monotonic() - job.computed_monotonic > settings.METRICS_MAX_SNAPSHOT_AGE:
+            return False
+        if await self._job_versions(job) != job.versions:
+            return False
+        job.validated_monotonic = time.monotonic()
+        job.skipped += 1
+        return True
+
+    # ========================================================================
+    # SNAPSHOTS
+    # ========================================================================
+
+    async def refresh(self, name: str) -> MetricJob:
+        """
+        Recalcular snapshot agora
+        Refreshes concorrentes do mesmo job esperam pelo que já está a correr
+        """
+        job = self._jobs[name]
+        pedido_em = time.monotonic()
+
+        async with job.lock:
+            # Outro refresh terminou enquanto esperávamos: o snapshot já é novo
+            if job.computed_at is not None and job.computed_monotonic >= pedido_em:
+                return job
+
+            # Versões lidas antes do cálculo: uma escrita a meio força novo
+            # cálculo no ciclo seguinte
+            versions = await self._job_versions(job)
+            inicio = time.monotonic()
+            try:
+                value = await job.loader()
+            except Exception as e:
+                job.failures += 1
+                job.last_error = str(e)
+                raise
+
+            job.value = value
+            job.versions = versions
+            job.computed_at = datetime.now(timezone.utc)
+            job.computed_monotonic = time.monotonic()
+            job.validated_monotonic = job.computed_monotonic
+            job.duration_ms = (job.computed_monotonic - inicio) * 1000
+            job.last_error = None
+            job.refreshes += 1
+            return job
+
+    async def get(self, name: str, refresh: bool = False) -> Dict[str, Any]:
+        """
+        Último snapshot + metadados em "snapshot"
+        Calcula on-demand se refresh=True ou se ainda não existir snapshot
+        """
+        job = self._jobs[name]
+        if refresh or job.value is None:
+            await self.refresh(name)
+        return {**job.value, "snapshot": job.meta()}
+
+    def stats(self) -> Dict[str, Any]:
+        """Estado de todos os jobs"""
+        return {
+            name: {
+                **job.meta(),
+                "tables": list(job.tables),
+                "refreshes": job.refreshes,
+                "skipped": job.skipped,
+                "failures": job.failures
+            }
+            for name, job in self._jobs.items()
+        }
+
+
+# Singleton instance
+scheduler = MetricsScheduler()
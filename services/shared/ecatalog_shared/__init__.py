@@ -0,0 +1,7 @@
+"""
+E-Catalog Shared
+Código comum aos serviços Python (instalado em cada imagem)
+
+- resilience: deadline, retries, hedging e circuit breaker das chamadas upstream
+- telemetry: métricas Prometheus (rotas, respostas e chamadas upstream)
+"""
@@ -0,0 +1,340 @@
+"""
+Resilience
+Chamadas upstream resilientes: deadline, retries, hedging e circuit breaker
+
+- Deadline por chamada: o tempo total (tentativas + esperas) nunca excede
+  o timeout do endpoint; cada tentativa recebe só o tempo que resta
+- Retries com backoff exponencial e jitter ("full jitter") para métodos
+  idempotentes e, se o upstream deduplicar por Idempotency-Key, escritas
+- Hedging opcional de GETs: se a resposta demora mais do que o p95 recente
+  do endpoint, é enviado um segundo pedido e vale o primeiro a responder
+- Circuit breaker por upstream: após N falhas seguidas os pedidos falham de
+  imediato durante reset_timeout segundos; depois passa um único pedido de
+  teste (half-open) que fecha ou volta a abrir o circuito
+
+Só contam como falha erros de transporte (conexão, timeout) e respostas
+502/503/504; um 4xx ou 500 é uma resposta válida do upstream.
+"""
+import asyncio
+import random
+import secrets
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+import httpx
+from prometheus_client import Counter, Gauge
+from ecatalog_shared.telemetry import endpoint_label
+
+
+RETRY_STATUSES = frozenset({502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+
+
+# ============================================================================
+# MÉTRICAS
+# ============================================================================
+
+CIRCUIT_STATE = Gauge(
+    "upstream_circuit_state",
+    "Estado do circuit breaker por upstream (0 fechado, 1 half-open, 2 aberto)",
+    ["upstream"]
+)
+CIRCUIT_TRANSITIONS = Counter(
+    "upstream_circuit_transitions_total",
+    "Mudanças de estado do circuit breaker",
+    ["upstream", "state"]
+)
+CIRCUIT_REJECTED = Counter(
+    "upstream_circuit_rejected_total",
+    "Pedidos recusados de imediato com o circuito aberto",
+    ["upstream"]
+)
+UPSTREAM_RETRIES = Counter(
+    "upstream_retries_total",
+    "Novas tentativas de chamadas upstream",
+    ["upstream", "method"]
+)
+UPSTREAM_HEDGES = Counter(
+    "upstream_hedged_requests_total",
+    "Pedidos duplicados (hedging) por latência acima do p95",
+    ["upstream", "outcome"]
+)
+
+
+def new_idempotency_key() -> str:
+    """Chave para o header Idempotency-Key (igual em todas as tentativas)"""
+    return secrets.token_hex(16)
+
+
+class CircuitOpenError(Exception):
+    """Circuito aberto: pedido recusado sem contactar o upstream"""
+
+
+# ============================================================================
+# CIRCUIT BREAKER
+# ============================================================================
+
+class CircuitBreaker:
+    """Circuit breaker por upstream (closed → open → half-open → closed)"""
+
+    CLOSED = "closed"
+    HALF_OPEN = "half_open"
+    OPEN = "open"
+    _GAUGE = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+    def __init__(self, upstream: str, failure_threshold: int, reset_timeout: float):
+        self.upstream = upstream
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.rejected = 0
+        self._probing = False
+        CIRCUIT_STATE.labels(upstream).set(0)
+
+    @property
+    def enabled(self) -> bool:
+        return self.failure_threshold > 0
+
+    def _transition(self, state: str) -> None:
+        if state == self.state:
+            return
+        self.state = state
+        CIRCUIT_STATE.labels(self.upstream).set(self._GAUGE[state])
+        CIRCUIT_TRANSITIONS.labels(self.upstream, state).inc()
+        print(f"⚡ Circuit breaker {self.upstream}: {state}")
+
+    def before_call(self) -> None:
+        """Autorizar uma tentativa (CircuitOpenError se o circuito não deixar)"""
+        if not self.enabled:
+            return
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                self._reject()
+            self._transition(self.HALF_OPEN)
+        if self.state == self.HALF_OPEN:
+            # Um único pedido de teste de cada vez
+            if self._probing:
+                self._reject()
+            self._probing = True
+
+    def _reject(self) -> None:
+        self.rejected += 1
+        CIRCUIT_REJECTED.labels(self.upstream).inc()
+        restante = max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+        raise CircuitOpenError(
+            f"circuito aberto para {self.upstream} (nova tentativa em {restante:.1f}s)"
+        )
+
+    def release_probe(self) -> None:
+        """Tentativa abandonada (cancelada) sem resultado"""
+        self._probing = False
+
+    def record_success(self) -> None:
+        self._probing = False
+        self.failures = 0
+        self._transition(self.CLOSED)
+
+    def record_failure(self) -> None:
+        self._probing = False
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+            self._transition(self.OPEN)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "failure_threshold": self.failure_threshold,
+            "reset_timeout": self.reset_timeout,
+            "rejected": self.rejected
+        }
+
+
+# ============================================================================
+# LATÊNCIAS (para o atraso do hedging)
+# ============================================================================
+
+class LatencyTracker:
+    """Últimas latências por endpoint (janela deslizante) e respetivo p95"""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.window = window
+        self.min_samples = min_samples
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def observe(self, label: str, duracao: float) -> None:
+        samples = self._samples.get(label)
+        if samples is None:
+            samples = self._samples[label] = deque(maxlen=self.window)
+        samples.append(duracao)
+
+    def p95(self, label: str) -> Optional[float]:
+        samples = self._samples.get(label)
+        if samples is None or len(samples) < self.min_samples:
+            return None
+        ordenadas = sorted(samples)
+        return ordenadas[int(len(ordenadas) * 0.95) - 1]
+
+
+# ============================================================================
+# POLÍTICA
+# ============================================================================
+
+Attempt = Callable[[float], Awaitable[httpx.Response]]
+
+
+class UpstreamPolicy:
+    """
+    Execução de uma chamada upstream com deadline, retries, hedging e breaker
+
+    `attempt(timeout)` envia uma tentativa com o timeout indicado (segundos)
+    e devolve a resposta; a política decide se e quando repetir.
+    """
+
+    def __init__(
+        self,
+        upstream: str,
+        retries: int = 2,
+        backoff_base: float = 0.1,
+        backoff_max: float = 1.0,
+        retry_writes: bool = False,
+        hedge_enabled: bool = False,
+        hedge_min_delay: float = 0.05,
+        failure_threshold: int = 5,
+        reset_timeout: float = 10.0
+    ):
+        self.upstream = upstream
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_writes = retry_writes
+        self.hedge_enabled = hedge_enabled
+        self.hedge_min_delay = hedge_min_delay
+        self.breaker = CircuitBreaker(upstream, failure_threshold, reset_timeout)
+        self.latencies = LatencyTracker()
+
+        self.calls = 0
+        self.retried = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.deadline_exceeded = 0
+
+    def backoff(self, tentativa: int) -> float:
+        """Espera antes da tentativa seguinte (full jitter)"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** tentativa)))
+
+    def _retryable_method(self, method: str) -> bool:
+        return method in IDEMPOTENT_METHODS or self.retry_writes
+
+    async def execute(self, method: str, endpoint: str, attempt: Attempt,
+                      deadline: float) -> httpx.Response:
+        """
+        Executar a chamada dentro de `deadline` segundos
+
+        Devolve a última resposta (mesmo 5xx, para o caller mapear o erro) ou
+        propaga o último erro de transporte / CircuitOpenError.
+        """
+        self.calls += 1
+        label = endpoint_label(endpoint)
+        limite = time.monotonic() + deadline
+        tentativas = 1 + (self.retries if self._retryable_method(method) else 0)
+
+        for tentativa in range(tentativas):
+            restante = limite - time.monotonic()
+            if tentativa > 0:
+                self.retried += 1
+                UPSTREAM_RETRIES.labels(self.upstream, method).inc()
+
+            self.breaker.before_call()
+            inicio = time.monotonic()
+            try:
+                if method == "GET" and self.hedge_enabled and self.breaker.state == CircuitBreaker.CLOSED:
+                    response = await self._hedged(label, attempt, restante)
+                else:
+                    response = await attempt(restante)
+            except httpx.TransportError:
+                self.breaker.record_failure()
+                if not self._can_retry(tentativa, tentativas, limite):
+                    raise
+            except BaseException:
+                # Cancelamento ou erro inesperado: libertar um eventual probe
+                self.breaker.release_probe()
+                raise
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    self.breaker.record_success()
+                    self.latencies.observe(label, time.monotonic() - inicio)
+                    return response
+                self.breaker.record_failure()
+                if not self._can_retry(tentativa, tentativas, limite):
+                    return response
+
+            await asyncio.sleep(self._next_delay(tentativa, limite))
+
+        raise RuntimeError("sem tentativas")  # inalcançável: a última tentativa devolve ou propaga
+
+    def _next_delay(self, tentativa: int, limite: float) -> float:
+        return min(self.backoff(tentativa), max(0.0, limite - time.monotonic()))
+
+    def _can_retry(self, tentativa: int, tentativas: int, limite: float) -> bool:
+        """Há tentativas e tempo para mais uma (e o circuito não abriu)?"""
+        if tentativa + 1 >= tentativas or self.breaker.state == CircuitBreaker.OPEN:
+            return False
+        if limite - time.monotonic() <= self.backoff_base:
+            self.deadline_exceeded += 1
+            return False
+        return True
+
+    async def _hedged(self, label: str, attempt: Attempt, restante: float) -> httpx.Response:
+        """Segundo pedido se o primeiro exceder o p95 do endpoint"""
+        p95 = self.latencies.p95(label)
+        if p95 is None:
+            return await attempt(restante)
+        atraso = max(self.hedge_min_delay, p95)
+        if atraso >= restante:
+            return await attempt(restante)
+
+        primeiro = asyncio.ensure_future(attempt(restante))
+        pendentes = {primeiro}
+        try:
+            done, _ = await asyncio.wait(pendentes, timeout=atraso)
+            if done:
+                return primeiro.result()
+
+            self.hedged += 1
+            segundo = asyncio.ensure_future(attempt(restante - atraso))
+            pendentes = {primeiro, segundo}
+            falhada: Optional[asyncio.Future] = None
+            while pendentes:
+                done, pendentes = await asyncio.wait(pendentes, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None and task.result().status_code not in RETRY_STATUSES:
+                        outcome = "hedge_won" if task is segundo else "primary_won"
+                        if task is segundo:
+                            self.hedge_wins += 1
+                        UPSTREAM_HEDGES.labels(self.upstream, outcome).inc()
+                        return task.result()
+                    falhada = task
+            UPSTREAM_HEDGES.labels(self.upstream, "both_failed").inc()
+            return falhada.result()
+        finally:
+            for task in pendentes:
+                task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        """Estado do breaker e contadores (para /internal/stats)"""
+        return {
+            "circuit": self.breaker.stats(),
+            "calls": self.calls,
+            "retries": self.retried,
+            "deadline_exceeded": self.deadline_exceeded,
+            "hedging": {
+                "enabled": self.hedge_enabled,
+                "hedged": self.hedged,
+                "hedge_wins": self.hedge_wins
+            }
+        }
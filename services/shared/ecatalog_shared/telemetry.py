@@ -0,0 +1,138 @@
+"""
+Telemetry
+Métricas de performance em formato Prometheus (servidas em /metrics)
+
+- Latência por rota (histograma), pedidos em curso e tamanho das respostas
+- Latência das chamadas HTTP a serviços upstream
+As labels usam o template da rota (ex: /api/demos/{demo_id}) para manter
+a cardinalidade baixa.
+"""
+import re
+import time
+from typing import Optional
+from fastapi import Response
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+# ============================================================================
+# MÉTRICAS
+# ============================================================================
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Latência dos pedidos HTTP por rota",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "Pedidos HTTP em curso",
+    ["method"]
+)
+RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes",
+    "Tamanho do body das respostas HTTP por rota",
+    ["method", "route"],
+    buckets=SIZE_BUCKETS
+)
+UPSTREAM_LATENCY = Histogram(
+    "upstream_request_duration_seconds",
+    "Latência das chamadas HTTP a serviços upstream",
+    ["upstream", "method", "endpoint", "status"],
+    buckets=LATENCY_BUCKETS
+)
+UPSTREAM_ERRORS = Counter(
+    "upstream_request_errors_total",
+    "Chamadas upstream falhadas (sem resposta ou status >= 400)",
+    ["upstream", "method", "endpoint"]
+)
+
+
+# ============================================================================
+# MIDDLEWARE
+# ============================================================================
+
+class TelemetryMiddleware:
+    """
+    Middleware ASGI que mede latência, pedidos em curso e bytes enviados
+
+    ASGI puro (em vez de BaseHTTPMiddleware) para contar também o body
+    de StreamingResponse sem o ler para memória.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+        size = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        REQUESTS_IN_PROGRESS.labels(method).inc()
+        inicio = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duracao = time.perf_counter() - inicio
+            REQUESTS_IN_PROGRESS.labels(method).dec()
+            route = _route_template(scope)
+            REQUEST_LATENCY.labels(method, route, str(status)).observe(duracao)
+            RESPONSE_SIZE.labels(method, route).observe(size)
+
+
+def _route_template(scope: Scope) -> str:
+    """Template da rota que serviu o pedido (ou <unmatched>)"""
+    app = scope.get("app")
+    for route in getattr(app, "routes", []):
+        match, _ = route.matches(scope)
+        if match != Match.NONE:
+            return getattr(route, "path", "<unmatched>")
+    return "<unmatched>"
+
+
+# ============================================================================
+# UPSTREAM
+# ============================================================================
+
+# Segmentos de path que parecem ids (contêm dígitos, emails, hashes)
+_ID_SEGMENT = re.compile(r"^(?=.*\d)[^/]+$|^[^/]*@[^/]*$")
+
+
+def endpoint_label(endpoint: str) -> str:
+    """Normalizar path para label: /db/demos/demo004 → /db/demos/{id}"""
+    path = endpoint.split("?", 1)[0]
+    return "/".join(
+        "{id}" if segment and _ID_SEGMENT.match(segment) else segment
+        for segment in path.split("/")
+    )
+
+
+def observe_upstream(upstream: str, method: str, endpoint: str,
+                     status: Optional[int], duracao: float) -> None:
+    """Registar uma chamada upstream (status None = sem resposta)"""
+    label = endpoint_label(endpoint)
+    UPSTREAM_LATENCY.labels(upstream, method, label, str(status or "error")).observe(duracao)
+    if status is None or status >= 400:
+        UPSTREAM_ERRORS.labels(upstream, method, label).inc()
+
+
+def metrics_response() -> Response:
+    """Resposta em formato texto Prometheus"""
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,289 @@
+"""
+Testes do circuit breaker e da UpstreamPolicy (ecatalog_shared/resilience.py)
+
+As chamadas upstream são simuladas por um `attempt` falso que segue um
+guião de respostas (status, erro de transporte e latência por tentativa).
+
+Uso (a partir de services/shared):
+    python -m pytest tests
+"""
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from ecatalog_shared.resilience import CircuitBreaker, CircuitOpenError, UpstreamPolicy
+from ecatalog_shared.telemetry import endpoint_label
+
+
+ENDPOINT = "/db/demos"
+
+
+class FakeAttempt:
+    """
+    `attempt(timeout)` falso: a tentativa N segue o passo N do guião
+    Cada passo é (latência, status) ou (latência, exceção a lançar)
+    """
+
+    def __init__(self, *passos):
+        self.passos = list(passos)
+        self.timeouts = []
+        self.canceladas = 0
+
+    async def __call__(self, restante: float) -> httpx.Response:
+        indice = len(self.timeouts)
+        self.timeouts.append(restante)
+        latencia, resultado = self.passos[min(indice, len(self.passos) - 1)]
+        try:
+            await asyncio.sleep(latencia)
+        except asyncio.CancelledError:
+            self.canceladas += 1
+            raise
+        if isinstance(resultado, BaseException):
+            raise resultado
+        return httpx.Response(resultado, headers={"x-tentativa": str(indice)})
+
+    @property
+    def chamadas(self) -> int:
+        return len(self.timeouts)
+
+
+def erro_transporte() -> httpx.ConnectError:
+    return httpx.ConnectError("conexão recusada")
+
+
+def expirar(breaker: CircuitBreaker) -> None:
+    """Simular a passagem de reset_timeout desde a abertura do circuito"""
+    breaker.opened_at -= breaker.reset_timeout
+
+
+def executar(policy: UpstreamPolicy, attempt: FakeAttempt, method: str = "GET",
+             deadline: float = 5.0) -> httpx.Response:
+    return asyncio.run(policy.execute(method, ENDPOINT, attempt, deadline))
+
+
+# ============================================================================
+# CIRCUIT BREAKER
+# ============================================================================
+
+def test_breaker_abre_apos_falhas_seguidas():
+    """N falhas seguidas abrem o circuito; um sucesso pelo meio recomeça a contagem"""
+    breaker = CircuitBreaker("teste", failure_threshold=3, reset_timeout=60)
+
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    assert breaker.rejected == 1
+
+
+def test_breaker_half_open_deixa_passar_um_unico_probe():
+    """Depois de reset_timeout passa um pedido de teste; os restantes são recusados"""
+    breaker = CircuitBreaker("teste", failure_threshold=1, reset_timeout=60)
+    breaker.record_failure()
+    expirar(breaker)
+
+    breaker.before_call()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.before_call()
+    breaker.before_call()
+
+
+def test_breaker_probe_falhado_volta_a_abrir():
+    """Uma falha em half-open reabre logo o circuito (mesmo abaixo do limiar)"""
+    breaker = CircuitBreaker("teste", failure_threshold=3, reset_timeout=60)
+    for _ in range(3):
+        breaker.record_failure()
+    expirar(breaker)
+
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_breaker_probe_abandonado_liberta_vaga():
+    """Um probe cancelado (release_probe) deixa passar o pedido de teste seguinte"""
+    breaker = CircuitBreaker("teste", failure_threshold=1, reset_timeout=60)
+    breaker.record_failure()
+    expirar(breaker)
+
+    breaker.before_call()
+    breaker.release_probe()
+    breaker.before_call()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+
+# ============================================================================
+# RETRIES E DEADLINE
+# ============================================================================
+
+def test_retry_em_503_ate_sucesso():
+    policy = UpstreamPolicy("teste", retries=2, backoff_base=0.001, backoff_max=0.001)
+    attempt = FakeAttempt((0, 503), (0, 503), (0, 200))
+
+    response = executar(policy, attempt)
+
+    assert response.status_code == 200
+    assert attempt.chamadas == 3
+    assert policy.retried == 2
+    assert policy.breaker.failures == 0
+
+
+def test_erro_de_transporte_propaga_depois_dos_retries():
+    policy = UpstreamPolicy("teste", retries=2, backoff_base=0.001, backoff_max=0.001)
+    attempt = FakeAttempt((0, erro_transporte()))
+
+    with pytest.raises(httpx.ConnectError):
+        executar(policy, attempt)
+    assert attempt.chamadas == 3
+    assert policy.breaker.failures == 3
+
+
+def test_4xx_e_500_sao_respostas_validas():
+    """Sem retry e sem contar como falha do upstream"""
+    policy = UpstreamPolicy("teste", retries=2, backoff_base=0.001)
+
+    for status in (404, 500):
+        attempt = FakeAttempt((0, status))
+        assert executar(policy, attempt).status_code == status
+        assert attempt.chamadas == 1
+    assert policy.breaker.failures == 0
+
+
+def test_escritas_so_repetem_com_retry_writes():
+    sem_retry = UpstreamPolicy("teste", retries=2, backoff_base=0.001)
+    attempt = FakeAttempt((0, 503), (0, 200))
+    assert executar(sem_retry, attempt, method="POST").status_code == 503
+    assert attempt.chamadas == 1
+
+    com_retry = UpstreamPolicy("teste", retries=2, backoff_base=0.001, retry_writes=True)
+    attempt = FakeAttempt((0, 503), (0, 200))
+    assert executar(com_retry, attempt, method="POST").status_code == 200
+    assert attempt.chamadas == 2
+
+
+def test_deadline_limita_tentativas():
+    """O tempo total não excede o deadline e cada tentativa recebe só o que resta"""
+    policy = UpstreamPolicy("teste", retries=10, backoff_base=0.05, backoff_max=0.05)
+    attempt = FakeAttempt((0.05, 503))
+
+    inicio = time.monotonic()
+    response = executar(policy, attempt, deadline=0.12)
+    duracao = time.monotonic() - inicio
+
+    assert response.status_code == 503
+    assert attempt.chamadas < 11
+    assert policy.deadline_exceeded == 1
+    assert duracao < 0.12 + 0.1
+    assert attempt.timeouts[0] <= 0.12
+    assert attempt.timeouts == sorted(attempt.timeouts, reverse=True)
+
+
+def test_circuito_aberto_interrompe_retries():
+    """O circuito abre a meio dos retries; a chamada seguinte nem chega ao upstream"""
+    policy = UpstreamPolicy("teste", retries=5, backoff_base=0.001, backoff_max=0.001,
+                            failure_threshold=2, reset_timeout=60)
+    attempt = FakeAttempt((0, 503))
+
+    assert executar(policy, attempt).status_code == 503
+    assert attempt.chamadas == 2
+    assert policy.breaker.state == CircuitBreaker.OPEN
+
+    with pytest.raises(CircuitOpenError):
+        executar(policy, attempt)
+    assert attempt.chamadas == 2
+
+
+# ============================================================================
+# HEDGING
+# ============================================================================
+
+def policy_com_hedging(p95: float = 0.02) -> UpstreamPolicy:
+    """Política com hedging e latências recentes suficientes para o p95"""
+    policy = UpstreamPolicy("teste", retries=0, hedge_enabled=True, hedge_min_delay=0.01)
+    for _ in range(policy.latencies.min_samples):
+        policy.latencies.observe(endpoint_label(ENDPOINT), p95)
+    return policy
+
+
+def test_sem_historico_nao_ha_hedging():
+    policy = UpstreamPolicy("teste", retries=0, hedge_enabled=True, hedge_min_delay=0.01)
+    attempt = FakeAttempt((0.05, 200), (0, 200))
+
+    assert executar(policy, attempt).status_code == 200
+    assert attempt.chamadas == 1
+    assert policy.hedged == 0
+
+
+def test_primario_rapido_dispensa_hedge():
+    policy = policy_com_hedging()
+    attempt = FakeAttempt((0, 200), (0, 200))
+
+    executar(policy, attempt)
+
+    assert attempt.chamadas == 1
+    assert policy.hedged == 0
+
+
+def test_hedge_vence_primario_lento():
+    """O segundo pedido responde primeiro: vale a sua resposta e o primário é cancelado"""
+    policy = policy_com_hedging()
+    attempt = FakeAttempt((1.0, 200), (0, 200))
+
+    response = executar(policy, attempt)
+
+    assert response.headers["x-tentativa"] == "1"
+    assert policy.hedged == 1
+    assert policy.hedge_wins == 1
+    assert attempt.canceladas == 1
+    # O hedge recebe só o tempo que sobra depois do atraso
+    assert attempt.timeouts[1] < attempt.timeouts[0]
+
+
+def test_primario_vence_depois_do_hedge():
+    policy = policy_com_hedging()
+    attempt = FakeAttempt((0.05, 200), (1.0, 200))
+
+    response = executar(policy, attempt)
+
+    assert response.headers["x-tentativa"] == "0"
+    assert policy.hedged == 1
+    assert policy.hedge_wins == 0
+    assert attempt.canceladas == 1
+
+
+def test_hedge_ignora_resposta_503():
+    """Um 503 rápido do hedge não ganha: espera-se pela resposta válida do primário"""
+    policy = policy_com_hedging()
+    attempt = FakeAttempt((0.1, 200), (0, 503))
+
+    response = executar(policy, attempt)
+
+    assert response.status_code == 200
+    assert response.headers["x-tentativa"] == "0"
+    assert policy.hedge_wins == 0
+
+
+def test_ambos_falham_devolve_ultima_falha():
+    policy = policy_com_hedging()
+    attempt = FakeAttempt((0.05, 503), (0, 503))
+
+    response = executar(policy, attempt)
+
+    assert response.status_code == 503
+    assert attempt.chamadas == 2